@@ -0,0 +1,146 @@
+"""Headless batch evaluation of many filters.
+
+Reads a JSON-lines file (one filter per line: {"zeros": [...], "poles": [...]}
+or {"b": [...], "a": [...]}), evaluates each filter across a process pool with
+the same dsp code the GUI uses and streams the results into memory-mapped .npy
+files (or one .npz), so the full result set never has to fit in RAM.
+
+    python batch.py filters.jsonl -o results --surface 64 --workers 16
+"""
+import argparse
+import functools
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+from dsp.batch import evaluate_filter, parse_filter
+
+
+def _lines(path):
+    """Non-empty, non-comment lines; parsing happens in the workers so a
+    malformed line only flags its own index."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+def _evaluate(job, **kwargs):
+    i, line = job
+    try:
+        spec = parse_filter(json.loads(line))
+        return i, evaluate_filter(spec, **kwargs), None
+    except Exception as exc:  # keep going; the index is flagged in ok.npy
+        return i, None, f'{type(exc).__name__}: {exc}'
+
+
+def _open_outputs(out_dir, count, n_freq, n_impulse, surface_res):
+    os.makedirs(out_dir, exist_ok=True)
+    mm = np.lib.format.open_memmap
+
+    def path(name):
+        return os.path.join(out_dir, name + '.npy')
+
+    np.save(path('w'), np.linspace(0, np.pi, n_freq))
+    outputs = {
+        'freq': mm(path('freq'), 'w+', np.complex128, (count, n_freq)),
+        'impulse': mm(path('impulse'), 'w+', np.float64, (count, n_impulse)),
+        'ok': mm(path('ok'), 'w+', np.bool_, (count,)),
+    }
+    if surface_res:
+        outputs['surface'] = mm(path('surface'), 'w+', np.float32,
+                                (count, surface_res, surface_res))
+    return outputs
+
+
+def _promote_complex(out_dir, name, arr, rows=4096):
+    """Rewrite a real output memmap as complex128 (first complex result),
+    copying in row blocks; returns the new memmap."""
+    path = os.path.join(out_dir, name + '.npy')
+    tmp = path + '.tmp'
+    new = np.lib.format.open_memmap(tmp, 'w+', np.complex128, arr.shape)
+    for start in range(0, arr.shape[0], rows):
+        new[start:start + rows] = arr[start:start + rows]
+    new.flush()
+    del arr
+    os.replace(tmp, path)
+    return new
+
+
+def _pack_npz(out_dir, npz_path):
+    """Zip the .npy files into an .npz without loading them (np.load works on it)."""
+    with zipfile.ZipFile(npz_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for name in sorted(os.listdir(out_dir)):
+            if name.endswith('.npy'):
+                zf.write(os.path.join(out_dir, name), arcname=name)
+
+
+def run(path, out, n_freq=1024, n_impulse=256, surface_res=0, span=1.5,
+        workers=None, chunksize=8, fmt='npy'):
+    count = sum(1 for _ in _lines(path))
+    out_dir = out if fmt == 'npy' else out + '.parts'
+    outputs = _open_outputs(out_dir, count, n_freq, n_impulse, surface_res)
+    work = functools.partial(_evaluate, n_freq=n_freq, n_impulse=n_impulse,
+                             surface_res=surface_res, span=span)
+    t0 = time.perf_counter()
+    failed = 0
+    with mp.Pool(workers) as pool:
+        for done, (i, result, err) in enumerate(
+                pool.imap_unordered(work, enumerate(_lines(path)), chunksize), 1):
+            if err is not None:
+                failed += 1
+                print(f'filter {i}: {err}', file=sys.stderr)
+            else:
+                outputs['freq'][i] = result['freq']
+                h = result['impulse']
+                if np.iscomplexobj(h) and not np.iscomplexobj(outputs['impulse']):
+                    if np.any(h.imag):
+                        # Complex coefficients: store the imaginary parts too
+                        outputs['impulse'] = _promote_complex(out_dir, 'impulse', outputs['impulse'])
+                    else:
+                        h = h.real
+                outputs['impulse'][i] = h
+                if surface_res:
+                    outputs['surface'][i] = result['surface']
+                outputs['ok'][i] = True
+            if done % 1000 == 0:
+                rate = done / (time.perf_counter() - t0)
+                print(f'{done}/{count} filters ({rate:.0f}/s)', file=sys.stderr)
+    for arr in outputs.values():
+        arr.flush()
+    del outputs
+    if fmt == 'npz':
+        _pack_npz(out_dir, out if out.endswith('.npz') else out + '.npz')
+        shutil.rmtree(out_dir)
+    elapsed = time.perf_counter() - t0
+    print(f'{count - failed}/{count} filters evaluated in {elapsed:.1f}s', file=sys.stderr)
+    return failed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('filters', help='JSON-lines file, one filter per line')
+    ap.add_argument('-o', '--out', required=True, help='output directory (npy) or file (npz)')
+    ap.add_argument('--format', choices=('npy', 'npz'), default='npy')
+    ap.add_argument('--n-freq', type=int, default=1024, help='points on [0, pi]')
+    ap.add_argument('--n-impulse', type=int, default=256)
+    ap.add_argument('--surface', type=int, default=0, metavar='RES',
+                    help='also store log10|H| on a RES x RES z-plane grid')
+    ap.add_argument('--span', type=float, default=1.5)
+    ap.add_argument('--workers', type=int, default=None, help='default: all cores')
+    ap.add_argument('--chunksize', type=int, default=8)
+    args = ap.parse_args(argv)
+    failed = run(args.filters, args.out, args.n_freq, args.n_impulse, args.surface,
+                 args.span, args.workers, args.chunksize, args.format)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Benchmarks for the evaluation and rendering hot paths.
+
+Runs headless (offscreen Qt platform, no GPU needed) over synthetic root sets
+of increasing order, reporting median time and peak traced memory per stage,
+plus a roots x grid-size scaling table for H_eval. Results can be saved as a
+named baseline and compared against later runs:
+
+    python -m bench.run --save before
+    python -m bench.run --compare before
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+
+from dsp.utils import H_eval
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+
+def synthetic_roots(order, seed=0):
+    """`order` conjugate-paired zeros and poles at random radii/angles."""
+    rng = np.random.default_rng(seed)
+    half = max(1, order // 2)
+
+    def pairs(r_lo, r_hi):
+        c = rng.uniform(r_lo, r_hi, half) * np.exp(1j * rng.uniform(0.05, np.pi - 0.05, half))
+        return np.concatenate([c, np.conj(c)])
+
+    return pairs(0.3, 1.1), pairs(0.3, 0.98)
+
+
+def drag_steps(zeros, poles):
+    """Function returning (zeros, poles) with one conjugate zero pair rotated
+    a little further on every call, as a drag does: view benchmarks then
+    measure a real edit, not the cached result of an unchanged filter."""
+    half = zeros.size // 2
+    count = [0]
+
+    def step():
+        count[0] += 1
+        z = zeros.copy()
+        z[0] = zeros[0] * np.exp(1e-4j * count[0])
+        z[half] = np.conj(z[0])
+        return z, poles
+
+    return step
+
+
+def measure(fn, repeat=5, min_time=0.2):
+    """Median wall time (ms) over at least `repeat` runs and peak traced memory (MB)."""
+    fn()  # warm-up (imports, caches)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    times = []
+    t_start = time.perf_counter()
+    while len(times) < repeat or time.perf_counter() - t_start < min_time:
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+        if len(times) >= 200:
+            break
+    return {'ms': statistics.median(times), 'peak_mb': peak / 1e6}
+
+
+def surface_grid(n, span=1.5):
+    x = np.linspace(-span, span, n)
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    return X + 1j * Y
+
+
+def bench_kernels(orders):
+    results = {}
+    ejw = np.exp(1j * np.linspace(0, np.pi, 1024))
+    grid = surface_grid(90)
+    for k in orders:
+        zeros, poles = synthetic_roots(k)
+        results[f'H_eval/freq1024/order{k}'] = measure(lambda: H_eval(ejw, zeros, poles))
+        results[f'H_eval/grid90/order{k}'] = measure(lambda: H_eval(grid, zeros, poles))
+    return results
+
+
+def bench_views(orders):
+    from PyQt6 import QtCore, QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+    from gui.editor import PoleZeroEditor
+    from gui.filter_info import FilterInfoWidget
+    from gui.freq_response import FreqResponseWidget
+    from gui.surface import Surface3D
+
+    freq = FreqResponseWidget()
+    surface = Surface3D()
+    info = FilterInfoWidget()
+    editor = PoleZeroEditor()
+    results = {}
+    for k in orders:
+        zeros, poles = synthetic_roots(k)
+        # Each sample is one edit: the views' evaluators and memos persist
+        step = drag_steps(zeros, poles)
+        results[f'freq.update_response/order{k}'] = measure(
+            lambda: freq.update_response(*step()))
+        results[f'surface.update_surface/order{k}'] = measure(
+            lambda: surface.update_surface(*step()))
+        results[f'info.update_info/order{k}'] = measure(
+            lambda: info.update_info(*step()))
+
+        # Drag loop: one on_move per event, each followed by the views' refresh
+        editor.load_from_roots(zeros, poles)
+        editor.updated.connect(lambda: (freq.update_response(editor.zeros, editor.poles),
+                                        surface.update_surface(editor.zeros, editor.poles)))
+        editor.dragging_point = ('zero', 0)
+        path = 0.5 + 0.4 * np.exp(1j * np.linspace(0.2, 1.2, 20))
+        vb = editor.plot.vb
+
+        def drag():
+            for c in path:
+                editor.on_move(vb.mapViewToScene(QtCore.QPointF(c.real, c.imag)))
+
+        stats = measure(drag, repeat=3)
+        stats['ms'] /= path.size  # per event
+        results[f'editor.on_move/order{k}'] = stats
+        editor.updated.disconnect()
+        editor.dragging_point = None
+    app.processEvents()
+    return results
+
+
+def scaling_report(orders, grids):
+    """H_eval milliseconds for every (order, grid side) combination."""
+    table = {}
+    for k in orders:
+        zeros, poles = synthetic_roots(k)
+        for n in grids:
+            grid = surface_grid(n)
+            table[f'{k}x{n}'] = measure(lambda: H_eval(grid, zeros, poles), repeat=3, min_time=0)['ms']
+    return table
+
+
+def print_results(results, baseline=None, threshold=1.2):
+    print(f'{"stage":45s} {"ms":>10s} {"peak MB":>9s}' + ('   vs base' if baseline else ''))
+    regressions = 0
+    for name, r in results.items():
+        line = f'{name:45s} {r["ms"]:10.3f} {r["peak_mb"]:9.2f}'
+        base = (baseline or {}).get(name)
+        if base:
+            ratio = r['ms'] / base['ms'] if base['ms'] else float('inf')
+            flag = '  REGRESSION' if ratio > threshold else ''
+            regressions += bool(flag)
+            line += f'   {ratio:6.2f}x{flag}'
+        print(line)
+    return regressions
+
+
+def print_scaling(table, orders, grids):
+    print('\nH_eval scaling (ms), rows: roots, columns: grid side')
+    print(f'{"":>8s}' + ''.join(f'{n:>10d}' for n in grids))
+    for k in orders:
+        print(f'{k:>8d}' + ''.join(f'{table[f"{k}x{n}"]:10.2f}' for n in grids))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--orders', type=int, nargs='+', default=[4, 16, 64, 256])
+    ap.add_argument('--grids', type=int, nargs='+', default=[32, 90, 180, 360])
+    ap.add_argument('--no-gui', action='store_true', help='skip the Qt view benchmarks')
+    ap.add_argument('--save', metavar='NAME', help='store results as a baseline')
+    ap.add_argument('--compare', metavar='NAME', help='compare against a stored baseline')
+    ap.add_argument('--threshold', type=float, default=1.2, help='slowdown flagged as regression')
+    args = ap.parse_args(argv)
+
+    results = bench_kernels(args.orders)
+    if not args.no_gui:
+        results.update(bench_views(args.orders))
+    scaling = scaling_report(args.orders, args.grids)
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, args.compare + '.json')) as f:
+            baseline = json.load(f)['results']
+    regressions = print_results(results, baseline, args.threshold)
+    print_scaling(scaling, args.orders, args.grids)
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, args.save + '.json'), 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'results': results,
+                'scaling': scaling,
+            }, f, indent=1)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import numpy as np
+
+from dsp.context import EvalContext
+from dsp.roots import strip_leading_zeros
+
+
+def _complex_list(values):
+    """Roots given as numbers, [re, im] pairs or strings like '0.5-0.2j'."""
+    out = []
+    for v in values:
+        if isinstance(v, str):
+            out.append(complex(v.replace(' ', '')))
+        elif isinstance(v, (list, tuple)):
+            out.append(complex(v[0], v[1]))
+        else:
+            out.append(complex(v))
+    return np.array(out, dtype=complex)
+
+
+def parse_filter(obj):
+    """Normalise one filter description to a dict with zeros/poles and/or b/a.
+
+    Accepted keys: 'zeros'/'poles' (root lists) or 'b'/'a' (coefficients in
+    descending powers of z); missing halves default to no roots / [1.0].
+    """
+    spec = {'zeros': None, 'poles': None, 'b': None, 'a': None}
+    if 'zeros' in obj or 'poles' in obj:
+        spec['zeros'] = _complex_list(obj.get('zeros', []))
+        spec['poles'] = _complex_list(obj.get('poles', []))
+    if 'b' in obj or 'a' in obj:
+        spec['b'] = np.asarray(obj.get('b', [1.0]), dtype=float)
+        spec['a'] = np.asarray(obj.get('a', [1.0]), dtype=float)
+    if spec['zeros'] is None and spec['b'] is None:
+        raise ValueError('filter needs zeros/poles or b/a')
+    return spec
+
+
+def spec_context(spec):
+    """(EvalContext, gain) for a parsed filter: roots when given (gain b0/a0
+    from the coefficients if also present), the coefficients alone otherwise."""
+    if spec['b'] is not None:
+        b, a = strip_leading_zeros(spec['b']), strip_leading_zeros(spec['a'])
+        if spec['zeros'] is None:
+            return EvalContext(None, None, (b, a)), 1.0
+        return EvalContext(spec['zeros'], spec['poles']), float(b[0] / a[0])
+    return EvalContext(spec['zeros'], spec['poles']), 1.0
+
+
+def surface_grid(resolution, span=1.5):
+    """Complex evaluation grid matching Surface3D's layout (x along axis 0)."""
+    x = np.linspace(-span, span, resolution)
+    X, Y = np.meshgrid(x, x, indexing='ij')
+    return X + 1j * Y
+
+
+def evaluate_filter(spec, n_freq=1024, n_impulse=256, surface_res=0, span=1.5):
+    """Frequency response, impulse response and optional log10|H| surface.
+
+    Everything goes through the filter's EvalContext (see spec_context), so
+    root-only filters are evaluated as prod(z-zi)/prod(z-pi) like the GUI and
+    coefficient sets as b(z)/a(z); the gain b0/a0 of roots given together
+    with coefficients applies to all three outputs.
+    """
+    ctx, gain = spec_context(spec)
+    out = {'freq': ctx.response(n_freq)[1] * gain,
+           'impulse': ctx.impulse(n_impulse) * gain}
+    if surface_res:
+        log_h = ctx.log_eval(surface_grid(surface_res, span),
+                             out=np.empty((surface_res, surface_res), np.complex64))
+        out['surface'] = np.maximum(log_h.real / np.log(10.0) + np.log10(abs(gain)), -9.0)
+    return out
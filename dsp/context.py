@@ -0,0 +1,308 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from dsp.freqz import choose_method, freq_response, log_polyval
+from dsp.grids import resonance_samples
+from dsp.impulse import impulse_response
+from dsp.incremental import IncrementalEvaluator
+from dsp.sos import roots_to_sos, sos_impulse_response, sos_to_coeffs
+from dsp.utils import log_H_eval
+
+
+class EvaluatorCache:
+    """Incremental unit-circle evaluators kept across edits, keyed by grid size.
+
+    Successive contexts hand their roots to the same evaluator, so a drag only
+    pays for the roots that moved.
+    """
+
+    def __init__(self):
+        self._evals: dict[int, IncrementalEvaluator] = {}
+        self._lock = threading.Lock()
+
+    def log_response(self, n, zeros, poles):
+        """log H on n uniform points over [0, pi] (a copy, safe to keep)."""
+        with self._lock:
+            ev = self._evals.get(n)
+            if ev is None:
+                ev = self._evals[n] = IncrementalEvaluator(np.exp(1j * uniform_w(n)))
+            return ev.update(zeros, poles).copy()
+
+
+def uniform_w(n):
+    return np.linspace(0, np.pi, n)
+
+
+def _conjugate_symmetric(roots, tol=1e-9):
+    s = np.sort_complex(roots)
+    return np.allclose(s, np.sort_complex(np.conj(roots)), atol=tol)
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def root_key(zeros, poles, coeffs=None, quantum=1e-9):
+    """Order-independent hash of a root configuration (roots rounded to
+    `quantum`), plus the coefficients when given."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b'c' if zeros is None else b'r')
+    for roots in (zeros, poles):
+        r = np.asarray(() if roots is None else roots, dtype=complex).ravel()
+        q = np.round(np.stack([r.real, r.imag]) / quantum).astype(np.int64)
+        q = q[:, np.lexsort((q[1], q[0]))]
+        h.update(np.int64(r.size).tobytes())
+        h.update(q.tobytes())
+    if coeffs is not None:
+        for c in coeffs:
+            h.update(np.asarray(c, dtype=float).tobytes())
+    return h.digest()
+
+
+class EvalContext:
+    """Everything derived from one set of roots, computed on first use.
+
+    All views of one edit read from the same context, so the unit-circle
+    response, SOS cascade, coefficients and impulse response are computed once
+    however many views need them. `coeffs` = monic (b, a) when the roots came
+    from coefficients (lets long filters use FFT/polyval evaluation). Values
+    are memoized per key under a per-key lock, so concurrent workers wait for
+    one computation instead of repeating it. Pickling (process workers) sends
+    only the roots and coefficients.
+
+    zeros=poles=None gives a coefficient-only context (filters too long to
+    factor): responses come from FFT/polyval evaluation of (b, a), which keep
+    their gain, and the SOS cascade is unavailable.
+    """
+
+    def __init__(self, zeros, poles, coeffs=None, evaluators=None):
+        self.has_roots = zeros is not None
+        if not self.has_roots and coeffs is None:
+            raise ValueError('a context needs roots or coefficients')
+        self.zeros = np.asarray(() if zeros is None else zeros, dtype=complex)
+        self.poles = np.asarray(() if poles is None else poles, dtype=complex)
+        self.given_coeffs = coeffs
+        self.evaluators = evaluators
+        self._memo = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(evaluators=None, _memo={}, _lock=None, _key_locks={})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def memo(self, key, fn, *args):
+        """fn(*args), computed once per key; views can memoize their own
+        derived results here too."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        with self._lock:
+            lock = self._key_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = fn(*args)
+        return self._memo[key]
+
+    @property
+    def nbytes(self):
+        """Memory held by memoized arrays."""
+        return sum(_nbytes(v) for v in list(self._memo.values()))
+
+    # ---------- Roots ----------
+    @property
+    def real_coeffs(self):
+        """Whether the roots come in conjugate pairs (real b, a)."""
+        if not self.has_roots:
+            return all(np.isrealobj(c) for c in self.given_coeffs)
+        return self.memo('real', lambda: _conjugate_symmetric(self.zeros)
+                         and _conjugate_symmetric(self.poles))
+
+    @property
+    def pole_radii(self):
+        def compute():
+            if self.has_roots:
+                return np.abs(self.poles)
+            a = self.given_coeffs[1]
+            return np.abs(np.roots(a)) if len(a) > 1 else np.empty(0)
+        return self.memo('pole_radii', compute)
+
+    @property
+    def is_stable(self):
+        """All poles strictly inside the unit circle."""
+        return bool(np.all(self.pole_radii < 1.0))
+
+    # ---------- Unit circle ----------
+    def log_response(self, n):
+        """(w, log H(e^jw)) on n uniform points over [0, pi]."""
+        return self.memo(('log_response', n), self._log_response, n)
+
+    def _roots_or_none(self):
+        return (self.zeros, self.poles) if self.has_roots else (None, None)
+
+    def log_eval(self, z, out=None, scratch=None):
+        """log H at arbitrary points (e.g. a surface grid), written into out
+        when given; `scratch` as for log_H_eval."""
+        if self.has_roots:
+            return log_H_eval(z, self.zeros, self.poles, out=out, scratch=scratch)
+        b, a = self.given_coeffs
+        log_h = log_polyval(b, z) - log_polyval(a, z)
+        if out is None:
+            return log_h
+        out[...] = log_h
+        return out
+
+    def _log_response(self, n):
+        w = uniform_w(n)
+        b, a = self.given_coeffs if self.given_coeffs is not None else (None, None)
+        zeros, poles = self._roots_or_none()
+        if choose_method(w, zeros, poles, b, a) != 'roots':
+            with np.errstate(divide='ignore'):
+                return w, np.log(freq_response(w, zeros, poles, b, a))
+        if self.evaluators is not None:
+            return w, self.evaluators.log_response(n, self.zeros, self.poles)
+        return w, log_H_eval(np.exp(1j * w), self.zeros, self.poles)
+
+    def response(self, n):
+        """(w, H(e^jw)) on n uniform points over [0, pi]."""
+        def compute():
+            w, log_h = self.log_response(n)
+            with np.errstate(over='ignore'):
+                return w, np.exp(log_h)
+        return self.memo(('response', n), compute)
+
+    def full_circle_log(self, n):
+        """(theta, log H) around the whole circle, 2n-1 points over [0, 2pi];
+        the lower half mirrors the upper one for real filters."""
+        def compute():
+            w, log_h = self.log_response(n)
+            theta = np.concatenate([w, 2 * np.pi - w[-2::-1]])
+            if self.real_coeffs:
+                lower = np.conj(log_h[-2::-1])
+            else:
+                lower = self.log_eval(np.exp(1j * theta[n:]))
+            return theta, np.concatenate([log_h, lower])
+        return self.memo(('full_circle_log', n), compute)
+
+    def resonance_response(self, n):
+        """(w, H) at up to n extra frequencies clustered around roots near the
+        unit circle."""
+        def compute():
+            roots = np.concatenate([self.zeros, self.poles])
+            w = resonance_samples(roots, n) if self.has_roots else np.empty(0)
+            if not w.size:
+                return w, np.empty(0, dtype=complex)
+            b, a = self.given_coeffs if self.given_coeffs is not None else (None, None)
+            return w, freq_response(w, self.zeros, self.poles, b, a)
+        return self.memo(('resonance', n), compute)
+
+    def group_delay(self, n):
+        """(w, group delay in samples) on n uniform points over [0, pi].
+
+        Analytic: tau = sum_p Re(z/(z-p)) - sum_z Re(z/(z-z_k)) at z = e^jw;
+        differentiated from the unwrapped phase for coefficient-only filters.
+        """
+        def compute():
+            if not self.has_roots:
+                w, log_h = self.log_response(n)
+                return w, -np.gradient(np.unwrap(log_h.imag), w)
+            w = uniform_w(n)
+            z = np.exp(1j * w)
+            tau = np.zeros(n)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                for r in self.poles:
+                    tau += (z / (z - r)).real
+                for r in self.zeros:
+                    tau -= (z / (z - r)).real
+            return w, tau
+        return self.memo(('group_delay', n), compute)
+
+    # ---------- Coefficients / time domain ----------
+    @property
+    def sos(self):
+        if not self.has_roots:
+            raise ValueError('coefficient-only context has no SOS cascade')
+        return self.memo('sos', roots_to_sos, self.zeros, self.poles)
+
+    @property
+    def coeffs(self):
+        """(b, a) in descending powers of z, exported from the SOS cascade
+        (the given coefficients for coefficient-only contexts)."""
+        if not self.has_roots:
+            return self.given_coeffs
+        return self.memo('coeffs', sos_to_coeffs, self.sos, len(self.zeros), len(self.poles))
+
+    def impulse(self, n=64):
+        """Impulse response through the cascade (n samples, None = until decayed)."""
+        if not self.has_roots:
+            return self.memo(('impulse', n), impulse_response, *self.given_coeffs, n)
+        return self.memo(('impulse', n), sos_impulse_response, self.sos, n,
+                         max(0, len(self.poles) - len(self.zeros)))
+
+
+class ContextCache:
+    """LRU of EvalContexts keyed by `root_key`, bounded by entry count and by
+    the memory their memoized results hold.
+
+    Returning to an earlier configuration (undo/redo, toggling between
+    filters) gets its context back with everything already computed.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, max_entries=512, quantum=1e-9):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.quantum = quantum
+        self.evaluators = EvaluatorCache()
+        self._entries: OrderedDict[bytes, EvalContext] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return sum(ctx.nbytes for ctx in self._entries.values())
+
+    def get(self, zeros, poles, coeffs=None):
+        key = root_key(zeros, poles, coeffs, self.quantum)
+        ctx = self._entries.get(key)
+        if ctx is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            ctx = self._entries[key] = EvalContext(zeros, poles, coeffs, self.evaluators)
+        self.evict()
+        return ctx
+
+    def evict(self):
+        """Drop least recently used contexts until within budget (the most
+        recent one always stays)."""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.max_bytes is None:
+            return
+        sizes = [ctx.nbytes for ctx in self._entries.values()]
+        total = sum(sizes)
+        for size in sizes[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._entries.popitem(last=False)
+            total -= size
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+
+CSV_CHUNK_LINES = 65536
+
+
+def read_csv(path, chunk_lines=CSV_CHUNK_LINES):
+    """Stream real coefficients from a text file into {'b': ..., 'a': ...}.
+
+    Values may be separated by commas, whitespace or newlines. Lines starting
+    with '#' are comments, except '# b' / '# a', which switch the section the
+    following values go to (default 'b'). Lines are converted in chunks, so the
+    file is never held as one string.
+    """
+    sections = {'b': [], 'a': []}
+    target = sections['b']
+    tokens = []
+
+    def flush():
+        if tokens:
+            target.append(np.array(tokens, dtype=float))
+            tokens.clear()
+
+    with open(path) as f:
+        for k, line in enumerate(f, 1):
+            line = line.strip()
+            if line.startswith('#'):
+                name = line[1:].strip().lower()
+                if name in sections:
+                    flush()
+                    target = sections[name]
+                continue
+            tokens.extend(line.replace(',', ' ').split())
+            if k % chunk_lines == 0:
+                flush()
+    flush()
+    return {name: np.concatenate(parts) for name, parts in sections.items() if parts}
+
+
+def load_filter(path, mmap=True):
+    """Filter spec (zeros/poles and/or b/a, like dsp.batch.parse_filter) from
+    .npy (FIR taps, memory-mapped), .npz (any of zeros, poles, b, a) or
+    .csv/.txt (see read_csv)."""
+    ext = os.path.splitext(path)[1].lower()
+    spec = {'zeros': None, 'poles': None, 'b': None, 'a': None}
+    if ext == '.npy':
+        taps = np.load(path, mmap_mode='r' if mmap else None)
+        if taps.ndim != 1 or np.iscomplexobj(taps):
+            raise ValueError('.npy import expects a 1-D real array of FIR taps')
+        spec['b'], spec['a'] = taps, np.array([1.0])
+    elif ext == '.npz':
+        with np.load(path) as data:
+            for key in spec:
+                if key in data.files:
+                    spec[key] = data[key]
+        if spec['zeros'] is not None or spec['poles'] is not None:
+            for key in ('zeros', 'poles'):
+                spec[key] = np.empty(0, dtype=complex) if spec[key] is None else spec[key].astype(complex)
+    elif ext in ('.csv', '.txt'):
+        coeffs = read_csv(path)
+        spec['b'] = coeffs.get('b', np.array([1.0]))
+        spec['a'] = coeffs.get('a', np.array([1.0]))
+    else:
+        raise ValueError(f'unsupported file type: {ext or path}')
+    if spec['zeros'] is None and spec['b'] is None:
+        raise ValueError('file holds neither roots nor coefficients')
+    if spec['b'] is not None and spec['a'] is None:
+        spec['a'] = np.array([1.0])
+    return spec
+
+
+def save_filter(path, zeros=None, poles=None, b=None, a=None):
+    """Write a filter as .npz (everything given), .npy (FIR taps only) or
+    .csv (coefficients, one value per line under '# b' / '# a')."""
+    ext = os.path.splitext(path)[1].lower()
+    a = np.array([1.0]) if a is None else np.asarray(a)
+    if ext == '.npz':
+        arrays = {k: np.asarray(v) for k, v in
+                  (('zeros', zeros), ('poles', poles), ('b', b), ('a', a)) if v is not None}
+        np.savez(path, **arrays)
+        return
+    if b is None:
+        raise ValueError(f'{ext} export needs coefficients')
+    b = np.real_if_close(np.asarray(b))
+    a = np.real_if_close(a)
+    if ext == '.npy':
+        if a.size != 1:
+            raise ValueError('.npy export holds FIR taps only; use .npz or .csv for IIR filters')
+        np.save(path, b / a[0])
+    elif ext in ('.csv', '.txt'):
+        with open(path, 'w') as f:
+            f.write('# b\n')
+            np.savetxt(f, b.real, fmt='%.17g')
+            f.write('# a\n')
+            np.savetxt(f, a.real, fmt='%.17g')
+    else:
+        raise ValueError(f'unsupported file type: {ext or path}')
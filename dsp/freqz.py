@@ -0,0 +1,102 @@
+import numpy as np
+
+from dsp.utils import H_eval
+
+# Root-product work (roots x points) above which coefficients are preferred
+FFT_THRESHOLD = 64 * 1024
+# Points per block when evaluating long polynomials off the FFT grid
+POLYVAL_CHUNK = 4096
+
+
+def _folded_dft(c, nfft):
+    """rfft of c at nfft points; longer sequences are folded (time-aliased)
+    into nfft samples first, which is exact on the nfft roots of unity."""
+    c = np.asarray(c)
+    if c.size > nfft:
+        c = np.pad(c, (0, -c.size % nfft)).reshape(-1, nfft).sum(axis=0)
+    return np.fft.rfft(c, nfft)
+
+
+def freqz_fft(b, a, n):
+    """H(e^jw) = b(z)/a(z) on w = linspace(0, pi, n) via zero-padded FFTs.
+
+    b and a are polynomial coefficients in descending powers of z (np.poly
+    order), so b(z) = z^M * sum b_k z^-k and H picks up a z^(M-N) factor
+    relative to the usual freqz convention.
+    """
+    nfft = 2 * (n - 1)
+    w = np.linspace(0, np.pi, n)
+    B = _folded_dft(b, nfft)
+    A = _folded_dft(a, nfft)
+    shift = (len(b) - 1) - (len(a) - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return B / A * np.exp(1j * w * shift)
+
+
+def _polyval_chunked(c, z):
+    out = np.empty(z.shape, dtype=complex)
+    for i in range(0, z.size, POLYVAL_CHUNK):
+        out.flat[i:i + POLYVAL_CHUNK] = np.polyval(c, z.flat[i:i + POLYVAL_CHUNK])
+    return out
+
+
+def log_polyval(c, z):
+    """log c(z) (descending powers) without overflow for high orders: Horner
+    in z inside the unit circle, and z^m * c~(1/z) with the reversed
+    polynomial outside it."""
+    c = np.asarray(c)
+    z = np.asarray(z, dtype=complex)
+    out = np.empty(z.shape, dtype=complex)
+    inside = np.abs(z) <= 1.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[inside] = np.log(_polyval_chunked(c, z[inside]))
+        zo = z[~inside]
+        out[~inside] = (len(c) - 1) * np.log(zo) + np.log(_polyval_chunked(c[::-1], 1.0 / zo))
+    return out
+
+
+def freqz_polyval(b, a, w):
+    """H(e^jw) = b(z)/a(z) on an arbitrary frequency grid (Horner, chunked)."""
+    z = np.exp(1j * np.asarray(w, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return _polyval_chunked(b, z) / _polyval_chunked(a, z)
+
+
+def is_uniform_grid(w):
+    """True when w is linspace(0, pi, len(w)), i.e. an FFT grid."""
+    w = np.asarray(w)
+    return w.size > 1 and np.allclose(w, np.linspace(0, np.pi, w.size), rtol=0, atol=1e-12)
+
+
+def choose_method(w, zeros=None, poles=None, b=None, a=None):
+    """Pick 'roots', 'fft' or 'polyval' for evaluating H on w."""
+    have_roots = zeros is not None and poles is not None
+    if b is None or a is None:
+        return 'roots'
+    n_roots = len(zeros) + len(poles) if have_roots else None
+    if have_roots and n_roots * np.size(w) <= FFT_THRESHOLD:
+        return 'roots'
+    if is_uniform_grid(w):
+        return 'fft'
+    if have_roots and n_roots <= len(b) + len(a):
+        return 'roots'
+    return 'polyval'
+
+
+def freq_response(w, zeros=None, poles=None, b=None, a=None, method='auto'):
+    """H(e^jw) from roots and/or coefficients, picking the cheaper evaluator.
+
+    When coefficients are given the result is b(z)/a(z) including the gain
+    b[0]/a[0]; the root-product path is scaled to match.
+    """
+    w = np.asarray(w, dtype=float)
+    if method == 'auto':
+        method = choose_method(w, zeros, poles, b, a)
+    if method == 'fft':
+        return freqz_fft(b, a, w.size)
+    if method == 'polyval':
+        return freqz_polyval(b, a, w)
+    H = H_eval(np.exp(1j * w), zeros, poles)
+    if b is not None and a is not None:
+        H *= b[0] / a[0]
+    return H
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def refined_axis(span, n, centers, extra_fraction=0.4, depth=4):
+    """Axis over [-span, span] with at most n points, clustered around `centers`.
+
+    A uniform base takes most of the points; the rest are split between the
+    centers (root coordinates) at offsets of step/2, step/4, ... step/2**depth,
+    so the fast-changing magnitude next to a pole or zero is sampled densely
+    without placing a vertex on the singularity itself.
+    """
+    centers = np.asarray(centers, dtype=float)
+    centers = np.unique(np.round(centers[np.abs(centers) < span], 6))
+    n_extra = min(int(n * extra_fraction), centers.size * 2 * depth)
+    base = np.linspace(-span, span, n - n_extra)
+    if not n_extra:
+        return base
+    step = 2 * span / (n - n_extra - 1)
+    per = int(np.clip(n_extra // centers.size, 2, 2 * depth))
+    keep = n_extra // per
+    if centers.size > keep:
+        centers = centers[np.linspace(0, centers.size - 1, keep).astype(int)]
+    offsets = step * 0.5 ** np.arange(1, per // 2 + 1)
+    offsets = np.concatenate([-offsets, offsets])
+    extra = (centers[:, None] + offsets).ravel()
+    extra = extra[np.abs(extra) < span]
+    return np.unique(np.concatenate([base, extra]))
+
+
+def resonance_samples(roots, n, r_min=0.8, spread=3.0):
+    """Extra frequencies in [0, pi] around roots close to the unit circle.
+
+    A root at radius r and angle theta shapes |H(e^jw)| over a width of about
+    d = |1 - r| around w = theta. Each root with r >= r_min gets an equal share
+    of the n points, placed at theta + d * sinh(t) for t in [-spread, spread],
+    so the sample density near the root scales as 1/d: dense at the
+    peak/notch, thinning out over ~10 widths.
+    """
+    roots = np.asarray(roots, dtype=complex).ravel()
+    r = np.abs(roots)
+    theta = np.angle(roots)
+    d = np.maximum(np.abs(1.0 - r), 1e-6)
+    keep = (r >= r_min) & (d < 1.0 - r_min) & (theta >= -d) & (theta <= np.pi + d)
+    if n <= 0 or not np.any(keep):
+        return np.empty(0)
+    theta, d = theta[keep], d[keep]
+    k = n // theta.size
+    if k < 3:
+        # Budget too small for every root: keep the sharpest ones, at least 3
+        # points each (with fewer than 3 points, just their centres); the
+        # total never exceeds n
+        order = np.argsort(d, kind='stable')
+        if n < 3:
+            w = theta[order[:n]]
+            return np.unique(w[(w >= 0) & (w <= np.pi)])
+        order = order[:n // 3]
+        theta, d, k = theta[order], d[order], n // order.size
+    t = np.sinh(np.linspace(-spread, spread, k))
+    w = (theta[:, None] + d[:, None] * t).ravel()
+    return np.unique(w[(w >= 0) & (w <= np.pi)])
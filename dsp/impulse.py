@@ -0,0 +1,78 @@
+import numpy as np
+
+
+def _lfilter_numpy(b, a, x):
+    """Direct-form recursion; NumPy fallback when scipy is not installed."""
+    b = np.asarray(b) / a[0]
+    a = np.asarray(a) / a[0]
+    v = np.convolve(x, b)[:x.size]  # moving-average part in one shot
+    order = a.size - 1
+    if order == 0:
+        return v
+    y = np.zeros(x.size + order, dtype=np.result_type(v, a))
+    ar = -a[:0:-1]  # -a_N .. -a_1, matching y[n-N] .. y[n-1]
+    for i in range(x.size):
+        y[i + order] = v[i] + ar @ y[i:i + order]
+    return y[order:]
+
+
+def lfilter(b, a, x):
+    """scipy.signal.lfilter when available (imported lazily), else NumPy."""
+    try:
+        from scipy.signal import lfilter as sp_lfilter
+    except ImportError:
+        return _lfilter_numpy(b, a, x)
+    return sp_lfilter(b, a, x)
+
+
+def causal_coeffs(b, a):
+    """Coefficients in descending powers of z -> z^-1 form for lfilter.
+
+    A numerator shorter than the denominator becomes a delay (as in
+    scipy's dimpulse); a longer one is shifted to start at n = 0.
+    """
+    b = np.atleast_1d(np.asarray(b))
+    a = np.atleast_1d(np.asarray(a))
+    if b.size < a.size:
+        b = np.concatenate([np.zeros(a.size - b.size, dtype=b.dtype), b])
+    return b, a
+
+
+def auto_length(simulate, n0=64, tol=1e-6, max_n=65536):
+    """Run simulate(n) over doubling lengths until the last quarter of the
+    response stays below tol * max|h| (or max_n is reached)."""
+    n = n0
+    while True:
+        h = simulate(n)
+        tail = np.abs(h[-(n // 4):]).max()
+        if tail <= tol * np.abs(h).max() or n >= max_n:
+            return h
+        n = min(2 * n, max_n)
+
+
+def impulse_response(b, a, n=64, tol=1e-6, max_n=65536):
+    """h[k] for k < n of H(z) = b(z)/a(z).
+
+    With n=None the length is chosen automatically: FIR filters return all
+    taps, IIR filters are simulated over doubling lengths until the last
+    quarter of the response stays below tol * max|h| (or max_n is reached).
+    """
+    b, a = causal_coeffs(b, a)
+    fir = a.size == 1
+    if n is None:
+        if not fir:
+            return auto_length(lambda k: impulse_response(b, a, k), max(64, b.size), tol, max_n)
+        n = b.size
+    if fir:
+        h = np.zeros(n, dtype=np.result_type(b, float))
+        k = min(n, b.size)
+        h[:k] = b[:k] / a[0]
+        return h
+    x = np.zeros(n)
+    x[0] = 1.0
+    return lfilter(b, a, x)
+
+
+def step_response(b, a, n=64, tol=1e-6, max_n=65536):
+    """Step response, i.e. the running sum of the impulse response."""
+    return np.cumsum(impulse_response(b, a, n, tol, max_n))
@@ -0,0 +1,78 @@
+from collections import Counter
+
+import numpy as np
+
+from dsp.utils import log_factor
+
+
+class IncrementalEvaluator:
+    """H(z) on a fixed grid, updated root by root.
+
+    The evaluator keeps log H(z) = sum log(z-zi) - sum log(z-pi) as one complex
+    accumulator (real part: log-magnitude, imaginary part: phase). Moving a root
+    removes its old factor and adds the new one, so an edit costs O(grid) per
+    changed root instead of O(roots x grid). `single=True` accumulates in
+    complex64 for display-only grids.
+    """
+
+    def __init__(self, z, resync_every=512, single=False):
+        dtype = np.complex64 if single else np.complex128
+        self.z = np.asarray(z, dtype=dtype)
+        self.log_h = np.zeros(self.z.shape, dtype=dtype)
+        self._work = np.empty_like(self.log_h)
+        self._phase = np.empty(self.z.shape, dtype=self.log_h.real.dtype)
+        self.zeros: Counter = Counter()
+        self.poles: Counter = Counter()
+        # Full rebuild after this many factor updates to bound rounding drift
+        self.resync_every = resync_every
+        self._ops = 0
+
+    def _add(self, root, sign):
+        if sign > 0:
+            self.log_h += log_factor(self.z, root, self._work, self._phase)
+        else:
+            self.log_h -= log_factor(self.z, root, self._work, self._phase)
+        self._ops += 1
+
+    def reset(self, zeros, poles):
+        """Rebuild the accumulator from scratch."""
+        self.log_h.fill(0)
+        self.zeros = Counter(complex(r) for r in zeros)
+        self.poles = Counter(complex(r) for r in poles)
+        for r, k in self.zeros.items():
+            for _ in range(k):
+                self._add(r, +1)
+        for r, k in self.poles.items():
+            for _ in range(k):
+                self._add(r, -1)
+        self._ops = 0
+        return self.log_h
+
+    def update(self, zeros, poles):
+        """Bring the accumulator in line with the given roots and return log H."""
+        new_z = Counter(complex(r) for r in zeros)
+        new_p = Counter(complex(r) for r in poles)
+        diffs = (
+            (self.zeros - new_z, -1),  # removed zeros
+            (new_z - self.zeros, +1),  # added zeros
+            (self.poles - new_p, +1),  # removed poles
+            (new_p - self.poles, -1),  # added poles
+        )
+        changes = sum(sum(d.values()) for d, _ in diffs)
+        if changes == 0:
+            return self.log_h
+        total = sum(new_z.values()) + sum(new_p.values())
+        if changes >= total or self._ops + changes > self.resync_every:
+            return self.reset(zeros, poles)
+        for d, sign in diffs:
+            for r, k in d.items():
+                for _ in range(k):
+                    self._add(r, sign)
+        self.zeros = new_z
+        self.poles = new_p
+        return self.log_h
+
+    def evaluate(self, zeros, poles):
+        """Return H(z) on the grid for the given roots."""
+        with np.errstate(over='ignore'):
+            return np.exp(self.update(zeros, poles))
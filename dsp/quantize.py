@@ -0,0 +1,191 @@
+"""Fixed-point coefficient quantization, evaluated for many word lengths and
+rounding modes at once.
+
+Coefficients are stored as signed two's complement words of W bits with the
+fewest integer bits that hold the largest magnitude of each coefficient
+group (an SOS numerator or denominator, or a whole polynomial), saturating.
+Values are computed exactly in float64 (W <= 52), so results are bit-true.
+"""
+import numpy as np
+
+from dsp.utils import LOG_FLOOR
+
+MODES = ('round', 'convergent', 'floor', 'trunc')
+BITS = np.arange(4, 33)
+
+_ROUND = {
+    'round': lambda x: np.copysign(np.floor(np.abs(x) + 0.5), x),  # half away from zero
+    'convergent': np.rint,  # half to even
+    'floor': np.floor,  # two's complement truncation
+    'trunc': np.trunc,  # toward zero (sign-magnitude truncation)
+}
+
+
+def int_bits(c, axis=None):
+    """Integer bits (excluding sign) needed for max|c| along axis."""
+    peak = np.max(np.abs(c), axis=axis, keepdims=axis is not None)
+    with np.errstate(divide='ignore'):
+        return np.maximum(0, np.floor(np.log2(peak)) + 1).astype(int)
+
+
+def quantize(c, bits=BITS, modes=MODES, axis=None):
+    """Quantized copies of c: shape (len(modes), len(bits)) + c.shape.
+
+    The integer bits are chosen per group along `axis` (None: one format for
+    all of c). Complex values quantize their real and imaginary parts.
+    """
+    c = np.asarray(c)
+    if np.iscomplexobj(c):
+        return quantize(c.real, bits, modes, axis) + 1j * quantize(c.imag, bits, modes, axis)
+    bits = np.asarray(bits).reshape((-1,) + (1,) * c.ndim)
+    frac = bits - 1 - int_bits(c, axis)
+    scale = np.ldexp(1.0, frac)
+    x = c * scale
+    hi = np.ldexp(1.0, bits - 1)
+    out = np.empty((len(modes),) + x.shape)
+    for i, mode in enumerate(modes):
+        np.clip(_ROUND[mode](x), -hi, hi - 1, out=out[i])
+    return out / scale
+
+
+def _quadratic_roots(c):
+    """Roots of c0 z^2 + c1 z + c2 for (..., 3) coefficient arrays, (..., 2)."""
+    c0, c1, c2 = c[..., 0], c[..., 1], c[..., 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d = np.sqrt(c1.astype(complex) ** 2 - 4 * c0 * c2)
+        # The larger-magnitude root first, the other from the product (stable)
+        q = -0.5 * (c1 + np.where((np.conj(c1) * d).real >= 0, d, -d))
+        r1 = q / c0
+        r2 = np.where(q != 0, c2 / q, 0)
+    return np.stack([r1, r2], axis=-1)
+
+
+def _sos_roots(sos, ref, orders=None):
+    """Zeros and poles of all sections, flattened.
+
+    A section of order < 2 is padded with zero coefficients, whose extra
+    roots sit at the origin; `orders` = (number of zeros, number of poles) of
+    the filter says how many roots are real, and that many origin roots of
+    the unquantized sections `ref` are dropped as padding (quantizing keeps
+    zero coefficients at 0, so those roots stay padding). Without `orders`,
+    every root from a zero coefficient counts as padding.
+    """
+    out = []
+    for k, part in enumerate((slice(0, 3), slice(3, 6))):
+        r = _quadratic_roots(sos[..., part])
+        c = ref[:, part]
+        pad = np.stack([(c[:, 1] == 0) & (c[:, 2] == 0), c[:, 2] == 0], axis=1).ravel()
+        if orders is not None:
+            # Only the surplus over the filter's order is padding
+            surplus = max(0, c.shape[0] * 2 - orders[k])
+            pad[np.flatnonzero(pad)[surplus:]] = False
+        out.append(r.reshape(r.shape[:-2] + (-1,))[..., ~pad])
+    return out
+
+
+def _log_abs(x):
+    """log|x| floored at LOG_FLOOR (roots quantized onto the circle)."""
+    with np.errstate(divide='ignore'):
+        return np.fmax(np.log(np.abs(x)), LOG_FLOOR)
+
+
+def _fold(p, nfft):
+    """p (last axis) wrapped onto nfft samples: its nfft-point DFT equals the
+    DTFT of the whole sequence at those bins, for any length."""
+    pad = -p.shape[-1] % nfft
+    p = np.pad(p, [(0, 0)] * (p.ndim - 1) + [(0, pad)])
+    return p.reshape(p.shape[:-1] + (-1, nfft)).sum(axis=-2)
+
+
+def _max_shift(q, orig):
+    """Largest distance from an original root to its nearest quantized root,
+    per leading index of q (..., n)."""
+    if not orig.size:
+        return np.zeros(q.shape[:-1])
+    d = np.abs(q[..., None, :] - orig[:, None])
+    return np.nan_to_num(d.min(axis=-1).max(axis=-1), nan=np.inf)
+
+
+def _deviation(mag_db, ref_db, range_db):
+    """Max |dB difference|, both floored at max(ref) - range_db."""
+    floor = ref_db.max() - range_db
+    return np.abs(np.maximum(mag_db, floor) - np.maximum(ref_db, floor)).max(axis=-1)
+
+
+def analyze_sos(sos, bits=BITS, modes=MODES, n=512, range_db=120.0, orders=None):
+    """Quantize an SOS cascade ([b0 b1 b2 a0 a1 a2] rows, a0 = 1 kept
+    exact) for every (mode, word length); `orders` = (zeros, poles) of the
+    filter tells real roots at the origin from section padding.
+
+    Returns a dict with 'bits', 'modes', 'w' and, per (mode, bits): 'zeros',
+    'poles', 'mag_db' (n points on [0, pi]), 'max_dev_db', 'max_shift' (root
+    displacement), 'max_radius' (>= 1: unstable); 'ref_db' is the unquantized
+    response.
+    """
+    sos = np.asarray(sos)
+    q = np.empty((len(modes), len(bits)) + sos.shape, dtype=sos.dtype)
+    q[..., :3] = quantize(sos[:, :3], bits, modes, axis=1)
+    q[..., 3] = sos[:, 3]
+    q[..., 4:] = quantize(sos[:, 4:], bits, modes, axis=1)
+    w = np.linspace(0, np.pi, n)
+    e = np.exp(-1j * np.outer(np.arange(3), w))  # (3, n)
+
+    def log_mag(s):
+        num = _log_abs(s[..., :3] @ e).sum(axis=-2)
+        den = _log_abs(s[..., 3:] @ e).sum(axis=-2)
+        return (num - den) * (20 / np.log(10))
+
+    zeros0, poles0 = _sos_roots(sos, sos, orders)
+    zeros, poles = _sos_roots(q, sos, orders)
+    ref_db = log_mag(sos)
+    mag_db = log_mag(q)
+    return {
+        'bits': np.asarray(bits), 'modes': tuple(modes), 'w': w,
+        'zeros': zeros, 'poles': poles, 'mag_db': mag_db, 'ref_db': ref_db,
+        'max_dev_db': _deviation(mag_db, ref_db, range_db),
+        'max_shift': np.maximum(_max_shift(zeros, zeros0), _max_shift(poles, poles0)),
+        'max_radius': np.abs(poles).max(axis=-1, initial=0.0),
+    }
+
+
+def analyze_coeffs(b, a, bits=BITS, modes=MODES, n=512, range_db=120.0, max_root_order=64):
+    """As analyze_sos for direct-form (b, a) in descending powers of z, each
+    polynomial with its own format. Responses come from one n-point-grid FFT
+    per mode (long polynomials are folded onto it first); roots (np.roots per combination) only up to max_root_order."""
+    b, a = np.asarray(b), np.asarray(a)
+    qb = quantize(b, bits, modes)
+    qa = quantize(a, bits, modes)
+    # n points on [0, pi] are bins 0..n-1 of a 2(n-1)-point FFT
+    nfft = 2 * (n - 1)
+    w = np.linspace(0, np.pi, n)
+    fft = np.fft.fft if np.iscomplexobj(b) or np.iscomplexobj(a) else np.fft.rfft
+
+    def log_mag(pb, pa):
+        # Reversed to ascending powers of z^-1: same magnitude on the circle
+        num = _log_abs(fft(_fold(pb[..., ::-1], nfft))[..., :n])
+        den = _log_abs(fft(_fold(pa[..., ::-1], nfft))[..., :n])
+        return (num - den) * (20 / np.log(10))
+
+    ref_db = log_mag(b, a)
+    mag_db = np.stack([log_mag(qb[i], qa[i]) for i in range(len(modes))])
+    out = {
+        'bits': np.asarray(bits), 'modes': tuple(modes), 'w': w,
+        'mag_db': mag_db, 'ref_db': ref_db,
+        'max_dev_db': _deviation(mag_db, ref_db, range_db),
+    }
+    if max(b.size, a.size) - 1 <= max_root_order:
+        def roots(p):
+            flat = p.reshape(-1, p.shape[-1])
+            r = [np.roots(c) for c in flat]
+            m = max((x.size for x in r), default=0)
+            out = np.full((len(r), m), np.nan, dtype=complex)
+            for i, x in enumerate(r):
+                out[i, :x.size] = x
+            return out.reshape(p.shape[:-1] + (m,))
+        zeros, poles = roots(qb), roots(qa)
+        out.update(
+            zeros=zeros, poles=poles,
+            max_shift=np.maximum(_max_shift(zeros, np.roots(b)), _max_shift(poles, np.roots(a))),
+            max_radius=np.nan_to_num(np.abs(poles), nan=0.0).max(axis=-1, initial=0.0),
+        )
+    return out
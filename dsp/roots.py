@@ -0,0 +1,171 @@
+import numpy as np
+
+# Orders below this always use np.roots (cheaper than one Aberth sweep)
+MIN_ORDER = 64
+
+def strip_leading_zeros(c, tol=1e-12):
+    """Drop leading (near-)zero coefficients; all-zero input becomes [1.0]."""
+    c = np.asarray(c, dtype=float)
+    nz = np.flatnonzero(np.abs(c) > tol)
+    return c[nz[0]:] if nz.size else np.array([1.0])
+
+
+def roots_from_coeffs(b, a, previous=None):
+    """(zeros, poles, info) of b(z)/a(z), coefficients in descending powers.
+
+    `previous` = (zeros, poles) of a nearby filter warm-starts find_roots;
+    info = {'zeros': ..., 'poles': ...} holds its diagnostics.
+    """
+    prev_z, prev_p = previous if previous is not None else (None, None)
+    zeros, info_z = find_roots(b, prev_z)
+    poles, info_p = find_roots(a, prev_p)
+    return zeros, poles, {'zeros': info_z, 'poles': info_p}
+
+
+def _newton_ratio(c, z):
+    """p(z)/p'(z) for c in descending powers. Horner runs in z inside the
+    unit circle and on the reversed polynomial in 1/z outside it, so high
+    orders never overflow."""
+    m = len(c) - 1
+    out = np.empty_like(z)
+    inside = np.abs(z) <= 1.0
+    for mask, coeffs in ((inside, c), (~inside, c[::-1])):
+        if not mask.any():
+            continue
+        x = z[mask] if coeffs is c else 1.0 / z[mask]
+        p = np.full(x.shape, coeffs[0], dtype=complex)
+        dp = np.zeros(x.shape, dtype=complex)
+        for ck in coeffs[1:]:
+            dp = dp * x + p
+            p = p * x + ck
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if coeffs is c:
+                out[mask] = p / dp
+            else:
+                # p(z) = z^m q(1/z)  =>  p/p' = z / (m - u q'(u)/q(u)), u = 1/z
+                out[mask] = z[mask] / (m - x * dp / p)
+    return out
+
+
+def _aberth_sums(z, rows, chunk=1024):
+    """sum_{j != i} 1/(z_i - z_j) for each i in rows, in row blocks."""
+    s = np.empty(rows.size, dtype=complex)
+    for i in range(0, rows.size, chunk):
+        r = rows[i:i + chunk]
+        d = z[r, None] - z[None, :]
+        d[np.arange(r.size), r] = np.inf
+        with np.errstate(divide='ignore'):
+            s[i:i + chunk] = (1.0 / d).sum(axis=1)
+    return s
+
+
+def _initial_guess(c):
+    """Points on a circle of the roots' geometric-mean radius."""
+    m = len(c) - 1
+    r = abs(c[-1] / c[0]) ** (1.0 / m)
+    return r * np.exp(1j * (2 * np.pi * np.arange(m) / m + 0.4))
+
+
+def _residual(c, z):
+    """Relative backward error |p(z)| / sum |c_k||z|^k, evaluated in 1/z
+    outside the unit circle (no overflow at high orders)."""
+    out = np.empty(z.shape)
+    inside = np.abs(z) <= 1.0
+    for mask, coeffs in ((inside, c), (~inside, c[::-1])):
+        if not mask.any():
+            continue
+        x = z[mask] if coeffs is c else 1.0 / z[mask]
+        p = np.full(x.shape, coeffs[0], dtype=complex)
+        scale = np.full(x.shape, abs(coeffs[0]))
+        for ck in coeffs[1:]:
+            p = p * x + ck
+            scale = scale * np.abs(x) + abs(ck)
+        out[mask] = np.abs(p) / scale
+    return out
+
+
+def find_roots(c, previous=None, tol=1e-12, max_iter=60, residual_tol=1e-8, patience=5, min_order=MIN_ORDER):
+    """Roots of c (descending powers).
+
+    With `previous` (e.g. the roots before a coefficient was nudged) of the
+    right count and order >= `min_order`, an Aberth-Ehrlich iteration seeded
+    there typically converges in a few O(n^2) sweeps instead of an O(n^3)
+    eigenvalue solve. Otherwise np.roots is used directly: cold starts need
+    more sweeps than the eigenvalue solve costs, and at low orders np.roots
+    is cheaper than even one sweep. The warm iteration stops after about as
+    many sweeps as np.roots would cost (order / 16, within max_iter) or when
+    its largest step has not shrunk for `patience` sweeps; its roots are only
+    accepted when each one's relative residual is below `residual_tol`, else
+    np.roots is used. Returns (roots, info) with info = {'method', 'order',
+    'warm', 'fallback' (a warm start was rejected), 'iterations',
+    'unconverged', 'max_step'}.
+    """
+    c = np.trim_zeros(np.asarray(c, dtype=complex), 'f')
+    info = {'method': 'aberth', 'order': max(0, c.size - 1), 'warm': False, 'fallback': False,
+            'iterations': 0, 'unconverged': 0, 'max_step': 0.0}
+    if c.size < 2:
+        info['method'] = 'trivial'
+        return np.empty(0, dtype=complex), info
+    # Roots at the origin (trailing zeros) are exact
+    n_origin = c.size - np.trim_zeros(c, 'b').size
+    c = c[:c.size - n_origin]
+    m = c.size - 1
+    origin = np.zeros(n_origin, dtype=complex)
+    if m == 0:
+        return origin, info
+
+    z = None
+    if previous is not None:
+        previous = np.asarray(previous, dtype=complex)
+        previous = previous[np.abs(previous) > 0] if n_origin else previous
+        if previous.size == m and m >= min_order:
+            # Tiny deterministic spread so repeated roots do not coincide
+            z = previous * (1 + 1e-9 * np.exp(1j * np.arange(m)))
+            info['warm'] = True
+
+    if z is not None:
+        z = _aberth(c, z, tol, min(max_iter, max(8, m // 16)), patience, info)
+        if info['unconverged'] or np.any(_residual(c, z) > residual_tol):
+            z = None
+            info['fallback'] = True
+    if z is None:
+        info['method'] = 'np.roots'
+        z = np.roots(c if np.any(c.imag) else c.real).astype(complex)
+    if not np.any(c.imag):
+        # Real polynomial: clean imaginary noise on (near-)real roots
+        real = np.abs(z.imag) <= 1e-10 * np.maximum(1.0, np.abs(z))
+        z[real] = z[real].real
+    return np.concatenate([z, origin]), info
+
+
+def _aberth(c, z, tol, max_iter, patience, info):
+    """Aberth-Ehrlich sweeps from z (updated in place; returned). Converged
+    roots are frozen but still repel the others; info gets the iteration
+    count, the last largest step and the number of unconverged roots."""
+    active = np.arange(z.size)
+    best, stalled = np.inf, 0
+    restart = _initial_guess(c)
+    for it in range(1, max_iter + 1):
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            ratio = _newton_ratio(c, z[active])
+            step = ratio / (1 - ratio * _aberth_sums(z, active))
+        bad = ~np.isfinite(step)
+        # p'(z) = 0 or a collision: move the estimate back onto the cold-start
+        # circle (rotated each sweep) and keep it active
+        moved = active[bad]
+        step[bad] = z[moved] - restart[moved] * np.exp(0.7j * it)
+        z[active] -= step
+        info['iterations'] = it
+        size = float(np.abs(step[~bad]).max(initial=0.0))
+        info['max_step'] = size
+        active = active[bad | (np.abs(step) > tol * np.maximum(1.0, np.abs(z[active])))]
+        if not active.size:
+            break
+        if size < best:
+            best, stalled = size, 0
+        else:
+            stalled += 1
+            if stalled >= patience:
+                break
+    info['unconverged'] = int(active.size)
+    return z
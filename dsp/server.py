@@ -0,0 +1,285 @@
+"""Local evaluation server: HTTP/1.1 on asyncio, standard library + NumPy only.
+
+    POST /freq     {"zeros": [...], "poles": [...], "n": 1024}
+    POST /impulse  {"b": [...], "a": [...], "n": 256}
+    POST /surface  {"zeros": [...], "poles": [...], "resolution": 128, "span": 1.5}
+    GET  /stats
+
+Filters are given as in batch.py (zeros/poles and/or b/a). Results are
+uncompressed .npz bodies (np.load(io.BytesIO(body))): /freq -> w, H;
+/impulse -> h; /surface -> x, log10_mag (x along axis 0, like the 3D view).
+Evaluation runs in a worker pool with the same EvalContext code as the GUI;
+results are cached by request hash, and identical requests in flight share
+one evaluation. Memory is bounded by the body size limit, the parameter
+limits, the number of clients and queued jobs, and the cache size; bodies
+are written in chunks as the client reads them.
+"""
+import asyncio
+import hashlib
+import http.client
+import io
+import json
+import multiprocessing as mp
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from dsp.batch import parse_filter, spec_context, surface_grid
+from dsp.context import root_key
+
+# kind -> {parameter: (default, min, max)}
+PARAMS = {
+    'freq': {'n': (1024, 2, 1 << 20)},
+    'impulse': {'n': (256, 1, 1 << 20)},
+    'surface': {'resolution': (128, 2, 2048), 'span': (1.5, 0.01, 100.0)},
+}
+CHUNK = 1 << 16
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_request(kind, obj):
+    """(spec, params, key) for a request body, or RequestError(400)."""
+    if not isinstance(obj, dict):
+        raise RequestError(400, 'body must be a JSON object')
+    params = {}
+    for name, (default, lo, hi) in PARAMS[kind].items():
+        value = obj.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise RequestError(400, f'{name} must be a number')
+        if not lo <= value <= hi:
+            raise RequestError(400, f'{name} must be in [{lo}, {hi}]')
+        params[name] = type(default)(value)
+    try:
+        spec = parse_filter(obj)
+    except (ValueError, TypeError, IndexError) as exc:
+        raise RequestError(400, f'bad filter: {exc}') from None
+    coeffs = None if spec['b'] is None else (spec['b'], spec['a'])
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([kind, sorted(params.items())]).encode())
+    h.update(root_key(spec['zeros'], spec['poles'], coeffs))
+    return spec, params, h.hexdigest()
+
+
+def evaluate(kind, spec, params):
+    """Evaluate one request into .npz bytes (runs in a worker)."""
+    ctx, gain = spec_context(spec)
+    if kind == 'freq':
+        w, H = ctx.response(params['n'])
+        arrays = {'w': w, 'H': H * gain}
+    elif kind == 'impulse':
+        arrays = {'h': ctx.impulse(params['n']) * gain}
+    else:
+        res, span = params['resolution'], params['span']
+        log_h = ctx.log_eval(surface_grid(res, span))
+        mag = np.fmax(log_h.real / np.log(10.0) + np.log10(abs(gain)), -9.0)
+        arrays = {'x': np.linspace(-span, span, res), 'log10_mag': mag.astype(np.float32)}
+    buf = io.BytesIO()
+    np.savez(buf, **arrays)
+    return buf.getvalue()
+
+
+class ResultCache:
+    """LRU of response bodies keyed by request hash, bounded in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        body = self._items.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._items.move_to_end(key)
+        return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes or key in self._items:
+            return
+        self._items[key] = body
+        self.nbytes += len(body)
+        while self.nbytes > self.max_bytes:
+            _, old = self._items.popitem(last=False)
+            self.nbytes -= len(old)
+
+
+class EvalServer:
+    """asyncio HTTP server in front of a worker pool (processes by default).
+
+    `max_clients` connections are served at once (more get 503), at most
+    `max_jobs` evaluations are queued or running (more get 503), request bodies
+    above `max_body` get 413, and idle keep-alive connections close after
+    `idle_timeout` seconds.
+    """
+
+    def __init__(self, workers=None, processes=True, cache_bytes=256 * 2**20,
+                 max_body=16 * 2**20, max_clients=256, max_jobs=64, idle_timeout=30.0):
+        if processes:
+            self.pool = ProcessPoolExecutor(workers, mp_context=mp.get_context('spawn'))
+        else:
+            self.pool = ThreadPoolExecutor(workers)
+        self.cache = ResultCache(cache_bytes)
+        self.max_body = max_body
+        self.max_clients = max_clients
+        self.max_jobs = max_jobs
+        self.idle_timeout = idle_timeout
+        self.clients = 0
+        self.requests = 0
+        self.rejected = 0
+        self._inflight = {}  # key -> asyncio.Future of the body
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """Listen; returns the bound port (port=0 picks a free one)."""
+        self._server = await asyncio.start_server(self._client, host, port, limit=CHUNK)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.pool.shutdown(cancel_futures=True)
+
+    def stats(self):
+        return {'requests': self.requests, 'rejected': self.rejected, 'clients': self.clients,
+                'jobs': len(self._inflight), 'cache_entries': len(self.cache),
+                'cache_bytes': self.cache.nbytes, 'cache_hits': self.cache.hits,
+                'cache_misses': self.cache.misses}
+
+    # ---------- Connections ----------
+    async def _client(self, reader, writer):
+        full = self.clients >= self.max_clients
+        self.clients += 1
+        try:
+            if full:
+                self.rejected += 1
+                await self._respond(writer, 503, b'too many clients', close=True)
+                return
+            while await self._serve_one(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def _serve_one(self, reader, writer):
+        """Handle one request; False once the connection should close."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.idle_timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return False
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, path, version = lines[0].split(' ')
+        except ValueError:
+            await self._respond(writer, 400, b'bad request line', close=True)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        close = (headers.get('connection', '').lower() == 'close'
+                 or (version == 'HTTP/1.0' and headers.get('connection', '').lower() != 'keep-alive'))
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= self.max_body:
+            await self._respond(writer, 413 if length > 0 else 400, b'bad content length', close=True)
+            return False
+        body = await reader.readexactly(length)
+        self.requests += 1
+        status, payload, extra = await self._route(method, path, body)
+        await self._respond(writer, status, payload, extra, close)
+        return not close
+
+    async def _route(self, method, path, body):
+        """(status, body, extra headers) for one request."""
+        path = path.split('?', 1)[0].strip('/')
+        if path == 'stats':
+            return 200, json.dumps(self.stats()).encode(), {'Content-Type': 'application/json'}
+        if path not in PARAMS:
+            return 404, b'unknown endpoint', {}
+        if method != 'POST':
+            return 405, b'use POST', {'Allow': 'POST'}
+        try:
+            spec, params, key = parse_request(path, json.loads(body or b'{}'))
+            payload, hit = await self._result(path, spec, params, key)
+        except RequestError as exc:
+            return exc.status, str(exc).encode(), {}
+        except json.JSONDecodeError as exc:
+            return 400, f'bad JSON: {exc}'.encode(), {}
+        except Exception as exc:  # evaluation failed (or the pool broke)
+            return 500, f'{type(exc).__name__}: {exc}'.encode(), {}
+        return 200, payload, {'Content-Type': 'application/x-npz', 'X-Request-Hash': key,
+                              'X-Cache': 'hit' if hit else 'miss'}
+
+    async def _result(self, kind, spec, params, key):
+        """(body, from cache); concurrent identical requests share one job."""
+        body = self.cache.get(key)
+        if body is not None:
+            return body, True
+        future = self._inflight.get(key)
+        if future is None:
+            if len(self._inflight) >= self.max_jobs:
+                self.rejected += 1
+                raise RequestError(503, 'server busy')
+            loop = asyncio.get_running_loop()
+            future = self._inflight[key] = loop.run_in_executor(self.pool, evaluate, kind, spec, params)
+            future.add_done_callback(lambda f: self._finished(key, f))
+        return await asyncio.shield(future), False
+
+    def _finished(self, key, future):
+        del self._inflight[key]
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    async def _respond(self, writer, status, body, headers=None, close=False):
+        head = [f'HTTP/1.1 {status} {_REASONS.get(status, "")}', f'Content-Length: {len(body)}']
+        if status != 200 or not headers:
+            head.append('Content-Type: text/plain')
+        head += [f'{k}: {v}' for k, v in (headers or {}).items()]
+        head.append('Connection: close' if close else 'Connection: keep-alive')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        view = memoryview(body)
+        for start in range(0, len(view), CHUNK):
+            writer.write(view[start:start + CHUNK])
+            await writer.drain()  # waits for slow readers, so buffers stay small
+        await writer.drain()
+
+
+def request(kind, filt, host='127.0.0.1', port=8765, timeout=60.0, **params):
+    """Blocking client: evaluate `filt` (batch-style dict) on a running
+    server; returns {name: array}."""
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request('POST', '/' + kind, json.dumps({**filt, **params}),
+                     {'Content-Type': 'application/json'})
+        resp = conn.getresponse()
+        body = resp.read()
+    finally:
+        conn.close()
+    if resp.status != 200:
+        raise RuntimeError(f'{resp.status} {resp.reason}: {body.decode(errors="replace")}')
+    with np.load(io.BytesIO(body)) as data:
+        return {k: data[k] for k in data.files}
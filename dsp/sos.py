@@ -0,0 +1,120 @@
+import numpy as np
+
+from dsp.impulse import auto_length, lfilter
+
+
+def match_conjugates(roots, tol=1e-6, real_tol=None):
+    """Match conjugate pairs in O(n log n).
+
+    Returns (pairs, real, lone): index pairs (upper, lower) of conjugates,
+    indices of real roots (|imag| <= real_tol, default tol) and indices of
+    complex roots without a partner.
+    """
+    roots = np.asarray(roots, dtype=complex).ravel()
+    real_tol = tol if real_tol is None else real_tol
+    real = np.flatnonzero(np.abs(roots.imag) <= real_tol)
+    upper = np.flatnonzero(roots.imag > real_tol)
+    lower = np.flatnonzero(roots.imag < -real_tol)
+    lower = lower[np.argsort(roots[lower].real, kind='stable')]
+    lower_re = roots[lower].real
+    used = np.zeros(lower.size, dtype=bool)
+    lo = np.searchsorted(lower_re, roots[upper].real - tol, 'left')
+    hi = np.searchsorted(lower_re, roots[upper].real + tol, 'right')
+    pairs, lone = [], []
+    for u, l, h in zip(upper.tolist(), lo.tolist(), hi.tolist()):
+        target = np.conj(roots[u])
+        best, best_d = -1, tol
+        for k in range(l, h):
+            if not used[k]:
+                d = abs(roots[lower[k]] - target)
+                if d < best_d:
+                    best, best_d = k, d
+        if best >= 0:
+            used[best] = True
+            pairs.append((u, int(lower[best])))
+        else:
+            lone.append(u)
+    lone.extend(lower[~used].tolist())
+    return pairs, real, lone
+
+
+def pair_roots(roots, tol=1e-6):
+    """Group roots into conjugate pairs / pairs of reals for second-order sections.
+
+    Returns a list of tuples with one or two roots. Complex roots without a
+    conjugate partner end up alone (their section has complex coefficients).
+    """
+    roots = np.asarray(roots, dtype=complex).ravel()
+    pairs, real, lone = match_conjugates(roots, tol)
+    groups = [(roots[u], roots[l]) for u, l in pairs]
+    groups.extend((roots[i],) for i in lone)
+    real = np.sort(roots[real].real)
+    groups.extend(tuple(complex(x) for x in real[i:i + 2]) for i in range(0, real.size, 2))
+    return groups
+
+
+def _quadratic(group):
+    """[1, c1, c2] with (1 - r1 z^-1)(1 - r2 z^-1) = 1 + c1 z^-1 + c2 z^-2."""
+    c = np.poly(group) if group else np.array([1.0])
+    c = np.pad(c, (0, 3 - c.size))
+    return c.real if np.allclose(c.imag, 0) else c
+
+
+def roots_to_sos(zeros, poles, gain=1.0, tol=1e-6):
+    """Cascade of second-order sections [b0, b1, b2, a0, a1, a2] (scipy layout).
+
+    Sections are built straight from conjugate pairs, without expanding the
+    full polynomial. Pole groups are ordered by increasing radius, each
+    taking the nearest remaining zero group, so the sharpest resonances come
+    last. Each section is in z^-1 form, so the cascade equals
+    z^(N-M) * prod(z-zi)/prod(z-pi) for M zeros and N poles.
+    """
+    zg = pair_roots(zeros, tol)
+    pg = sorted(pair_roots(poles, tol), key=lambda g: max(abs(r) for r in g))
+    n = max(len(zg), len(pg), 1)
+    pg = pg + [()] * (n - len(pg))
+    sections = []
+    for p in pg:
+        if zg:
+            centre = np.mean(p) if p else 0.0
+            j = int(np.argmin([abs(np.mean(z) - centre) for z in zg]))
+            z = zg.pop(j)
+        else:
+            z = ()
+        sections.append(np.concatenate([_quadratic(z), _quadratic(p)]))
+    sos = np.array(sections)
+    sos[0, :3] *= gain
+    return sos
+
+
+def sos_to_coeffs(sos, num_order=None, den_order=None):
+    """Expand a cascade into (b, a) in descending powers of z (np.poly order).
+
+    Section padding shows up as trailing zeros; pass the number of zeros and
+    poles to cut exactly (roots at z=0 also produce trailing zeros).
+    """
+    b = np.array([1.0])
+    a = np.array([1.0])
+    for s in sos:
+        b = np.convolve(b, s[:3])
+        a = np.convolve(a, s[3:])
+    b = b[:num_order + 1] if num_order is not None else np.trim_zeros(b, 'b')
+    a = a[:den_order + 1] if den_order is not None else np.trim_zeros(a, 'b')
+    return b, a
+
+
+def sos_impulse_response(sos, n=64, delay=0, tol=1e-6, max_n=65536):
+    """Impulse response of the cascade, one section after another.
+
+    Cascading keeps high-order filters stable where a direct-form recursion
+    on the expanded polynomial loses precision. `delay` shifts the input;
+    n=None picks the length automatically (see auto_length).
+    """
+    if n is None:
+        return auto_length(lambda k: sos_impulse_response(sos, k, delay), max(64, 2 * delay), tol, max_n)
+    h = np.zeros(n, dtype=np.result_type(sos, float))
+    if delay < n:
+        h[delay] = 1.0
+    for s in sos:
+        h = lfilter(s[:3], s[3:], h)
+    return h
@@ -0,0 +1,385 @@
+"""Block-based streaming simulation: signals pass through a filter in
+fixed-size blocks with the filter state carried across blocks, so inputs of
+any length (multi-hour WAV files, endless generators) run in constant memory.
+"""
+import threading
+import time
+import wave
+
+import numpy as np
+
+from dsp.impulse import causal_coeffs
+
+FFT_FIR_TAPS = 64  # FIR sections longer than this use FFT convolution
+
+
+# ---------- Sources / sinks ----------
+class _Generator:
+    """Synthetic mono source; `frames` = None runs until stopped."""
+    channels = 1
+
+    def __init__(self, fs, duration=None, amplitude=0.5):
+        self.fs = fs
+        self.frames = None if duration is None else int(round(duration * fs))
+        self.amplitude = amplitude
+        self.pos = 0
+
+    def read(self, n):
+        if self.frames is not None:
+            n = max(0, min(n, self.frames - self.pos))
+        t = (self.pos + np.arange(n)) / self.fs  # absolute time: phase stays continuous
+        self.pos += n
+        return (self.amplitude * self._signal(t))[:, None]
+
+    def close(self):
+        pass
+
+
+class Tone(_Generator):
+    def __init__(self, freq, fs, duration=None, amplitude=0.5):
+        super().__init__(fs, duration, amplitude)
+        self.freq = freq
+
+    def _signal(self, t):
+        return np.sin(2 * np.pi * self.freq * t)
+
+
+class Chirp(_Generator):
+    """Sweep from f0 to f1 over `sweep` seconds (repeating), linear or log."""
+
+    def __init__(self, f0, f1, fs, duration=None, sweep=None, log=False, amplitude=0.5):
+        super().__init__(fs, duration, amplitude)
+        self.f0, self.f1, self.log = f0, f1, log
+        self.sweep = sweep or duration or 10.0
+
+    def _signal(self, t):
+        T = self.sweep
+        t = np.mod(t, T)
+        if self.log:
+            k = np.log(self.f1 / self.f0)
+            phase = self.f0 * T / k * np.expm1(k * t / T)
+        else:
+            phase = self.f0 * t + (self.f1 - self.f0) / (2 * T) * t * t
+        return np.sin(2 * np.pi * phase)
+
+
+class Noise(_Generator):
+    """White Gaussian noise (`amplitude` = standard deviation)."""
+
+    def __init__(self, fs, duration=None, amplitude=0.25, seed=None):
+        super().__init__(fs, duration, amplitude)
+        self.rng = np.random.default_rng(seed)
+
+    def _signal(self, t):
+        return self.rng.standard_normal(t.size)
+
+
+_PCM = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+class WavReader:
+    """Integer PCM WAV file read block by block (float64 in [-1, 1))."""
+
+    def __init__(self, path):
+        self._wav = wave.open(path, 'rb')
+        self.fs = self._wav.getframerate()
+        self.channels = self._wav.getnchannels()
+        self.width = self._wav.getsampwidth()
+        self.frames = self._wav.getnframes()
+
+    def read(self, n):
+        raw = self._wav.readframes(n)
+        return _from_pcm(raw, self.width).reshape(-1, self.channels)
+
+    def close(self):
+        self._wav.close()
+
+
+class WavWriter:
+    """16/24/32-bit PCM WAV output; samples outside [-1, 1) are clipped and
+    counted in `clipped`."""
+
+    def __init__(self, path, fs, channels=1, width=2):
+        self._wav = wave.open(path, 'wb')
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(width)
+        self._wav.setframerate(int(fs))
+        self.width = width
+        self.clipped = 0
+
+    def write(self, y):
+        scale = 2.0 ** (8 * self.width - 1)
+        q = np.round(y * scale)
+        hi = scale - 1
+        self.clipped += int(np.count_nonzero((q > hi) | (q < -scale)))
+        np.clip(q, -scale, hi, out=q)
+        self._wav.writeframes(_to_pcm(q, self.width))
+
+    def close(self):
+        self._wav.close()
+
+
+def _from_pcm(raw, width):
+    if width == 3:
+        b = np.frombuffer(raw, np.uint8).reshape(-1, 3)
+        v = (b[:, 0].astype(np.int32) | (b[:, 1].astype(np.int32) << 8)
+             | (b[:, 2].astype(np.int32) << 16))
+        v = np.where(v >= 1 << 23, v - (1 << 24), v)
+        return v / float(1 << 23)
+    v = np.frombuffer(raw, _PCM[width]).astype(np.float64)
+    if width == 1:
+        return (v - 128.0) / 128.0  # 8-bit WAV is unsigned
+    return v / 2.0 ** (8 * width - 1)
+
+
+def _to_pcm(q, width):
+    if width == 3:
+        v = q.astype(np.int32).ravel()
+        return np.stack([v & 0xff, (v >> 8) & 0xff, (v >> 16) & 0xff], axis=1).astype(np.uint8).tobytes()
+    if width == 1:
+        return (q + 128).astype(np.uint8).tobytes()
+    return q.astype(_PCM[width]).tobytes()
+
+
+class RingBuffer:
+    """The last `capacity` frames written (per channel)."""
+
+    def __init__(self, capacity, channels=1):
+        self.buf = np.zeros((capacity, channels))
+        self.pos = 0
+        self.count = 0
+
+    def write(self, x):
+        cap = self.buf.shape[0]
+        x = x[-cap:]
+        n = len(x)
+        first = min(n, cap - self.pos)
+        self.buf[self.pos:self.pos + first] = x[:first]
+        self.buf[:n - first] = x[first:]
+        self.pos = (self.pos + n) % cap
+        self.count = min(cap, self.count + n)
+
+    def read(self):
+        """Contents in chronological order (a copy)."""
+        if self.count < self.buf.shape[0]:
+            return self.buf[:self.count].copy()
+        return np.concatenate([self.buf[self.pos:], self.buf[:self.pos]])
+
+
+# ---------- Filtering ----------
+def sections_from_context(ctx, gain=1.0, normalize=False):
+    """Real [(b, a)] sections in z^-1 form for an EvalContext: the SOS cascade
+    when roots are known, the coefficients as one section otherwise.
+    `normalize` scales the peak of |gain H| on the unit circle to 1."""
+    if not ctx.real_coeffs:
+        raise ValueError('streaming needs a real filter (conjugate-paired roots)')
+    if ctx.has_roots:
+        sections = [(row[:3].real.copy(), row[3:].real.copy()) for row in ctx.sos]
+    else:
+        b, a = causal_coeffs(*ctx.given_coeffs)
+        sections = [(np.asarray(b, dtype=float), np.asarray(a, dtype=float))]
+    if normalize:
+        # Of the response with the gain applied, so the output peaks at 0 dB
+        peak = abs(gain) * max(np.abs(ctx.response(1024)[1]).max(),
+                               np.abs(ctx.resonance_response(256)[1]).max(initial=0.0))
+        if np.isfinite(peak) and peak > 0:
+            gain = gain / peak
+    sections[0] = (sections[0][0] * gain, sections[0][1])
+    return sections
+
+
+def _lfilter():
+    """scipy.signal.lfilter (imported lazily), or the NumPy fallback."""
+    try:
+        from scipy.signal import lfilter
+    except ImportError:
+        return _lfilter_numpy
+    return lambda b, a, x, zi: lfilter(b, a, x, axis=0, zi=zi)
+
+
+def _lfilter_numpy(b, a, x, zi):
+    """Transposed direct form II, sample by sample; NumPy fallback."""
+    y = np.empty_like(x)
+    z = zi.copy()
+    for i in range(len(x)):
+        y[i] = b[0] * x[i] + z[0]
+        z[:-1] = z[1:]
+        z[-1] = 0.0
+        z += b[1:, None] * x[i] - a[1:, None] * y[i]
+    return y, z
+
+
+class BlockFilter:
+    """Cascade of (b, a) sections applied block by block, state carried over.
+
+    State follows scipy's lfilter `zi` convention, per channel. Long FIR
+    sections use FFT convolution (the state is then the pending tail of the
+    previous blocks' output).
+    """
+
+    def __init__(self, sections, channels=1):
+        self.sections = []
+        self.state = []
+        for b, a in sections:
+            b = np.asarray(b, dtype=float)
+            a = np.asarray(a, dtype=float)
+            b = np.trim_zeros(b, 'b') if b.any() else b[:1]
+            a = np.trim_zeros(a, 'b')
+            k = max(b.size, a.size)
+            b = np.pad(b, (0, k - b.size)) / a[0]
+            a = np.pad(a, (0, k - a.size)) / a[0]
+            self.sections.append((b, a))
+            self.state.append(np.zeros((k - 1, channels)))
+        self._spectra = {}
+        self._lfilter = _lfilter()
+
+    def process(self, x):
+        """Filter one (frames, channels) block."""
+        for i, (b, a) in enumerate(self.sections):
+            x, self.state[i] = self._section(i, b, a, x, self.state[i])
+        return x
+
+    def prime(self, history):
+        """Run recent input through the filter (output discarded) so a filter
+        swapped in mid-stream starts from a settled state."""
+        if len(history):
+            self.process(history)
+
+    def _section(self, i, b, a, x, zi):
+        if not zi.shape[0]:
+            return x * b[0], zi
+        if b.size > FFT_FIR_TAPS and not a[1:].any():
+            return self._fft_fir(i, b, x, zi)
+        return self._lfilter(b, a, x, zi)
+
+    def _fft_fir(self, i, b, x, zi):
+        n, k = len(x), b.size
+        nfft = 1 << int(np.ceil(np.log2(n + k - 1)))
+        spec = self._spectra.get((i, nfft))
+        if spec is None:
+            spec = self._spectra[(i, nfft)] = np.fft.rfft(b, nfft)[:, None]
+        full = np.fft.irfft(np.fft.rfft(x, nfft, axis=0) * spec, nfft, axis=0)[:n + k - 1]
+        full[:k - 1] += zi
+        return full[:n], full[n:].copy()
+
+
+# ---------- Engine ----------
+class Stream:
+    """Pulls blocks from a source, filters them and pushes them to an optional
+    sink.
+
+    `set_filter` may be called from any thread. The change takes effect at the
+    next block boundary: the new cascade is primed with the last `history`
+    input frames (kept in a ring buffer), then crossfaded in over `crossfade`
+    frames while the old one keeps running, so the output has no step or
+    transient. Changes arriving during a crossfade wait for it to finish
+    (only the latest is kept).
+    """
+
+    def __init__(self, source, sections, sink=None, block=4096, crossfade=1024, history=8192):
+        self.source = source
+        self.sink = sink
+        self.block = block
+        self.crossfade = crossfade
+        self.channels = source.channels
+        self.filter = BlockFilter(sections, self.channels)
+        self.history = RingBuffer(history, self.channels)
+        self._ramp = 0.5 - 0.5 * np.cos(np.pi * np.arange(1, crossfade + 1) / (crossfade + 1))
+        self._old = None
+        self._fade_pos = 0
+        self._pending = None
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.blocks = 0
+        self.swaps = 0
+        self.peak = 0.0
+        self.busy_s = 0.0  # time spent filtering (excludes source/sink I/O)
+        self._t0 = None
+
+    def set_filter(self, sections):
+        with self._lock:
+            self._pending = sections
+
+    def _swap(self):
+        if self._old is not None or self._pending is None:
+            return
+        with self._lock:
+            sections, self._pending = self._pending, None
+        new = BlockFilter(sections, self.channels)
+        new.prime(self.history.read())
+        if self.crossfade:
+            self._old = self.filter
+            self._fade_pos = 0
+        self.filter = new
+        self.swaps += 1
+
+    def step(self):
+        """Process one block; returns it, or None once the source is exhausted."""
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+        x = self.source.read(self.block)
+        if not len(x):
+            return None
+        t0 = time.perf_counter()
+        self._swap()
+        y = self.filter.process(x)
+        if self._old is not None:
+            y_old = self._old.process(x)
+            m = min(len(x), self.crossfade - self._fade_pos)
+            g = self._ramp[self._fade_pos:self._fade_pos + m, None]
+            y[:m] = y_old[:m] + g * (y[:m] - y_old[:m])
+            self._fade_pos += m
+            if self._fade_pos >= self.crossfade:
+                self._old = None
+        self.history.write(x)
+        self.busy_s += time.perf_counter() - t0
+        self.peak = max(self.peak, float(np.abs(y).max()))
+        if self.sink is not None:
+            self.sink.write(y)
+        self.frames += len(x)
+        self.blocks += 1
+        return y
+
+    def run(self, progress=None, interval=1.0, stop=None):
+        """Stream until the source ends (or `stop`, a threading.Event, is set);
+        progress(stats) is called about every `interval` seconds."""
+        last = time.perf_counter()
+        while (stop is None or not stop.is_set()) and self.step() is not None:
+            if progress is not None and time.perf_counter() - last >= interval:
+                last = time.perf_counter()
+                progress(self.stats())
+        return self.stats()
+
+    def stats(self):
+        """Throughput so far: frames/s overall (with I/O) and filtering only,
+        and how many times faster than real time."""
+        elapsed = time.perf_counter() - self._t0 if self._t0 is not None else 0.0
+        rate = self.frames / elapsed if elapsed else 0.0
+        return {
+            'frames': self.frames,
+            'seconds': self.frames / self.source.fs,
+            'elapsed': elapsed,
+            'frames_per_s': rate,
+            'filter_frames_per_s': self.frames / self.busy_s if self.busy_s else 0.0,
+            'realtime': rate / self.source.fs,
+            'swaps': self.swaps,
+            'peak': self.peak,
+            'clipped': getattr(self.sink, 'clipped', 0),
+        }
+
+    def close(self):
+        self.source.close()
+        if self.sink is not None:
+            self.sink.close()
+
+
+def format_stats(s, total=None):
+    """One-line throughput report; `total` = input length in seconds."""
+    done = f"{s['seconds']:.1f} s" + (f" / {total:.1f} s" if total else '')
+    line = (f"{done} of audio in {s['elapsed']:.1f} s: {s['frames_per_s'] / 1e6:.2f} M samples/s "
+            f"({s['realtime']:.0f}x real time; filter alone {s['filter_frames_per_s'] / 1e6:.2f} M/s)")
+    if s['swaps']:
+        line += f", {s['swaps']} filter changes"
+    if s['clipped']:
+        line += f", {s['clipped']} samples clipped"
+    return line
@@ -0,0 +1,142 @@
+"""High-resolution log10|H(z)| export: the z-plane grid is evaluated in tiles
+across a process pool, written into a memory-mapped .npy and rendered to PNG
+(colour image and/or 16-bit heightmap) in row strips, so neither the grid
+nor the image ever has to fit in memory and no GPU is involved.
+
+Layout is image-like: row 0 is Im z = +span, column 0 is Re z = -span.
+"""
+import multiprocessing as mp
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+FLOOR = -9.0  # log10|H| floor, as in the 3D view
+
+# Colour map anchors (viridis), interpolated to a 256-entry lookup table
+_ANCHORS = np.array([
+    [68, 1, 84], [72, 40, 120], [62, 74, 137], [49, 104, 142], [38, 130, 142],
+    [31, 158, 137], [53, 183, 121], [109, 205, 89], [180, 222, 44], [253, 231, 37],
+], dtype=float)
+LUT = np.stack([np.interp(np.linspace(0, 1, 256), np.linspace(0, 1, len(_ANCHORS)), _ANCHORS[:, k])
+                for k in range(3)], axis=1).round().astype(np.uint8)
+
+
+def axis(resolution, span=1.5):
+    return np.linspace(-span, span, resolution)
+
+
+def tiles(resolution, tile):
+    """(row0, row1, col0, col1) for every tile of the grid."""
+    edges = list(range(0, resolution, tile)) + [resolution]
+    return [(r0, r1, c0, c1) for r0, r1 in zip(edges, edges[1:]) for c0, c1 in zip(edges, edges[1:])]
+
+
+# ---------- Tile evaluation (worker processes) ----------
+_job = {}
+
+
+def _init(ctx, path, resolution, span):
+    _job.update(ctx=ctx, out=np.load(path, mmap_mode='r+'), x=axis(resolution, span))
+
+
+def _tile(bounds):
+    """Evaluate one tile into the shared memmap; returns (min, max)."""
+    r0, r1, c0, c1 = bounds
+    x = _job['x']
+    z = x[None, c0:c1] + 1j * x[::-1][r0:r1, None]
+    log_h = _job['ctx'].log_eval(z)
+    h = np.fmax(log_h.real / np.log(10.0), FLOOR).astype(np.float32)
+    _job['out'][r0:r1, c0:c1] = h
+    return float(h.min()), float(h.max())
+
+
+def evaluate(ctx, path, resolution=8192, span=1.5, tile=512, workers=None, progress=None):
+    """Write log10|H| over a resolution^2 grid to `path` (.npy, memory-mapped)
+    and return (min, max). `ctx` is an EvalContext (sent to each worker once);
+    progress(done, total) is called as tiles finish. Workers are spawned
+    rather than forked, so this is safe to call from a GUI worker thread."""
+    out = np.lib.format.open_memmap(path, 'w+', np.float32, (resolution, resolution))
+    del out  # header written; workers open their own maps
+    jobs = tiles(resolution, tile)
+    lo, hi = np.inf, -np.inf
+    with ProcessPoolExecutor(workers, mp_context=mp.get_context('spawn'), initializer=_init,
+                             initargs=(ctx, path, resolution, span)) as pool:
+        futures = [pool.submit(_tile, bounds) for bounds in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            tmin, tmax = future.result()
+            lo, hi = min(lo, tmin), max(hi, tmax)
+            if progress is not None:
+                progress(done, len(jobs))
+    return lo, hi
+
+
+# ---------- Rendering ----------
+def _chunk(tag, data):
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def write_png(path, rows, width, height, channels, bit_depth=8):
+    """Stream a PNG from an iterator of (n, width[, channels]) uint8/uint16
+    row blocks; only one block is held at a time."""
+    color_type = {1: 0, 3: 2}[channels]
+    comp = zlib.compressobj(6)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)))
+        for block in rows:
+            block = block.reshape(block.shape[0], -1)
+            if bit_depth == 16:
+                block = block.astype('>u2').view(np.uint8).reshape(block.shape[0], -1)
+            raw = np.zeros((block.shape[0], block.shape[1] + 1), dtype=np.uint8)  # filter byte 0
+            raw[:, 1:] = block
+            data = comp.compress(raw.tobytes())
+            if data:
+                f.write(_chunk(b'IDAT', data))
+        f.write(_chunk(b'IDAT', comp.flush()))
+        f.write(_chunk(b'IEND', b''))
+
+
+def _strips(heights, strip):
+    for r0 in range(0, heights.shape[0], strip):
+        yield r0, np.asarray(heights[r0:r0 + strip])
+
+
+def render_image(heights, path, lo, hi, span=1.5, circle=True, strip=256):
+    """Colour-mapped PNG of the height grid, optionally with the unit circle
+    drawn in white."""
+    n = heights.shape[0]
+    x = axis(n, span)
+    scale = 255.0 / (hi - lo) if hi > lo else 0.0
+    width = 1.5 * (x[1] - x[0])  # circle line thickness (~1.5 px)
+
+    def rows():
+        for r0, h in _strips(heights, strip):
+            idx = np.clip((h - lo) * scale, 0, 255).astype(np.uint8)
+            rgb = LUT[idx]
+            if circle:
+                y = x[::-1][r0:r0 + h.shape[0], None]
+                rgb[np.abs(np.hypot(x[None, :], y) - 1.0) < width] = 255
+            yield rgb
+
+    write_png(path, rows(), n, n, 3)
+
+
+def render_heightmap(heights, path, lo, hi, strip=256):
+    """16-bit greyscale PNG heightmap, lo..hi mapped to 0..65535."""
+    scale = 65535.0 / (hi - lo) if hi > lo else 0.0
+    rows = (np.clip((h - lo) * scale, 0, 65535).astype(np.uint16) for _, h in _strips(heights, strip))
+    write_png(path, rows, heights.shape[1], heights.shape[0], 1, bit_depth=16)
+
+
+def export_surface(ctx, npy_path, resolution=8192, span=1.5, tile=512, workers=None,
+                   image=None, heightmap=None, circle=True, progress=None):
+    """Evaluate to `npy_path`, then render the optional PNGs; returns (min, max)."""
+    lo, hi = evaluate(ctx, npy_path, resolution, span, tile, workers, progress)
+    heights = np.load(npy_path, mmap_mode='r')
+    if image:
+        render_image(heights, image, lo, hi, span, circle)
+    if heightmap:
+        render_heightmap(heights, heightmap, lo, hi)
+    return lo, hi
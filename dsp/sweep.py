@@ -0,0 +1,78 @@
+"""Parameter sweeps: one root moved along a trajectory, evaluated for all
+frames at once."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from dsp.utils import log_factor, log_H_eval
+
+
+def trajectory(zeros, poles, kind, index, param, values, partner=None):
+    """(zeros, poles) frames, each (len(values), n_roots), with root `index`
+    of `kind` ('zero' | 'pole') moved through `values` of its 'radius' or
+    'angle'; root `partner` (its conjugate) follows."""
+    values = np.asarray(values, dtype=float)
+    frames = {
+        'zero': np.repeat(np.asarray(zeros, dtype=complex)[None], values.size, axis=0),
+        'pole': np.repeat(np.asarray(poles, dtype=complex)[None], values.size, axis=0),
+    }
+    moved = frames[kind]
+    r0 = moved[0, index]
+    if param == 'radius':
+        path = values * np.exp(1j * np.angle(r0))
+    elif param == 'angle':
+        path = abs(r0) * np.exp(1j * values)
+    else:
+        raise ValueError(f'unknown sweep parameter: {param}')
+    moved[:, index] = path
+    if partner is not None:
+        moved[:, partner] = np.conj(path)
+    return frames['zero'], frames['pole']
+
+
+def _moving(frames):
+    """Columns (roots) that differ between frames."""
+    return np.flatnonzero(np.any(frames != frames[:1], axis=0))
+
+
+def batch_log_eval(z, zeros_frames, poles_frames, consume, max_bytes=64 * 2**20, workers=None):
+    """log H(z) for every frame, handed to consume(frames, log_h) in chunks.
+
+    Roots shared by all frames are evaluated once on z; only the moving ones
+    are evaluated per frame, as (chunk,) + z.shape arrays. Chunks are sized to
+    keep the temporaries within `max_bytes` and spread over `workers` threads
+    (default: all cores); consume is called from those threads with disjoint
+    slices, so it can write straight into preallocated outputs.
+    """
+    z = np.asarray(z)
+    n_frames = zeros_frames.shape[0]
+    mz, mp = _moving(zeros_frames), _moving(poles_frames)
+    base = log_H_eval(z, np.delete(zeros_frames[0], mz), np.delete(poles_frames[0], mp))
+    workers = workers or os.cpu_count() or 1
+    # log_h, log factor and its phase: ~40 bytes per frame and grid point
+    chunk = max(1, min(max_bytes // (40 * max(z.size, 1)), -(-n_frames // workers)))
+    bcast = (-1,) + (1,) * z.ndim
+
+    def run(start):
+        sl = slice(start, min(start + chunk, n_frames))
+        log_h = np.empty((sl.stop - start,) + z.shape, dtype=complex)
+        log_h[...] = base
+        work = np.empty_like(log_h)
+        phase = np.empty(log_h.shape)
+        for frames, cols, sign in ((zeros_frames, mz, 1), (poles_frames, mp, -1)):
+            for k in cols:
+                log_factor(z, frames[sl, k].reshape(bcast), work, phase)
+                if sign > 0:
+                    log_h += work
+                else:
+                    log_h -= work
+        consume(sl, log_h)
+
+    starts = range(0, n_frames, chunk)
+    if workers == 1 or len(starts) == 1:
+        for s in starts:
+            run(s)
+    else:
+        with ThreadPoolExecutor(workers) as ex:
+            list(ex.map(run, starts))  # re-raises worker exceptions
@@ -1,14 +1,117 @@
 import numpy as np
 
+# log|z - r| used where a grid point coincides with a root (|factor| ~ 1e-44)
+LOG_FLOOR = -100.0
 
-def H_eval(z, zeros, poles):
-    """Evaluate transfer function H(z) = prod(z-zi)/prod(z-pi)."""
-    if len(zeros):
-        num = np.prod([z - z0 for z0 in zeros], axis=0)
+
+def log_factor(z, root, out, phase=None):
+    """Write log(z - root) into out, flooring exact hits at LOG_FLOOR.
+
+    Computed as log|.| + j*angle(.), which is much cheaper than NumPy's
+    complex log. `phase` is an optional real scratch array of z's shape.
+    """
+    np.subtract(z, root, out=out)
+    phase = np.arctan2(out.imag, out.real, out=phase)
+    np.abs(out, out=out.real)
+    with np.errstate(divide='ignore'):
+        np.log(out.real, out=out.real)
+    np.maximum(out.real, LOG_FLOOR, out=out.real)
+    out.imag = phase
+    return out
+
+
+def _accumulate(z, roots, out, sign, acc, work, mag, block):
+    """Add sign * sum log(z - r) into out via blocked in-place products.
+
+    The running product lives in `acc` and is renormalised every `block`
+    factors: its log-magnitude moves into out.real and acc is scaled back to
+    unit modulus, so the product can neither overflow nor underflow. Points
+    where a block's product is 0 (a grid point on a root, or underflow) are
+    redone factor by factor with log_factor, so exact hits contribute
+    LOG_FLOOR as in the incremental evaluator.
+    """
+    if not len(roots):
+        return
+    acc.fill(1)
+    start = 0
+    for k, r in enumerate(roots, 1):
+        np.subtract(z, r, out=work)
+        acc *= work
+        if k % block == 0 or k == len(roots):
+            np.abs(acc, out=mag)
+            hit = np.flatnonzero(mag == 0)
+            if hit.size:
+                _redo_block(z.reshape(-1)[hit], roots[:k], start, out, sign, acc, mag, hit)
+            acc /= mag
+            np.log(mag, out=mag)
+            if sign > 0:
+                out.real += mag
+            else:
+                out.real -= mag
+            start = k
+    # acc now has unit modulus: log(acc) = j*angle(acc)
+    np.arctan2(acc.imag, acc.real, out=mag)
+    if sign > 0:
+        out.imag += mag
     else:
-        num = np.ones_like(z, dtype=complex)
-    if len(poles):
-        den = np.prod([z - p0 for p0 in poles], axis=0)
+        out.imag -= mag
+
+
+def _redo_block(zh, roots, start, out, sign, acc, mag, hit):
+    """Redo the points at flat indices `hit` (zh = z there) factor by factor:
+    out.real gets the block's log-magnitudes roots[start:], acc the phase of
+    all roots so far (the product lost it) and mag 1, so the caller's
+    renormalisation leaves those points alone."""
+    log_h = np.zeros(zh.shape, dtype=complex)
+    work = np.empty_like(log_h)
+    for j, r in enumerate(roots):
+        log_factor(zh, r, work)
+        if j < start:
+            log_h.imag += work.imag
+        else:
+            log_h += work
+    out.real.reshape(-1)[hit] += sign * log_h.real
+    acc.reshape(-1)[hit] = np.exp(1j * log_h.imag)
+    mag.reshape(-1)[hit] = 1
+
+
+def workspace(shape, dtype=np.complex128):
+    """Scratch arrays for log_H_eval, reusable across calls on one grid."""
+    dtype = np.dtype(dtype)
+    real = np.empty(0, dtype=dtype).real.dtype
+    return np.empty(shape, dtype), np.empty(shape, dtype), np.empty(shape, real)
+
+
+def log_H_eval(z, zeros, poles, out=None, single=False, scratch=None):
+    """Evaluate log H(z) = sum log(z-zi) - sum log(z-pi).
+
+    The real part is ln|H| and the imaginary part the phase (wrapped per
+    product). Factors are multiplied in place into preallocated buffers, so
+    memory stays at a few grid-sized arrays regardless of the number of roots,
+    and high-order products cannot overflow. Grid points that hit a root
+    exactly get LOG_FLOOR for that factor (as in log_factor); ln|H| is not
+    clamped otherwise. `single=True`
+    computes in complex64 for display-only consumers; `scratch` (from
+    `workspace`) avoids allocating the temporaries on every call.
+    """
+    dtype = np.complex64 if single else np.complex128
+    z = np.asarray(z)
+    if out is None:
+        out = np.zeros(z.shape, dtype=dtype)
     else:
-        den = np.ones_like(z, dtype=complex)
-    return num / den
+        out.fill(0)
+    acc, work, mag = scratch if scratch is not None else workspace(z.shape, out.dtype)
+    # Factors per renormalisation; keeps |acc| well inside the dtype's range
+    block = 8 if out.dtype == np.complex64 else 32
+    _accumulate(z, zeros, out, +1, acc, work, mag, block)
+    _accumulate(z, poles, out, -1, acc, work, mag, block)
+    return out
+
+
+def H_eval(z, zeros, poles, out=None, single=False):
+    """Evaluate transfer function H(z) = prod(z-zi)/prod(z-pi)."""
+    log_h = log_H_eval(z, zeros, poles, out=out, single=single)
+    # Keep exp in range: |H| within e^+-100
+    np.clip(log_h.real, LOG_FLOOR, -LOG_FLOOR, out=log_h.real)
+    with np.errstate(over='ignore'):
+        return np.exp(log_h, out=log_h)
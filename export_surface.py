@@ -0,0 +1,51 @@
+"""Export log10|H(z)| over a large z-plane grid without a GPU.
+
+The grid is evaluated in tiles across a process pool into a memory-mapped
+.npy (float32, image layout: row 0 is Im z = +span), then optionally rendered
+to a colour PNG and/or a 16-bit PNG heightmap strip by strip.
+
+    python export_surface.py --filter lowpass.npz -o surface.npy --resolution 8192 --image surface.png
+    python export_surface.py --spec '{"zeros": [[0, 1], [0, -1]], "poles": [[0.9, 0]]}' -o s.npy --heightmap h.png
+"""
+import argparse
+import json
+import sys
+import time
+
+from dsp.batch import parse_filter, spec_context
+from dsp.filter_io import load_filter
+from dsp.surface_export import export_surface
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    flt = ap.add_mutually_exclusive_group(required=True)
+    flt.add_argument('--filter', metavar='PATH', help='filter file (.npz, .npy, .csv, .txt)')
+    flt.add_argument('--spec', metavar='JSON', help='inline filter: {"zeros": ..., "poles": ...} or {"b": ..., "a": ...}')
+    ap.add_argument('-o', '--out', required=True, help='log10|H| grid (.npy, memory-mapped)')
+    ap.add_argument('--resolution', type=int, default=8192, help='grid side')
+    ap.add_argument('--span', type=float, default=1.5, help='grid covers [-span, span]^2')
+    ap.add_argument('--tile', type=int, default=512, help='tile side (memory per worker ~ 50 * tile^2 bytes)')
+    ap.add_argument('--workers', type=int, default=None, help='default: all cores')
+    ap.add_argument('--image', metavar='PNG', help='colour-mapped image')
+    ap.add_argument('--heightmap', metavar='PNG', help='16-bit greyscale heightmap')
+    ap.add_argument('--no-circle', action='store_true', help='do not draw the unit circle on the image')
+    args = ap.parse_args(argv)
+
+    spec = load_filter(args.filter) if args.filter else parse_filter(json.loads(args.spec))
+    ctx, _ = spec_context(spec)
+    t0 = time.perf_counter()
+
+    def progress(done, total):
+        if done % max(1, total // 10) == 0 or done == total:
+            print(f'{done}/{total} tiles ({time.perf_counter() - t0:.1f}s)', file=sys.stderr)
+
+    lo, hi = export_surface(ctx, args.out, args.resolution, args.span, args.tile, args.workers,
+                            args.image, args.heightmap, not args.no_circle, progress)
+    print(f'{args.resolution}x{args.resolution} grid, log10|H| in [{lo:.2f}, {hi:.2f}], '
+          f'{time.perf_counter() - t0:.1f}s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
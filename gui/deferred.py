@@ -0,0 +1,46 @@
+from PyQt6 import QtCore, QtWidgets
+
+from gui.instrument import instrument
+
+
+class DeferredView(QtWidgets.QWidget):
+    """Placeholder that builds an expensive child widget on first visibility.
+
+    `factory` is called (and may do its own imports) one event-loop turn after
+    the placeholder is first painted, so the rest of the window is already on
+    screen by then.
+    `ready` is emitted with the created widget; `widget` is None until then.
+    """
+
+    ready = QtCore.pyqtSignal(object)
+
+    def __init__(self, factory, label='Loading…', name='view', parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.name = name
+        self.widget = None
+        self._pending = False
+        self._layout = QtWidgets.QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._label = QtWidgets.QLabel(label)
+        self._label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self._layout.addWidget(self._label)
+
+    def paintEvent(self, ev):
+        super().paintEvent(ev)
+        if self.widget is None and not self._pending:
+            self._pending = True
+            QtCore.QTimer.singleShot(0, self.create)
+
+    def create(self):
+        """Build the widget now (no-op if it already exists)."""
+        if self.widget is not None:
+            return self.widget
+        instrument.mark(f'{self.name}: create requested')
+        self.widget = self.factory()
+        instrument.mark(f'{self.name}: created')
+        self._layout.removeWidget(self._label)
+        self._label.deleteLater()
+        self._layout.addWidget(self.widget)
+        self.ready.emit(self.widget)
+        return self.widget
@@ -1,12 +1,17 @@
+from collections import deque
+
 from PyQt6 import QtCore, QtGui, QtWidgets
 import pyqtgraph as pg
 import numpy as np
 
-from dsp.utils import H_eval
+from dsp.sos import match_conjugates
+from gui.instrument import instrument
+from gui.root_store import RootStore
 
 
 class PoleZeroEditor(pg.GraphicsLayoutWidget):
     updated = QtCore.pyqtSignal()
+    drag_finished = QtCore.pyqtSignal()
 
     def __init__(self, mode_provider=None):
         super().__init__()
@@ -24,9 +29,16 @@ class PoleZeroEditor(pg.GraphicsLayoutWidget):
         )
         self.plot.addItem(self.unit_circle)
 
-        # Data (store both members of complex conjugate pair explicitly)
-        self.zeros: list[complex] = []
-        self.poles: list[complex] = []
+        # Data (store both members of complex conjugate pair explicitly, linked)
+        self.zero_store = RootStore()
+        self.pole_store = RootStore()
+        self.revision = 0  # bumped on every change to zeros/poles
+
+        # Undo/redo: snapshots of both stores taken before each edit
+        self.history_limit = 200
+        self._undo: deque = deque(maxlen=self.history_limit)
+        self._redo: deque = deque(maxlen=self.history_limit)
+        self._drag_checkpoint = False  # snapshot pending until the drag moves
 
         # Scatter items
         self.zero_scatter = pg.ScatterPlotItem(
@@ -37,25 +49,98 @@ class PoleZeroEditor(pg.GraphicsLayoutWidget):
         )
         self.plot.addItem(self.zero_scatter)
         self.plot.addItem(self.pole_scatter)
+        # Overlay of other roots next to the real ones (e.g. quantized coefficients)
+        self.overlay_zeros = pg.ScatterPlotItem(
+            size=7, pen=pg.mkPen((255, 170, 0), width=1.5), brush=None, symbol='o'
+        )
+        self.overlay_poles = pg.ScatterPlotItem(
+            size=8, pen=pg.mkPen((255, 170, 0), width=1.5), brush=None, symbol='x'
+        )
+        self.plot.addItem(self.overlay_zeros)
+        self.plot.addItem(self.overlay_poles)
 
         # Interaction state
         self.dragging_point: tuple[str, int] | None = None  # (type, index)
         self.selected: tuple[str, int] | None = None
+        # Optional gui.trace.TraceRecorder; sees every edit-level event
+        self.recorder = None
 
         # Connect mouse events via scene
         self.plot.scene().sigMouseClicked.connect(self.on_click)
         self.plot.scene().sigMouseMoved.connect(self.on_move)
 
+    @property
+    def zeros(self):
+        """Zero-copy view of the zeros (copy before handing to another thread)."""
+        return self.zero_store.values
+
+    @property
+    def poles(self):
+        return self.pole_store.values
+
+    def _store(self, t: str):
+        return self.zero_store if t == 'zero' else self.pole_store
+
     # ---------- Helpers ----------
     def update_scatter(self):
-        self.zero_scatter.setData(
-            [z.real for z in self.zeros], [z.imag for z in self.zeros]
-        )
-        self.pole_scatter.setData(
-            [p.real for p in self.poles], [p.imag for p in self.poles]
-        )
+        z = self.zero_store.values
+        p = self.pole_store.values
+        self.zero_scatter.setData(z.real, z.imag)
+        self.pole_scatter.setData(p.real, p.imag)
+        self.revision += 1
         self.updated.emit()
 
+    def show_roots(self, zeros, poles):
+        """Draw other roots (e.g. sweep playback) without changing the stored
+        ones: no revision bump, no `updated`. update_scatter redraws the real ones."""
+        self.zero_scatter.setData(zeros.real, zeros.imag)
+        self.pole_scatter.setData(poles.real, poles.imag)
+
+    def show_overlay(self, zeros, poles):
+        """Mark extra roots (not editable); None clears the overlay."""
+        for item, roots in ((self.overlay_zeros, zeros), (self.overlay_poles, poles)):
+            roots = np.asarray(() if roots is None else roots, dtype=complex)
+            item.setData(roots.real, roots.imag)
+
+    # ---------- History ----------
+    def snapshot(self):
+        return self.zero_store.snapshot(), self.pole_store.snapshot()
+
+    def restore(self, snap):
+        """Load a `snapshot()` (no undo step)."""
+        zeros, poles = snap
+        self.zero_store.load(*zeros)
+        self.pole_store.load(*poles)
+        self.dragging_point = self.selected = None
+        self.update_scatter()
+
+    def checkpoint(self):
+        """Record the current roots as an undo step (call before editing)."""
+        self._undo.append(self.snapshot())
+        self._redo.clear()
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        if not self._undo:
+            return False
+        self._record('undo')
+        self._redo.append(self.snapshot())
+        self.restore(self._undo.pop())
+        return True
+
+    def redo(self):
+        if not self._redo:
+            return False
+        self._record('redo')
+        self._undo.append(self.snapshot())
+        self.restore(self._redo.pop())
+        return True
+
     def snap_unit(self, c: complex):
         r = abs(c)
         if r == 0:
@@ -68,106 +153,85 @@ class PoleZeroEditor(pg.GraphicsLayoutWidget):
         return complex(p.x(), p.y())
 
     def find_near(self, c: complex, tol=0.06):
-        best = None
         found = None
-        for i, z in enumerate(self.zeros):
-            d = abs(c - z)
-            if d < tol and (best is None or d < best):
-                best = d
-                found = ('zero', i, d)
-        for i, p in enumerate(self.poles):
-            d = abs(c - p)
-            if d < tol and (best is None or d < best):
-                best = d
-                found = ('pole', i, d)
+        for t in ('zero', 'pole'):
+            hit = self._store(t).nearest(c, tol)
+            if hit is not None and (found is None or hit[1] < found[2]):
+                found = (t, hit[0], hit[1])
         return found
 
     # ---------- Conjugate pair handling ----------
     def add_zero_pair(self, c: complex, tol=1e-9):
         # Ensure we store positive imaginary first
-        if abs(c.imag) <= tol:
-            self.zeros.append(complex(c.real, 0.0))
-        else:
-            if c.imag < 0:
-                c = c.conjugate()
-            self.zeros.append(c)
-            self.zeros.append(c.conjugate())
+        self.zero_store.add_pair(c, tol)
 
     def conjugate_index(self, idx: int, tol=1e-9):
-        if not (0 <= idx < len(self.zeros)):
-            return None
-        z = self.zeros[idx]
-        if abs(z.imag) <= tol:
+        if not (0 <= idx < len(self.zero_store)):
             return None
-        for j, w in enumerate(self.zeros):
-            if j != idx and abs(w - z.conjugate()) < tol:
-                return j
-        return None
+        return self.zero_store.partner(idx)
 
     def move_zero_pair(self, idx: int, new_c: complex, tol=1e-9):
-        if not (0 <= idx < len(self.zeros)):
-            return
-        cj = self.conjugate_index(idx, tol)
-        if abs(new_c.imag) <= tol:  # collapse to real
-            real_c = complex(new_c.real, 0.0)
-            if cj is not None:
-                hi, lo = max(idx, cj), min(idx, cj)
-                self.zeros.pop(hi)
-                if lo >= len(self.zeros):  # just in case
-                    self.zeros.append(real_c)
-                else:
-                    self.zeros[lo] = real_c
-            else:
-                self.zeros[idx] = real_c
-        else:
-            if new_c.imag < 0:
-                new_c = new_c.conjugate()
-            self.zeros[idx] = new_c
-            if cj is None:
-                self.zeros.append(new_c.conjugate())
-            else:
-                self.zeros[cj] = new_c.conjugate()
+        """Move zero idx and its conjugate; returns idx's (possibly new) index."""
+        if not (0 <= idx < len(self.zero_store)):
+            return idx
+        return self.zero_store.move_pair(idx, new_c, tol)
 
     # ---------- Events ----------
+    # Qt handlers map to click_at / move_to / release / delete_selected, which
+    # work in view coordinates and can be driven directly (trace replay).
+    def _record(self, kind, c=0j, mode='', modifiers=None):
+        if self.recorder is not None:
+            self.recorder.record(kind, c, mode, modifiers)
+
     def _delete_item(self, t: str, idx: int):
-        if t == 'zero' and 0 <= idx < len(self.zeros):
-            cj = self.conjugate_index(idx)
-            if cj is not None:
-                for k in sorted([idx, cj], reverse=True):
-                    if 0 <= k < len(self.zeros):
-                        self.zeros.pop(k)
-            else:
-                self.zeros.pop(idx)
-            return True
-        elif t == 'pole' and 0 <= idx < len(self.poles):
-            self.poles.pop(idx)
+        store = self._store(t)
+        if t in ('zero', 'pole') and 0 <= idx < len(store):
+            store.remove(idx)
             return True
         return False
 
     def keyPressEvent(self, ev: QtGui.QKeyEvent):
         if ev.key() in (QtCore.Qt.Key.Key_Backspace, QtCore.Qt.Key.Key_Delete):
-            if self.selected:
-                t, idx = self.selected
-                self._delete_item(t, idx)
-                self.selected = None
-                self.update_scatter()
+            self.delete_selected()
         else:
             super().keyPressEvent(ev)
 
+    def delete_selected(self):
+        if self.selected:
+            self._record('delete')
+            t, idx = self.selected
+            self.checkpoint()
+            self._delete_item(t, idx)
+            self.selected = None
+            self.update_scatter()
+
     def on_click(self, ev):
+        with instrument.stage('editor/on_click'):
+            self._on_click(ev)
+
+    def _on_click(self, ev):
         if ev.button() != QtCore.Qt.MouseButton.LeftButton:
             return
-        mode = self.mode_provider() if self.mode_provider else 'select'
-        modifiers = QtWidgets.QApplication.keyboardModifiers()
-        c = self.screen_to_complex(ev.scenePos())
+        self.click_at(self.screen_to_complex(ev.scenePos()))
+
+    def click_at(self, c: complex, mode=None, modifiers=None):
+        """Left click at view coordinate c; mode and keyboard modifiers
+        default to the current ones."""
+        if mode is None:
+            mode = self.mode_provider() if self.mode_provider else 'select'
+        if modifiers is None:
+            modifiers = QtWidgets.QApplication.keyboardModifiers()
+        self._record('click', c, mode, modifiers)
         found = self.find_near(c)
         if found and mode == 'select':
             t, idx, _ = found
             self.dragging_point = (t, idx)
             self.selected = (t, idx)
+            self._drag_checkpoint = True
             return
         if found and mode == 'delete':
             t, idx, _ = found
+            self.checkpoint()
             if self._delete_item(t, idx):
                 self.selected = None
                 self.update_scatter()
@@ -175,68 +239,75 @@ class PoleZeroEditor(pg.GraphicsLayoutWidget):
         if mode in ('add_zero', 'add_pole'):
             if modifiers & QtCore.Qt.KeyboardModifier.ShiftModifier:
                 c = self.snap_unit(c)
+            self.checkpoint()
             if mode == 'add_zero':
                 self.add_zero_pair(c)
             else:
-                self.poles.append(c)
+                self.pole_store.add(c)
             self.update_scatter()
         else:
             self.selected = None
 
     def mouseReleaseEvent(self, ev):
+        self.release()
+        super().mouseReleaseEvent(ev)
+
+    def release(self):
+        """End a drag."""
+        self._drag_checkpoint = False
         if self.dragging_point:
+            self._record('release')
             self.dragging_point = None
-        super().mouseReleaseEvent(ev)
+            self.drag_finished.emit()
 
     def on_move(self, pos):
         if self.dragging_point is None:
             return
-        modifiers = QtWidgets.QApplication.keyboardModifiers()
-        c = self.screen_to_complex(pos)
+        with instrument.stage('editor/on_move'):
+            self.move_to(self.screen_to_complex(pos))
+
+    def move_to(self, c: complex, modifiers=None):
+        """Drag the grabbed root to view coordinate c."""
+        if self.dragging_point is None:
+            return
+        if modifiers is None:
+            modifiers = QtWidgets.QApplication.keyboardModifiers()
+        self._record('move', c, '', modifiers)
         if modifiers & QtCore.Qt.KeyboardModifier.ControlModifier:
             c = self.snap_unit(c)
+        if self._drag_checkpoint:
+            self._drag_checkpoint = False
+            self.checkpoint()
         t, idx = self.dragging_point
         if t == 'zero':
-            self.move_zero_pair(idx, c)
+            idx = self.move_zero_pair(idx, c)
+            self.dragging_point = self.selected = (t, idx)
         else:
-            if 0 <= idx < len(self.poles):
-                self.poles[idx] = c
+            if 0 <= idx < len(self.pole_store):
+                self.pole_store.set(idx, c)
         self.update_scatter()
 
     def load_from_roots(self, zeros, poles, tol: float = 1e-9):
         """Replace current zeros/poles from arbitrary root arrays, enforcing conjugate pairing for zeros.
         Poles are taken as-is (can extend if pairing desired)."""
-        def pair_conjugates(arr):
-            arr = list(arr)
-            used = [False]*len(arr)
-            out = []
-            for i, z in enumerate(arr):
-                if used[i]:
-                    continue
-                if abs(z.imag) <= tol:
-                    out.append(complex(z.real, 0.0))
-                    used[i] = True
-                else:
-                    # search partner
-                    partner = None
-                    for j in range(i+1, len(arr)):
-                        if not used[j] and abs(arr[j] - z.conjugate()) < 1e-6:
-                            partner = j
-                            break
-                    if partner is not None:
-                        # canonical store positive imag first
-                        zc = z if z.imag > 0 else z.conjugate()
-                        out.append(zc)
-                        out.append(zc.conjugate())
-                        used[i] = True
-                        used[partner] = True
-                    else:
-                        # lone complex root -> store both conj artificially
-                        zc = z if z.imag > 0 else z.conjugate()
-                        out.append(zc)
-                        out.append(zc.conjugate())
-                        used[i] = True
-            return out
-        self.zeros = pair_conjugates(zeros)
-        self.poles = list(poles)
+        self.checkpoint()
+        zeros = np.asarray(zeros, dtype=complex).ravel()
+        pairs, real, lone = match_conjugates(zeros, tol=1e-6, real_tol=tol)
+        # canonical store: positive imag first, conjugate right after; a lone
+        # complex root gets its conjugate added artificially
+        upper = np.concatenate([
+            zeros[[u for u, _ in pairs]],
+            np.where(zeros[lone].imag > 0, zeros[lone], np.conj(zeros[lone])),
+        ])
+        n_real = real.size
+        values = np.empty(n_real + 2 * upper.size, dtype=complex)
+        values[:n_real] = zeros[real].real
+        values[n_real::2] = upper
+        values[n_real + 1::2] = np.conj(upper)
+        partners = np.full(values.size, -1, dtype=np.intp)
+        idx = np.arange(n_real, values.size, 2)
+        partners[idx] = idx + 1
+        partners[idx + 1] = idx
+        self.zero_store.load(values, partners)
+        self.pole_store.load(np.asarray(poles, dtype=complex))
         self.update_scatter()
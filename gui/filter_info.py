@@ -1,9 +1,48 @@
+import re
+
 from PyQt6 import QtWidgets, QtCore
-from scipy.signal import dimpulse
 import numpy as np
 
+from dsp.context import EvalContext
+from dsp.roots import strip_leading_zeros
+from gui.instrument import instrument
+
+# Truncation marker appended to long previews
+_MORE = re.compile(r',?\s*…\s*\(\+\d+ more\)')
+
+
+def compute_info(ctx, n=64):
+    """(b, a, h, error): coefficients and impulse response (n samples,
+    None = until decayed) for the roots of an EvalContext. If the impulse
+    response cannot be computed, h is empty and error says why.
+
+    Module-level (and free of Qt) so it can run in a worker thread or process.
+    """
+    # Second-order sections straight from the (conjugate-paired) roots;
+    # coefficients (descending powers) are exported from the cascade
+    with instrument.stage('info/coeffs'):
+        num_coeffs, den_coeffs = ctx.coeffs
+
+    # Impulse response: FIR taps directly, IIR through the cascade
+    error = None
+    if len(den_coeffs) == 1 and den_coeffs[0] != 0 and len(num_coeffs) <= 64:
+        # For FIR defined as b0 + b1 z^{-1}+..., h[k] = b[k]; output original order b0..bM-1
+        h = num_coeffs.astype(float) if np.isrealobj(num_coeffs) else num_coeffs
+    else:
+        try:
+            with instrument.stage('info/impulse'):
+                h = ctx.impulse(n)
+        except (ValueError, ArithmeticError, MemoryError) as exc:
+            h, error = np.empty(0), f'Impulse response failed: {exc}'
+    return num_coeffs, den_coeffs, h, error
+
+
 class FilterInfoWidget(QtWidgets.QWidget):
-    filter_changed = QtCore.pyqtSignal(list, list)
+    coeffs_applied = QtCore.pyqtSignal(object, object)  # (b, a), descending powers
+    import_requested = QtCore.pyqtSignal(str)
+    export_requested = QtCore.pyqtSignal(str)
+
+    FILE_FILTERS = 'NumPy archive (*.npz);;FIR taps (*.npy);;CSV (*.csv *.txt)'
 
     def __init__(self):
         super().__init__()
@@ -32,22 +71,34 @@ class FilterInfoWidget(QtWidgets.QWidget):
         add_section("Impulse Response h[n]:", self.impulse_edit)
 
         btn_row = QtWidgets.QHBoxLayout()
+        self.status = QtWidgets.QLabel()
+        self.import_button = QtWidgets.QPushButton("Import…")
+        self.export_button = QtWidgets.QPushButton("Export…")
         self.apply_button = QtWidgets.QPushButton("Apply Text → Zeros/Poles")
-        btn_row.addStretch(1)
+        btn_row.addWidget(self.status, 1)
+        btn_row.addWidget(self.import_button)
+        btn_row.addWidget(self.export_button)
         btn_row.addWidget(self.apply_button)
         layout.addLayout(btn_row)
 
         self.apply_button.clicked.connect(self.on_apply)
+        self.import_button.clicked.connect(self.on_import)
+        self.export_button.clicked.connect(self.on_export)
 
-        # Track last applied values to detect user-origin changes
-        self._last_num = []
-        self._last_den = []
-        self._last_impulse = []
+        # Boxes show at most `preview_limit` values; the full arrays and the
+        # exact preview text are kept to tell user edits from our own output
+        self.preview_limit = 64
+        self._values = {w: np.empty(0) for w in (self.num_edit, self.den_edit, self.impulse_edit)}
+        self._shown = {w: '' for w in self._values}
 
     def _format_coeffs(self, coeffs):
-        return ", ".join(f"{c:.4f}" for c in coeffs)
+        text = ", ".join(f"{c:.4f}" for c in coeffs[:self.preview_limit])
+        if len(coeffs) > self.preview_limit:
+            text += f", … (+{len(coeffs) - self.preview_limit} more)"
+        return text
 
     def _parse_list(self, text):
+        text = _MORE.sub('', text)
         parts = [p.strip() for p in text.replace('\n', ' ').split(',') if p.strip()]
         if not parts:
             return []
@@ -59,72 +110,77 @@ class FilterInfoWidget(QtWidgets.QWidget):
                 pass
         return out
 
+    def _show(self, box, values):
+        """Show a preview of values unless unchanged or being edited."""
+        values = np.asarray(values).real
+        old = self._values[box]
+        if box.hasFocus() or (old.shape == values.shape and np.array_equal(old, values)):
+            return
+        self._values[box] = values
+        box.setPlainText(self._format_coeffs(values))
+        self._shown[box] = box.toPlainText()
+
+    def _box_values(self, box):
+        """(values, edited): the full array behind a box, or the parsed text
+        if the user changed it (an edited truncated preview keeps its tail)."""
+        text = box.toPlainText()
+        if text == self._shown[box]:
+            return self._values[box], False
+        values = np.array(self._parse_list(text), dtype=float)
+        if _MORE.search(text):
+            values = np.concatenate([values, self._values[box][self.preview_limit:]])
+        return values, True
+
+    def set_status(self, text):
+        self.status.setText(text)
+
+    def show_error(self, text, info):
+        msg_box = QtWidgets.QMessageBox(self)
+        msg_box.setIcon(QtWidgets.QMessageBox.Icon.Warning)
+        msg_box.setText(text)
+        msg_box.setInformativeText(info)
+        msg_box.setWindowTitle("Error")
+        msg_box.exec()
+
     def update_info(self, zeros, poles):
-        # Compute polynomial coefficients (descending powers) from zeros/poles
-        num_coeffs = np.poly(zeros) if len(zeros) > 0 else np.array([1.0])
-        den_coeffs = np.poly(poles) if len(poles) > 0 else np.array([1.0])
-
-        # Impulse response: if IIR, use dimpulse; if FIR (den=1 & len small) just numerator padded
-        if len(den_coeffs) == 1 and den_coeffs[0] != 0 and len(num_coeffs) <= 64:
-            # Convert polynomial coeffs (descending) to time-domain h[n] with h[k] = coeffs[k]
-            # Note: For FIR defined as b0 + b1 z^{-1}+..., polynomial vector here is b0..bM-1 in descending vs typical; we output original order b0..bM-1
-            h = num_coeffs.astype(float)
-        else:
-            system = (num_coeffs, den_coeffs, 1)
-            try:
-                t, h_seq = dimpulse(system, n=64)
-                h = h_seq[0].flatten()
-            except Exception:
-                h = np.zeros(32)
-
-        # Only overwrite text if widget not being actively edited (has focus) to preserve user edits
-        if not self.num_edit.hasFocus():
-            self.num_edit.setPlainText(self._format_coeffs(num_coeffs.real))
-        if not self.den_edit.hasFocus():
-            self.den_edit.setPlainText(self._format_coeffs(den_coeffs.real))
-        if not self.impulse_edit.hasFocus():
-            self.impulse_edit.setPlainText(self._format_coeffs(h.real))
-
-        self._last_num = list(num_coeffs.real)
-        self._last_den = list(den_coeffs.real)
-        self._last_impulse = list(h.real)
+        self.apply_info(compute_info(EvalContext(zeros, poles)))
+
+    def apply_info(self, result):
+        num_coeffs, den_coeffs, h, error = result
+        # Text is only regenerated when the values change, and never while the
+        # box has focus (preserves user edits)
+        self._show(self.num_edit, num_coeffs)
+        self._show(self.den_edit, den_coeffs)
+        self._show(self.impulse_edit, h)
+        if error is not None:
+            self.set_status(error)
 
     def on_apply(self):
         # Determine source of change priority: impulse > numerator/denominator
-        user_impulse = self._parse_list(self.impulse_edit.toPlainText())
-        user_num = self._parse_list(self.num_edit.toPlainText())
-        user_den = self._parse_list(self.den_edit.toPlainText())
+        user_impulse, impulse_edited = self._box_values(self.impulse_edit)
+        user_num, _ = self._box_values(self.num_edit)
+        user_den, _ = self._box_values(self.den_edit)
 
-        try:
-            if user_impulse and (len(user_impulse) != len(self._last_impulse) or any(abs(a-b) > 1e-6 for a,b in zip(user_impulse, self._last_impulse))):
-                # Treat impulse as FIR numerator, denominator = [1]
-                num = np.array(user_impulse, dtype=float)
-                den = np.array([1.0])
-            else:
-                num = np.array(user_num if user_num else [1.0], dtype=float)
-                den = np.array(user_den if user_den else [1.0], dtype=float)
-            # Derive zeros/poles from poly coefficients (descending powers)
-            # Ensure leading coeff non-zero
-            if abs(num[0]) < 1e-12:
-                # strip leading zeros
-                nz = np.flatnonzero(np.abs(num) > 1e-12)
-                if nz.size:
-                    num = num[nz[0]:]
-                else:
-                    num = np.array([1.0])
-            if abs(den[0]) < 1e-12:
-                nz = np.flatnonzero(np.abs(den) > 1e-12)
-                if nz.size:
-                    den = den[nz[0]:]
-                else:
-                    den = np.array([1.0])
-            zeros = np.roots(num) if len(num) > 1 else []
-            poles = np.roots(den) if len(den) > 1 else []
-            self.filter_changed.emit(list(zeros), list(poles))
-        except Exception:
-            msg_box = QtWidgets.QMessageBox(self)
-            msg_box.setIcon(QtWidgets.QMessageBox.Icon.Warning)
-            msg_box.setText("Failed to apply coefficients.")
-            msg_box.setInformativeText("Check numeric formatting.")
-            msg_box.setWindowTitle("Apply Error")
-            msg_box.exec()
+        if impulse_edited and user_impulse.size:
+            # Treat impulse as FIR numerator, denominator = [1]
+            num, den = user_impulse, np.array([1.0])
+        else:
+            num = user_num if user_num.size else np.array([1.0])
+            den = user_den if user_den.size else np.array([1.0])
+        # Ensure leading coeff non-zero
+        num, den = strip_leading_zeros(num), strip_leading_zeros(den)
+        if not (np.all(np.isfinite(num)) and np.all(np.isfinite(den))):
+            self.show_error("Failed to apply coefficients.", "Check numeric formatting.")
+            return
+        self.coeffs_applied.emit(num, den)
+
+    def on_import(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Import filter", "", "Filters (*.npz *.npy *.csv *.txt)")
+        if path:
+            self.import_requested.emit(path)
+
+    def on_export(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export filter", "", self.FILE_FILTERS)
+        if path:
+            self.export_requested.emit(path)
@@ -1,6 +1,7 @@
 import pyqtgraph as pg
 import numpy as np
-from dsp.utils import H_eval
+from PyQt6 import QtCore
+from dsp.context import EvalContext, EvaluatorCache
 
 
 class FreqResponseWidget(pg.GraphicsLayoutWidget):
@@ -14,6 +15,9 @@ class FreqResponseWidget(pg.GraphicsLayoutWidget):
         self.amp_plot.setLabel('left', 'Amplitude (log)')
         self.amp_plot.showGrid(x=True, y=True, alpha=0.3)
         self.amp_curve = self.amp_plot.plot([], [], pen=pg.mkPen('c', width=2))
+        # Comparison magnitude (e.g. quantized coefficients), see show_overlay
+        self.amp_overlay = self.amp_plot.plot(
+            [], [], pen=pg.mkPen((255, 170, 0), width=1.5, style=QtCore.Qt.PenStyle.DashLine))
 
         # Bottom plot: phase (radians), share X axis
         self.phase_plot: pg.PlotItem = self.addPlot(row=1, col=0)
@@ -26,11 +30,44 @@ class FreqResponseWidget(pg.GraphicsLayoutWidget):
         # Provide sensible initial ranges
         self.amp_plot.setYRange(1e-3, 10)  # works with log-y
 
-    def update_response(self, zeros, poles, n=1024):
-        # Frequency grid [0, pi]
-        w = np.linspace(0, np.pi, n)
-        ejw = np.exp(1j * w)
-        H = H_eval(ejw, zeros, poles)
+        # Point budget: a uniform base grid plus extra samples around roots
+        # near the unit circle (sharp peaks/notches)
+        self.adaptive = True
+        self.base_fraction = 0.5
+
+        # Evaluators for standalone use (update_response); the main window
+        # passes contexts backed by its own shared cache
+        self.evaluators = EvaluatorCache()
+
+    def base_points(self, n=1024):
+        """Size of the uniform part of an n-point grid."""
+        return max(2, int(n * self.base_fraction)) if self.adaptive else n
+
+    def update_response(self, zeros, poles, n=1024, coeffs=None):
+        ctx = EvalContext(zeros, poles, coeffs, self.evaluators)
+        self.apply_response(self.compute_response(ctx, n))
+
+    def compute_response(self, ctx, n=1024):
+        """Numerical part of the update; safe to run off the GUI thread.
+
+        Reads the uniform base response and the resonance samples from the
+        edit's EvalContext, so other views reuse them; the plotted result is
+        memoized in the context as well.
+        """
+        key = ('freq_view', n, self.adaptive, self.base_fraction)
+        return ctx.memo(key, self._compute_response, ctx, n)
+
+    def _compute_response(self, ctx, n):
+        # Frequency grid [0, pi]: uniform base + resonance samples
+        n_base = self.base_points(n)
+        w, H = ctx.response(n_base)
+        if self.adaptive:
+            w_extra, H_extra = ctx.resonance_response(n - n_base)
+            if w_extra.size:
+                w = np.concatenate([w, w_extra])
+                order = np.argsort(w, kind='stable')
+                w = w[order]
+                H = np.concatenate([H, H_extra])[order]
 
         # Amplitude (log-y): clamp to avoid zeros/NaNs
         mag = np.abs(H)
@@ -42,18 +79,32 @@ class FreqResponseWidget(pg.GraphicsLayoutWidget):
         mag_safe[invalid] = eps
 
         # Auto y-range based on finite values
+        yrange = None
         finite_mag = mag_safe[np.isfinite(mag_safe) & (mag_safe > 0)]
         if finite_mag.size:
             ymin = max(eps, np.nanpercentile(finite_mag, 1))
             ymax = np.nanpercentile(finite_mag, 99)
             if np.isfinite(ymin) and np.isfinite(ymax) and ymax > ymin * 1.05:
-                self.amp_plot.setYRange(ymin, ymax)
+                yrange = (ymin, ymax)
 
         x = w / np.pi  # normalize to [0,1]
-        self.amp_curve.setData(x, mag_safe)
 
         # Phase (unwrapped radians)
         phase = np.unwrap(np.angle(H))
         # Clean any NaNs from invalid H
         phase = np.where(np.isfinite(phase), phase, np.nan)
+        return x, mag_safe, phase, yrange
+
+    def apply_response(self, result):
+        x, mag, phase, yrange = result
+        if yrange is not None:
+            self.amp_plot.setYRange(*yrange)
+        self.amp_curve.setData(x, mag)
         self.phase_curve.setData(x, phase)
+
+    def show_overlay(self, x, mag):
+        """Draw a second amplitude curve (x in units of pi); None clears it."""
+        if x is None:
+            self.amp_overlay.setData([], [])
+        else:
+            self.amp_overlay.setData(x, np.maximum(mag, 1e-6))
@@ -0,0 +1,161 @@
+import csv
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from PyQt6 import QtCore, QtWidgets
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('rec', 'name', 't0')
+
+    def __init__(self, rec, name):
+        self.rec = rec
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.rec.record(self.name, (time.perf_counter() - self.t0) * 1000.0)
+        return False
+
+
+class Instrumentation:
+    """Per-stage latency samples (ms), kept in bounded ring buffers.
+
+    `with instrument.stage('name'):` times a block. While disabled it returns a
+    shared no-op context manager, so hooks cost one attribute check and a
+    method call. Samples may be recorded from worker threads.
+
+    Milestones (`mark`) are one-off timestamps such as startup phases; they are
+    always recorded since there are only a handful of them.
+    """
+
+    def __init__(self, enabled=False, max_samples=10000):
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self.samples: dict[str, deque] = {}
+        self.marks: list[tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def mark(self, name, t=None):
+        self.marks.append((name, time.perf_counter() if t is None else t))
+
+    def timeline(self):
+        """[(name, ms since the first mark, ms since the previous mark)]."""
+        if not self.marks:
+            return []
+        t0 = prev = self.marks[0][1]
+        out = []
+        for name, t in self.marks:
+            out.append((name, (t - t0) * 1000.0, (t - prev) * 1000.0))
+            prev = t
+        return out
+
+    def timeline_report(self):
+        return '\n'.join(f'{total:8.1f} ms  (+{delta:7.1f})  {name}'
+                         for name, total, delta in self.timeline())
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        buf = self.samples.get(name)
+        if buf is None:
+            with self._lock:
+                buf = self.samples.setdefault(name, deque(maxlen=self.max_samples))
+        buf.append(ms)
+
+    def last(self, name, default=0.0):
+        buf = self.samples.get(name)
+        return buf[-1] if buf else default
+
+    def clear(self):
+        with self._lock:
+            self.samples.clear()
+
+    def histogram(self, name, bins=20):
+        """(counts, bin_edges) of the stage's latencies."""
+        return np.histogram(np.asarray(self.samples.get(name, ())), bins=bins)
+
+    def summary(self):
+        out = {}
+        for name, buf in sorted(self.samples.items()):
+            a = np.asarray(buf)
+            if a.size:
+                out[name] = {
+                    'count': int(a.size),
+                    'mean': float(a.mean()),
+                    'p50': float(np.percentile(a, 50)),
+                    'p95': float(np.percentile(a, 95)),
+                    'max': float(a.max()),
+                }
+        return out
+
+    def export(self, path):
+        """Write samples to .csv (stage, index, ms) or .json (summary + samples)."""
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                w = csv.writer(f)
+                w.writerow(['stage', 'index', 'ms'])
+                for name, buf in sorted(self.samples.items()):
+                    for i, ms in enumerate(buf):
+                        w.writerow([name, i, f'{ms:.4f}'])
+        else:
+            with open(path, 'w') as f:
+                json.dump({
+                    'timeline': self.timeline(),
+                    'summary': self.summary(),
+                    'samples': {k: list(v) for k, v in sorted(self.samples.items())},
+                }, f)
+
+
+# Process-wide recorder used by the GUI hooks
+instrument = Instrumentation()
+
+
+class FrameOverlay(QtWidgets.QLabel):
+    """Small on-screen readout of frame time and per-view cost."""
+
+    def __init__(self, parent, stages, interval_ms=250):
+        super().__init__(parent)
+        self.stages = stages
+        self.setStyleSheet(
+            'background: rgba(0, 0, 0, 170); color: #9f9; padding: 4px; font-family: monospace;'
+        )
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(interval_ms)
+        self.hide()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        lines = [f'frame  {instrument.last("frame/interval"):6.1f} ms']
+        lines += [f'{name:<22s} {instrument.last(name):6.1f} ms' for name in self.stages]
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+        self.move(self.parentWidget().width() - self.width() - 8, 8)
+        self.raise_()
@@ -1,13 +1,57 @@
-from PyQt6 import QtWidgets
+import os
 
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from dsp.context import ContextCache
+from dsp.filter_io import load_filter, save_filter
+from dsp.roots import roots_from_coeffs, strip_leading_zeros
+from gui.deferred import DeferredView
 from gui.editor import PoleZeroEditor
 from gui.freq_response import FreqResponseWidget
-from gui.surface import Surface3D
-from gui.filter_info import FilterInfoWidget
+from gui.filter_info import FilterInfoWidget, compute_info
+from gui.instrument import FrameOverlay, instrument
+from gui.scheduler import UpdateScheduler
+from gui.workers import ComputePool
+
+
+def _make_surface():
+    # Imported here: pyqtgraph.opengl / PyOpenGL are the slowest part of startup
+    from gui.surface import Surface3D
+    instrument.mark('surface: GL stack imported')
+    return Surface3D()
+
+
+def _root_status(info):
+    """Root-finder diagnostics for the status line (empty unless a warm start
+    was tried, i.e. order >= find_roots' min_order)."""
+    parts = []
+    for name, d in info.items():
+        if d['fallback']:
+            parts.append(f"{name}: no convergence after {d['iterations']} iterations, used np.roots")
+        elif d['method'] == 'aberth' and d['warm']:
+            parts.append(f"{name}: {d['iterations']} iterations (warm start)")
+    return 'Roots — ' + '; '.join(parts) if parts else ''
+
+
+def _export_surface(ctx, image, resolution, span):
+    """Tiled high-resolution export (grid .npy next to the PNG); returns a
+    status line."""
+    from dsp.surface_export import export_surface
+    npy = os.path.splitext(image)[0] + '.npy'
+    try:
+        lo, hi = export_surface(ctx, npy, resolution, span, image=image)
+    except (OSError, ValueError, RuntimeError) as exc:  # incl. BrokenProcessPool
+        return f'Surface export failed: {exc}'
+    return f'Surface exported: {image} ({resolution}x{resolution}, log10|H| {lo:.2f}..{hi:.2f})'
 
 
 class MainWindow(QtWidgets.QWidget):
-    def __init__(self):
+    # Emitted once the deferred 3D view has shown its first surface
+    startup_finished = QtCore.pyqtSignal()
+    # (view, editor revision) each time a view shows a newly computed result
+    view_applied = QtCore.pyqtSignal(str, int)
+
+    def __init__(self, use_processes=False, cache_mb=256):
         super().__init__()
         self.setWindowTitle('Interactive Pole-Zero Visualizer')
         
@@ -19,6 +63,15 @@ class MainWindow(QtWidgets.QWidget):
         left_v = QtWidgets.QVBoxLayout()
         ctrl = QtWidgets.QHBoxLayout()
         self.current_mode = 'select'
+        # (editor revision, (b, a), roots known) from the last Apply/import;
+        # without roots the filter is evaluated from its coefficients only
+        self._coeffs = None
+        self.max_root_order = 1024  # longer filters are not factored
+        self._found_roots = None  # (zeros, poles) of the last factored filter, warm start
+        # Per-edit evaluation contexts shared by all views, kept in an LRU so
+        # undo/redo and revisited configurations reuse their results
+        self.contexts = ContextCache(max_bytes=cache_mb * 2**20)
+        self._context = None
 
         def mk_btn(text, mode):
             b = QtWidgets.QToolButton()
@@ -35,7 +88,19 @@ class MainWindow(QtWidgets.QWidget):
         for b in (self.btn_select, self.btn_add_zero, self.btn_add_pole, self.btn_delete):
             ctrl.addWidget(b)
         ctrl.addStretch(1)
-        hint = QtWidgets.QLabel('Shift: snap add | Ctrl: snap move | Keyboard Delete: remove | Delete mode: click to remove')
+        self.btn_sweep = QtWidgets.QPushButton('Sweep…')
+        self.btn_sweep.clicked.connect(self.show_sweep)
+        ctrl.addWidget(self.btn_sweep)
+        self.btn_simulate = QtWidgets.QPushButton('Simulate…')
+        self.btn_simulate.clicked.connect(self.show_simulator)
+        ctrl.addWidget(self.btn_simulate)
+        self.btn_quantize = QtWidgets.QPushButton('Quantize…')
+        self.btn_quantize.clicked.connect(self.show_quantization)
+        ctrl.addWidget(self.btn_quantize)
+        self.btn_export_surface = QtWidgets.QPushButton('Export Surface…')
+        self.btn_export_surface.clicked.connect(self.export_surface_image)
+        ctrl.addWidget(self.btn_export_surface)
+        hint = QtWidgets.QLabel('Shift: snap add | Ctrl: snap move | Keyboard Delete: remove | Delete mode: click to remove | Ctrl+Z / Ctrl+Shift+Z: undo / redo')
         f = hint.font()
         f.setPointSize(9)
         hint.setFont(f)
@@ -47,12 +112,20 @@ class MainWindow(QtWidgets.QWidget):
         left_w = QtWidgets.QWidget(); left_w.setLayout(left_v)
 
         # Middle & Right plots
+        # The 3D view (and its GL stack) is created once the window is on screen
         self.freq = FreqResponseWidget()
-        self.surface = Surface3D()
+        self.surface = None
+        self._surface_drawn = False
+        self._first_paint = False
+        self.surface_view = DeferredView(_make_surface, 'Loading 3D view…', name='surface')
+        self.surface_view.ready.connect(self._on_surface_ready)
+        self.simulator = None  # stream simulator window, created on first use
+        self.sweep = None  # parameter sweep window, created on first use
+        self.quantization = None  # coefficient quantization window, created on first use
 
         plots_layout.addWidget(left_w, 2)
         plots_layout.addWidget(self.freq, 2)
-        plots_layout.addWidget(self.surface, 3)
+        plots_layout.addWidget(self.surface_view, 3)
         
         # Bottom info widget
         self.info_widget = FilterInfoWidget()
@@ -60,9 +133,64 @@ class MainWindow(QtWidgets.QWidget):
         main_layout.addLayout(plots_layout, 5) # Give plots more stretch factor
         main_layout.addWidget(self.info_widget, 1)
 
-        self.editor.updated.connect(self.recompute)
-        self.info_widget.filter_changed.connect(self.on_filter_text_changed)
+        # Numerical work runs in background workers; the GUI thread only applies results
+        self.pool = ComputePool(processes=use_processes, parent=self)
+
+        # Frequency response follows the cursor every frame; surface and
+        # coefficient/impulse text wait for a pause or the drag release.
+        self.scheduler = UpdateScheduler(fps=60, idle_delay_ms=150, parent=self)
+        self.scheduler.add_view('freq', self.refresh_freq, 'frame', budget_ms=12)
+        self.scheduler.add_view('surface_preview', self.preview_surface, 'frame', budget_ms=20)
+        self.scheduler.add_view('surface', self.refresh_surface, 'idle')
+        self.scheduler.add_view('info', self.refresh_info, 'idle')
+        self.scheduler.add_view('stream', self.refresh_stream, 'frame')
+        self.scheduler.add_view('quantize', self.refresh_quantization, 'frame', budget_ms=20)
+
+        self.pool.finished.connect(self.scheduler.record_cost)
+
+        # F3: per-stage timing overlay (also turns instrumentation on)
+        self.overlay = FrameOverlay(self, [
+            'frame/cost', 'editor/on_move', 'compute/freq', 'apply/freq',
+            'compute/surface', 'apply/surface', 'compute/info', 'apply/info',
+        ])
+        QtGui.QShortcut(QtGui.QKeySequence('F3'), self, activated=self.toggle_overlay)
+        QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Undo, self, activated=self.undo)
+        QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Redo, self, activated=self.redo)
+
+        self.editor.updated.connect(self.scheduler.request)
+        self.editor.drag_finished.connect(self.scheduler.flush)
+        self.info_widget.coeffs_applied.connect(self.on_coeffs_applied)
+        self.info_widget.import_requested.connect(self.import_filter)
+        self.info_widget.export_requested.connect(self.export_filter)
         self.recompute()
+        instrument.mark('window built')
+
+    def paintEvent(self, ev):
+        super().paintEvent(ev)
+        if not self._first_paint:
+            self._first_paint = True
+            instrument.mark('first paint')
+
+    def _on_surface_ready(self, surface):
+        self.surface = surface
+        self.refresh_surface()
+
+    def toggle_overlay(self, on=None):
+        on = not self.overlay.isVisible() if on is None else on
+        if on:
+            instrument.enabled = True
+            self.overlay.show()
+            self.overlay.refresh()
+        else:
+            self.overlay.hide()
+
+    def undo(self):
+        if self.editor.undo():
+            self.scheduler.flush()
+
+    def redo(self):
+        if self.editor.redo():
+            self.scheduler.flush()
 
     def set_mode(self, mode):
         self.current_mode = mode
@@ -76,14 +204,214 @@ class MainWindow(QtWidgets.QWidget):
             b.setChecked(m == mode)
             b.blockSignals(False)
 
+    def roots(self):
+        """Snapshot of the editor roots, safe to hand to a worker."""
+        return self.editor.zeros.copy(), self.editor.poles.copy()
+
+    def coeffs(self):
+        """(b, a) behind the current roots (monic), or of a coefficient-only
+        filter, if they came from Apply/import and the roots have not been
+        edited since; None otherwise."""
+        if self._coeffs is None or self._coeffs[0] != self.editor.revision:
+            return None
+        return self._coeffs[1]
+
+    def context(self):
+        """EvalContext for the current roots, shared by the views refreshed for
+        an edit and looked up by root configuration in the context cache."""
+        rev = self.editor.revision
+        if self._context is None or self._context[0] != rev:
+            coeffs = self.coeffs()
+            if coeffs is not None and not self._coeffs[2]:
+                ctx = self.contexts.get(None, None, coeffs)
+            else:
+                if self._coeffs is not None and not self._coeffs[2]:
+                    # Roots edited: the coefficient-only filter is gone
+                    self._coeffs = None
+                    self.info_widget.set_status('')
+                ctx = self.contexts.get(*self.roots(), coeffs)
+            self._context = (rev, ctx)
+        return self._context[1]
+
+    def _submit(self, view, fn, *args, apply, picklable=False):
+        """pool.submit, emitting view_applied with the editor revision the job
+        was submitted for once its result is applied."""
+        rev = self.editor.revision
+
+        def done(result):
+            apply(result)
+            self.view_applied.emit(view, rev)
+
+        return self.pool.submit(view, fn, *args, apply=done, picklable=picklable)
+
+    def refresh_freq(self):
+        self._submit('freq', self.freq.compute_response, self.context(), 1024,
+                     apply=self.freq.apply_response)
+
+    def preview_surface(self):
+        # Coarse uniform grid, only while a root is being dragged
+        if self.surface is None or self.editor.dragging_point is None:
+            return
+        def apply(result):
+            self.surface.apply_surface(result)
+            # The job shares the 'surface' pool slot (one job at a time on the
+            # view's buffers), so charge its cost to the preview's budget here
+            self.scheduler.record_cost('surface_preview', self.pool.cost_ms['surface'])
+
+        self._submit('surface', self.surface.compute_surface, self.context(),
+                     self.surface.coarse_resolution, apply=apply)
+
+    def refresh_surface(self):
+        if self.surface is None:
+            return
+        self._refine_surface(self.context(), self.surface.refinement_levels(), 0.0)
+
+    def _refine_surface(self, ctx, levels, spent_ms):
+        """Evaluate levels[0], then chain the next level while within budget."""
+        n = levels[0]
+        gen = None
+
+        def apply(result):
+            self.surface.apply_surface(result)
+            if not self._surface_drawn:
+                self._surface_drawn = True
+                instrument.mark('surface: first data')
+                self.startup_finished.emit()
+            cost = self.pool.cost_ms.get('surface', 0.0)
+            if (len(levels) > 1 and self.pool.generation('surface') == gen
+                    and self.surface.should_refine(spent_ms + cost, cost, n, levels[1])):
+                self._refine_surface(ctx, levels[1:], spent_ms + cost)
+
+        gen = self._submit('surface', self.surface.compute_surface, ctx, n,
+                           self.surface.adaptive, True, apply=apply)
+
+    def show_simulator(self):
+        if self.simulator is None:
+            from gui.simulator import SimulatorPanel
+            self.simulator = SimulatorPanel(self.context, parent=self)
+        self.simulator.show()
+        self.simulator.raise_()
+
+    def show_sweep(self):
+        if self.sweep is None:
+            from gui.sweep import SweepPanel
+            self.sweep = SweepPanel(self.editor, self.freq, lambda: self.surface, self.pool, parent=self)
+            self.sweep.finished.connect(self._end_sweep)
+        self.sweep.show()
+        self.sweep.raise_()
+
+    def _end_sweep(self):
+        # Views go back to the editor's roots (results are still in the context)
+        self.editor.show_roots(self.editor.zeros, self.editor.poles)
+        self.recompute()
+
+    def show_quantization(self):
+        if self.quantization is None:
+            from gui.quantize import QuantizationPanel
+            self.quantization = QuantizationPanel(self.editor, self.freq, parent=self)
+            self.quantization.settings_changed.connect(self.refresh_quantization)
+        self.quantization.show()
+        self.quantization.raise_()
+        self.refresh_quantization()
+
+    def refresh_quantization(self):
+        # Follows edits live while the window is open
+        if self.quantization is None or not self.quantization.isVisible():
+            return
+        from gui.quantize import compute_quantization
+        self._submit('quantize', compute_quantization, self.context(), self.quantization.structure,
+                     apply=self.quantization.apply)
+
+    def export_surface_image(self, path=None, resolution=None):
+        """Render the current |H(z)| at high resolution to a PNG, in the
+        background (tiles evaluated across processes)."""
+        if path is None:
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Export surface', '', 'PNG image (*.png)')
+            if not path:
+                return
+        if resolution is None:
+            resolution, ok = QtWidgets.QInputDialog.getInt(
+                self, 'Export surface', 'Grid side (pixels):', 4096, 64, 32768)
+            if not ok:
+                return
+        span = self.surface.span if self.surface is not None else 1.5
+        self.info_widget.set_status(f'Exporting {resolution}x{resolution} surface…')
+        self.pool.submit('export', _export_surface, self.context(), path, resolution, span,
+                         apply=self.info_widget.set_status)
+
+    def refresh_stream(self):
+        # A running stream crossfades to the new roots at its next block
+        if self.simulator is not None:
+            self.simulator.filter_changed()
+
+    def refresh_info(self):
+        self._submit('info', compute_info, self.context(),
+                     apply=self.info_widget.apply_info, picklable=True)
+
     def recompute(self):
-        zeros = self.editor.zeros
-        poles = self.editor.poles
-        self.freq.update_response(zeros, poles)
-        self.surface.update_surface(zeros, poles)
-        self.info_widget.update_info(zeros, poles)
-
-    def on_filter_text_changed(self, new_zeros, new_poles):
-        # Use editor helper to rebuild internal lists
-        self.editor.load_from_roots(new_zeros, new_poles)
-        # Editor emits updated inside update_scatter; freq/surface & info refresh via recompute
+        """Refresh every view immediately."""
+        self.scheduler.request()
+        self.scheduler.flush()
+
+    def closeEvent(self, ev):
+        if self.simulator is not None:
+            self.simulator.stop()
+        self.pool.shutdown()
+        super().closeEvent(ev)
+
+    def on_coeffs_applied(self, b, a):
+        """Load a filter given by coefficients: roots are found in a worker;
+        filters above max_root_order are shown from their coefficients only."""
+        order = max(len(b), len(a)) - 1
+        if order > self.max_root_order:
+            self._set_filter(b, a, None)
+            return
+        if order > 64:
+            self.info_widget.set_status(f'Finding roots (order {order})…')
+        self.pool.submit('roots', roots_from_coeffs, b, a, self._found_roots,
+                         apply=lambda roots: self._set_filter(b, a, roots), picklable=True)
+
+    def _set_filter(self, b, a, roots):
+        if roots is None:
+            self.editor.load_from_roots([], [])
+            self._coeffs = (self.editor.revision, (b, a), False)
+            self.info_widget.set_status(
+                f'{len(b)} / {len(a)} coefficients: too long to factor (order > '
+                f'{self.max_root_order}), shown from coefficients; editing roots starts a new filter')
+        else:
+            zeros, poles, info = roots
+            self._found_roots = (zeros, poles)
+            # Use editor helper to rebuild internal lists
+            self.editor.load_from_roots(zeros, poles)
+            self._coeffs = (self.editor.revision, (b / b[0], a / a[0]), True)
+            self.info_widget.set_status(_root_status(info))
+        # Editor emits updated inside update_scatter; apply the edit in one go
+        self.scheduler.flush()
+
+    def import_filter(self, path):
+        try:
+            spec = load_filter(path)
+        except (OSError, ValueError) as exc:
+            self.info_widget.show_error('Failed to import filter.', str(exc))
+            return
+        if spec['zeros'] is None:
+            self.on_coeffs_applied(strip_leading_zeros(spec['b']), strip_leading_zeros(spec['a']))
+            return
+        self.editor.load_from_roots(spec['zeros'], spec['poles'])
+        self._found_roots = (spec['zeros'], spec['poles'])
+        if spec['b'] is not None:
+            b, a = strip_leading_zeros(spec['b']), strip_leading_zeros(spec['a'])
+            self._coeffs = (self.editor.revision, (b / b[0], a / a[0]), True)
+        self.info_widget.set_status('')
+        self.scheduler.flush()
+
+    def export_filter(self, path):
+        ctx = self.context()
+        b, a = ctx.coeffs
+        try:
+            if ctx.has_roots:
+                save_filter(path, ctx.zeros, ctx.poles, b, a)
+            else:
+                save_filter(path, b=b, a=a)
+        except (OSError, ValueError) as exc:
+            self.info_widget.show_error('Failed to export filter.', str(exc))
@@ -0,0 +1,118 @@
+import numpy as np
+import pyqtgraph as pg
+from PyQt6 import QtCore, QtWidgets
+
+from dsp.quantize import BITS, MODES, analyze_coeffs, analyze_sos
+
+STRUCTURES = {'Second-order sections': 'sos', 'Direct form': 'direct'}
+_MODE_PENS = dict(zip(MODES, ('c', 'y', 'm', 'g')))
+
+
+def compute_quantization(ctx, structure='sos', n=512):
+    """Quantization analysis of the context's filter for every word length in
+    BITS and every rounding mode; memoized in the context, so revisiting a
+    configuration (undo/redo) is free. Coefficient-only filters have no SOS
+    cascade and are analyzed in direct form."""
+    def real(c):
+        # Conjugate-paired roots: drop the zero imaginary parts
+        return np.real(c) if ctx.real_coeffs else c
+
+    if structure == 'sos' and ctx.has_roots:
+        return ctx.memo(('quantize', 'sos', n), analyze_sos, real(ctx.sos), BITS, MODES, n,
+                        120.0, (len(ctx.zeros), len(ctx.poles)))
+    b, a = ctx.coeffs if ctx.has_roots else ctx.given_coeffs
+    b, a = real(b), real(a)
+    return ctx.memo(('quantize', 'direct', n), analyze_coeffs, b, a, BITS, MODES, n)
+
+
+class QuantizationPanel(QtWidgets.QWidget):
+    """Fixed-point coefficient quantization of the current filter.
+
+    The analysis covers all word lengths and rounding modes at once and is
+    refreshed by the main window's scheduler as the roots change; picking a
+    word length or mode only redraws from the last result. The selected
+    combination's roots are drawn on the editor and its magnitude on the
+    frequency view until the window closes.
+    """
+
+    settings_changed = QtCore.pyqtSignal()
+
+    def __init__(self, editor, freq, parent=None):
+        super().__init__(parent, QtCore.Qt.WindowType.Window)
+        self.setWindowTitle('Coefficient Quantization')
+        self.editor = editor
+        self.freq = freq
+        self.result = None
+
+        form = QtWidgets.QFormLayout(self)
+        self.structure_box = QtWidgets.QComboBox()
+        self.structure_box.addItems(list(STRUCTURES))
+        self.structure_box.currentTextChanged.connect(self.settings_changed)
+        form.addRow('Structure:', self.structure_box)
+        self.mode_box = QtWidgets.QComboBox()
+        self.mode_box.addItems(list(MODES))
+        self.mode_box.currentTextChanged.connect(self.show_selection)
+        form.addRow('Rounding:', self.mode_box)
+        self.bits_box = QtWidgets.QSpinBox()
+        self.bits_box.setRange(int(BITS[0]), int(BITS[-1]))
+        self.bits_box.setValue(16)
+        self.bits_box.setSuffix(' bits')
+        self.bits_box.valueChanged.connect(self.show_selection)
+        form.addRow('Word length:', self.bits_box)
+
+        # Max magnitude deviation against word length, one curve per mode
+        self.plot = pg.PlotWidget()
+        self.plot.setLogMode(y=True)
+        self.plot.setLabel('left', 'max |ΔH| (dB)')
+        self.plot.setLabel('bottom', 'word length (bits)')
+        self.plot.showGrid(x=True, y=True, alpha=0.3)
+        self.plot.addLegend(offset=(-10, 10))
+        self.curves = {m: self.plot.plot([], [], pen=pg.mkPen(_MODE_PENS[m], width=2), name=m)
+                       for m in MODES}
+        self.marker = pg.InfiniteLine(self.bits_box.value(), pen=pg.mkPen((200, 200, 200), width=1))
+        self.plot.addItem(self.marker)
+        form.addRow(self.plot)
+        self.status = QtWidgets.QLabel()
+        self.status.setWordWrap(True)
+        form.addRow(self.status)
+
+    @property
+    def structure(self):
+        return STRUCTURES[self.structure_box.currentText()]
+
+    def apply(self, result):
+        self.result = result
+        bits = result['bits']
+        for m, curve in self.curves.items():
+            dev = result['max_dev_db'][result['modes'].index(m)]
+            curve.setData(bits, np.maximum(dev, 1e-6))
+        self.show_selection()
+
+    def show_selection(self, *_):
+        """Draw the selected (mode, word length) from the last result."""
+        bits = self.bits_box.value()
+        self.marker.setValue(bits)
+        r = self.result
+        if r is None:
+            return
+        i, j = r['modes'].index(self.mode_box.currentText()), int(np.searchsorted(r['bits'], bits))
+        self.freq.show_overlay(r['w'] / np.pi, 10.0 ** (r['mag_db'][i, j] / 20))
+        text = f"{bits} bits, {r['modes'][i]}: max |ΔH| {r['max_dev_db'][i, j]:.3g} dB"
+        if 'poles' in r:
+            zeros, poles = r['zeros'][i, j], r['poles'][i, j]
+            self.editor.show_overlay(zeros[np.isfinite(zeros)], poles[np.isfinite(poles)])
+            radius = r['max_radius'][i, j]
+            text += (f", max root shift {r['max_shift'][i, j]:.3g}, max pole radius {radius:.6f}"
+                     + (' (unstable)' if radius >= 1.0 else ''))
+        else:
+            self.editor.show_overlay(None, None)
+            text += ' (too long to factor: roots not shown)'
+        self.status.setText(text)
+
+    def clear(self):
+        self.editor.show_overlay(None, None)
+        self.freq.show_overlay(None, None)
+
+    def closeEvent(self, ev):
+        self.clear()
+        super().closeEvent(ev)
@@ -0,0 +1,174 @@
+import math
+
+import numpy as np
+
+
+class RootStore:
+    """Compact NumPy-backed set of roots with conjugate links and a hit-test index.
+
+    Values live in one growable complex array (`values` is a zero-copy view of
+    the used part), `partner[i]` links each root to its conjugate (-1 when it
+    is real or unpaired), and a bucket grid with cell size `cell` answers
+    nearest-root queries in O(1) expected time. Removal swaps the last root
+    into the freed slot, so indices of other roots may change; methods that
+    can move the caller's root return its new index.
+    """
+
+    def __init__(self, cell=0.06, capacity=16):
+        self.cell = cell
+        self._z = np.empty(capacity, dtype=complex)
+        self._partner = np.full(capacity, -1, dtype=np.intp)
+        self._n = 0
+        self._buckets: dict[tuple[int, int], set[int]] = {}
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def values(self):
+        return self._z[:self._n]
+
+    @property
+    def partners(self):
+        return self._partner[:self._n]
+
+    # ---------- Spatial index ----------
+    def _key(self, c):
+        return (math.floor(c.real / self.cell), math.floor(c.imag / self.cell))
+
+    def _index(self, i):
+        self._buckets.setdefault(self._key(self._z[i]), set()).add(i)
+
+    def _unindex(self, i):
+        key = self._key(self._z[i])
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.discard(i)
+            if not bucket:
+                del self._buckets[key]
+
+    def nearest(self, c: complex, tol: float):
+        """(index, distance) of the closest root within tol, or None."""
+        r = max(1, math.ceil(tol / self.cell))
+        kx, ky = self._key(c)
+        best = None
+        for i in range(kx - r, kx + r + 1):
+            for j in range(ky - r, ky + r + 1):
+                for idx in self._buckets.get((i, j), ()):
+                    d = abs(c - self._z[idx])
+                    if d < tol and (best is None or d < best[1]):
+                        best = (idx, d)
+        return best
+
+    # ---------- Editing ----------
+    def _grow(self):
+        cap = 2 * len(self._z)
+        self._z = np.resize(self._z, cap)
+        partner = np.full(cap, -1, dtype=np.intp)
+        partner[:self._n] = self._partner[:self._n]
+        self._partner = partner
+
+    def add(self, c: complex, partner: int = -1):
+        if self._n == len(self._z):
+            self._grow()
+        i = self._n
+        self._n += 1
+        self._z[i] = c
+        self._partner[i] = partner
+        if partner >= 0:
+            self._partner[partner] = i
+        self._index(i)
+        return i
+
+    def add_pair(self, c: complex, tol=1e-9):
+        """Add c (and its conjugate unless real); returns the upper root's index."""
+        if abs(c.imag) <= tol:
+            return self.add(complex(c.real, 0.0))
+        if c.imag < 0:
+            c = c.conjugate()
+        i = self.add(c)
+        self.add(c.conjugate(), partner=i)
+        return i
+
+    def partner(self, i):
+        p = self._partner[i]
+        return None if p < 0 else int(p)
+
+    def set(self, i, c: complex):
+        self._unindex(i)
+        self._z[i] = c
+        self._index(i)
+
+    def _remove_one(self, i):
+        """Swap-remove a single root; returns the old index of the root now at i."""
+        last = self._n - 1
+        self._unindex(i)
+        p = self._partner[i]
+        if p >= 0:
+            self._partner[p] = -1
+        if i != last:
+            self._unindex(last)
+            self._z[i] = self._z[last]
+            self._partner[i] = self._partner[last]
+            if self._partner[i] >= 0:
+                self._partner[self._partner[i]] = i
+            self._index(i)
+        self._partner[last] = -1
+        self._n = last
+        return last
+
+    def remove(self, i, with_partner=True):
+        """Remove root i (and its conjugate partner)."""
+        p = self.partner(i)
+        moved_from = self._remove_one(i)
+        if with_partner and p is not None:
+            if p == moved_from:
+                p = i
+            self._remove_one(p)
+
+    def move_pair(self, i, c: complex, tol=1e-9):
+        """Move root i keeping its conjugate in step; returns i's new index.
+
+        Landing on the real axis collapses the pair into one real root;
+        leaving it creates the missing conjugate.
+        """
+        p = self.partner(i)
+        if abs(c.imag) <= tol:
+            c = complex(c.real, 0.0)
+            if p is not None:
+                if self._remove_one(p) == i:
+                    i = p
+            self.set(i, c)
+            return i
+        if c.imag < 0:
+            c = c.conjugate()
+        self.set(i, c)
+        if p is None:
+            self.add(c.conjugate(), partner=i)
+        else:
+            self.set(p, c.conjugate())
+        return i
+
+    def clear(self):
+        self._n = 0
+        self._buckets.clear()
+
+    def snapshot(self):
+        """(values, partners) copies; `load(*snapshot)` restores them."""
+        return self.values.copy(), self.partners.copy()
+
+    def load(self, values, partners=None):
+        """Replace the contents; partners[i] is the conjugate's index or -1."""
+        values = np.asarray(values, dtype=complex).ravel()
+        self.clear()
+        while len(self._z) < values.size:
+            self._grow()
+        self._n = values.size
+        self._z[:self._n] = values
+        if partners is None:
+            self._partner[:self._n] = -1
+        else:
+            self._partner[:self._n] = partners
+        keys = np.floor(np.stack([values.real, values.imag]) / self.cell).astype(np.int64)
+        for i, key in enumerate(zip(keys[0].tolist(), keys[1].tolist())):
+            self._buckets.setdefault(key, set()).add(i)
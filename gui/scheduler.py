@@ -0,0 +1,109 @@
+import time
+
+from PyQt6 import QtCore
+
+from gui.instrument import instrument
+
+
+class UpdateScheduler(QtCore.QObject):
+    """Coalesces edit notifications into at most one refresh per display frame.
+
+    Views registered with priority 'frame' refresh on the next frame tick,
+    'idle' views wait until edits pause for `idle_delay_ms` or `flush()` is
+    called (e.g. on mouse release). A frame view whose last refresh took longer
+    than its `budget_ms` is throttled to every ceil(cost / budget) frames, so
+    its average cost per frame stays within budget. Views read the current
+    state when they run, so intermediate states arriving within one frame are
+    dropped.
+    """
+
+    def __init__(self, fps=60, idle_delay_ms=150, parent=None):
+        super().__init__(parent)
+        self._views: dict[str, dict] = {}
+        self._last_frame = 0.0
+        self._frame_timer = QtCore.QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._on_frame)
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self.flush)
+        self.fps = fps
+        self.idle_delay_ms = idle_delay_ms
+
+    @property
+    def fps(self):
+        return self._fps
+
+    @fps.setter
+    def fps(self, value):
+        self._fps = max(1, value)
+        self._interval = 1.0 / self._fps
+
+    def add_view(self, name, callback, priority='frame', budget_ms=None):
+        """Register a refresh callback. priority: 'frame' | 'idle'."""
+        self._views[name] = {
+            'callback': callback,
+            'priority': priority,
+            'budget_ms': budget_ms,
+            'cost_ms': 0.0,
+            'dirty': False,
+            'skipped': 0,
+        }
+
+    def set_budget(self, name, budget_ms):
+        self._views[name]['budget_ms'] = budget_ms
+
+    def record_cost(self, name, cost_ms):
+        """Report the real cost of a view whose callback only queues work."""
+        if name in self._views:
+            self._views[name]['cost_ms'] = cost_ms
+
+    def cost_ms(self, name):
+        """Duration of the view's last refresh."""
+        return self._views[name]['cost_ms']
+
+    def _due(self, v):
+        """Whether a stale frame view runs on this tick."""
+        if v['priority'] != 'frame':
+            return False
+        if v['budget_ms'] is None or v['cost_ms'] <= v['budget_ms']:
+            return True
+        v['skipped'] += 1
+        return (v['skipped'] + 1) * v['budget_ms'] >= v['cost_ms']
+
+    def request(self):
+        """Mark all views stale and schedule the next frame / idle refresh."""
+        for v in self._views.values():
+            v['dirty'] = True
+        if not self._frame_timer.isActive():
+            elapsed = time.perf_counter() - self._last_frame
+            delay = max(0.0, self._interval - elapsed)
+            self._frame_timer.start(int(delay * 1000))
+        self._idle_timer.start(self.idle_delay_ms)
+
+    def _run(self, name, v):
+        t0 = time.perf_counter()
+        with instrument.stage('view/' + name):
+            v['callback']()
+        v['cost_ms'] = (time.perf_counter() - t0) * 1000.0
+        v['dirty'] = False
+        v['skipped'] = 0
+
+    def _on_frame(self):
+        now = time.perf_counter()
+        if self._last_frame:
+            instrument.record('frame/interval', (now - self._last_frame) * 1000.0)
+        self._last_frame = now
+        with instrument.stage('frame/cost'):
+            for name, v in self._views.items():
+                if v['dirty'] and self._due(v):
+                    self._run(name, v)
+
+    def flush(self):
+        """Refresh every stale view now (drag release / pause)."""
+        self._frame_timer.stop()
+        self._idle_timer.stop()
+        self._last_frame = time.perf_counter()
+        for name, v in self._views.items():
+            if v['dirty']:
+                self._run(name, v)
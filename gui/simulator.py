@@ -0,0 +1,177 @@
+import threading
+
+from PyQt6 import QtCore, QtWidgets
+
+from dsp.stream import Chirp, Noise, Stream, Tone, WavReader, WavWriter, format_stats, sections_from_context
+
+
+class SimulatorPanel(QtWidgets.QWidget):
+    """Streams a WAV file or generated signal through the editor's filter.
+
+    The stream runs on its own thread; `filter_changed()` (called as the roots
+    change) hands it the current context, which it picks up at the next block
+    boundary and crossfades in. `context_provider` returns the EvalContext
+    of the current roots.
+    """
+
+    _progress = QtCore.pyqtSignal(object)
+    _done = QtCore.pyqtSignal(object, str)
+
+    SOURCES = ('WAV file', 'Tone', 'Chirp', 'Noise')
+
+    def __init__(self, context_provider, parent=None):
+        super().__init__(parent, QtCore.Qt.WindowType.Window)
+        self.setWindowTitle('Stream Simulator')
+        self.context_provider = context_provider
+        self._thread = None
+        self._stop = threading.Event()
+        self._pending = None
+        self._lock = threading.Lock()
+        self._total = None
+
+        form = QtWidgets.QFormLayout(self)
+        self.source = QtWidgets.QComboBox()
+        self.source.addItems(self.SOURCES)
+        form.addRow('Source:', self.source)
+
+        def file_row(save):
+            edit = QtWidgets.QLineEdit()
+            btn = QtWidgets.QToolButton()
+            btn.setText('…')
+            btn.clicked.connect(lambda: self._browse(edit, save))
+            row = QtWidgets.QHBoxLayout()
+            row.addWidget(edit, 1)
+            row.addWidget(btn)
+            return edit, row
+
+        self.input_path, row = file_row(False)
+        form.addRow('Input WAV:', row)
+        self.freq = QtWidgets.QLineEdit('1000')
+        self.freq.setPlaceholderText('Hz (tone) or f0, f1 (chirp)')
+        form.addRow('Frequency:', self.freq)
+        self.rate = QtWidgets.QSpinBox()
+        self.rate.setRange(1000, 384000)
+        self.rate.setValue(48000)
+        form.addRow('Sample rate:', self.rate)
+        self.duration = QtWidgets.QDoubleSpinBox()
+        self.duration.setRange(0, 24 * 3600)
+        self.duration.setValue(60)
+        self.duration.setSpecialValueText('until stopped')
+        form.addRow('Duration (s):', self.duration)
+        self.block = QtWidgets.QSpinBox()
+        self.block.setRange(64, 1 << 20)
+        self.block.setValue(8192)
+        form.addRow('Block (frames):', self.block)
+        self.output_path, row = file_row(True)
+        self.output_path.setPlaceholderText('none: throughput only')
+        form.addRow('Output WAV:', row)
+        self.normalize = QtWidgets.QCheckBox('Normalize peak gain to 0 dB')
+        self.normalize.setChecked(True)
+        form.addRow(self.normalize)
+
+        self.start_button = QtWidgets.QPushButton('Start')
+        self.start_button.clicked.connect(self.toggle)
+        form.addRow(self.start_button)
+        self.status = QtWidgets.QLabel()
+        self.status.setWordWrap(True)
+        form.addRow(self.status)
+
+        self._progress.connect(self._on_progress)
+        self._done.connect(self._on_done)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def _browse(self, edit, save):
+        if save:
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Output WAV', '', 'WAV (*.wav)')
+        else:
+            path, _ = QtWidgets.QFileDialog.getOpenFileName(self, 'Input WAV', '', 'WAV (*.wav)')
+        if path:
+            edit.setText(path)
+
+    def _open_source(self):
+        kind = self.source.currentText()
+        if kind == 'WAV file':
+            return WavReader(self.input_path.text())
+        fs = self.rate.value()
+        duration = self.duration.value() or None
+        if kind == 'Noise':
+            return Noise(fs, duration)
+        freqs = [float(f) for f in self.freq.text().replace(',', ' ').split()]
+        if kind == 'Tone':
+            return Tone(freqs[0], fs, duration)
+        return Chirp(freqs[0], freqs[-1], fs, duration)
+
+    def toggle(self):
+        if self.running:
+            self._stop.set()
+        else:
+            self.start()
+
+    def start(self):
+        try:
+            source = self._open_source()
+            normalize = self.normalize.isChecked()  # read here: widgets are GUI-thread only
+            sections = sections_from_context(self.context_provider(), normalize=normalize)
+            out = self.output_path.text()
+            sink = WavWriter(out, source.fs, source.channels) if out else None
+        except (OSError, EOFError, ValueError, IndexError) as exc:
+            self.status.setText(f'Cannot start: {exc}')
+            return
+        self._total = source.frames / source.fs if source.frames is not None else None
+        stream = Stream(source, sections, sink, block=self.block.value())
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(stream, normalize), daemon=True)
+        self._thread.start()
+        self.start_button.setText('Stop')
+
+    def filter_changed(self):
+        """Pass the current roots to the running stream."""
+        if self.running:
+            with self._lock:
+                self._pending = self.context_provider()
+
+    def _run(self, stream, normalize):
+        error = ''
+        try:
+            last = 0.0
+            while not self._stop.is_set():
+                with self._lock:
+                    ctx, self._pending = self._pending, None
+                if ctx is not None:
+                    try:
+                        stream.set_filter(sections_from_context(ctx, normalize=normalize))
+                    except ValueError as exc:
+                        error = str(exc)  # keep streaming the last valid filter
+                if stream.step() is None:
+                    break
+                stats = stream.stats()
+                if stats['elapsed'] - last >= 0.25:
+                    last = stats['elapsed']
+                    self._progress.emit(stats)
+        except Exception as exc:
+            error = f'{type(exc).__name__}: {exc}'
+        finally:
+            stream.close()
+        self._done.emit(stream.stats(), error)
+
+    def _on_progress(self, stats):
+        self.status.setText(format_stats(stats, self._total))
+
+    def _on_done(self, stats, error):
+        self._thread = None
+        self.start_button.setText('Start')
+        self.status.setText(format_stats(stats, self._total) + (f'\n{error}' if error else ''))
+
+    def stop(self):
+        """Stop the stream and wait for its thread."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def closeEvent(self, ev):
+        self.stop()
+        super().closeEvent(ev)
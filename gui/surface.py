@@ -5,7 +5,15 @@ from pyqtgraph.opengl import (
     GLLinePlotItem,
 )
 import numpy as np
-from dsp.utils import H_eval
+from dsp.context import EvalContext, EvaluatorCache
+from dsp.grids import refined_axis
+from dsp.incremental import IncrementalEvaluator
+from dsp.utils import workspace
+
+
+def _fit(buf, shape):
+    """Contiguous view of the first prod(shape) elements of a flat buffer."""
+    return buf[:shape[0] * shape[1]].reshape(shape)
 
 
 class Surface3D(GLViewWidget):
@@ -16,67 +24,165 @@ class Surface3D(GLViewWidget):
         self.surface: GLSurfacePlotItem | None = None
         self.unit_circle_line: GLLinePlotItem | None = None
         self.upper_arc_line: GLLinePlotItem | None = None
-        self.resolution = 90
         self.span = 1.5  # x,y in [-span, span]
 
+        # Level of detail: coarse uniform grid while dragging, then progressive
+        # refinement from `resolution` up to `max_resolution` (doubling) as long
+        # as the estimated cost fits in `refine_budget_ms`.
+        self.coarse_resolution = 40
+        self.resolution = 90
+        self.max_resolution = 180
+        self.refine_budget_ms = 300.0
+        self.adaptive = True  # cluster refined grid lines around roots
+
+        # Incremental evaluators for uniform grids, keyed by (resolution, span)
+        self._grid_evals: dict[tuple, tuple[np.ndarray, IncrementalEvaluator]] = {}
+        self._axes = None
+
+        # Unit circle overlay: read from the edit's EvalContext on the same
+        # grid as the frequency view's uniform base (upper half, 0..pi), so the
+        # response is computed once for both; the lower half is mirrored.
+        self.circle_n = 512
+        self.evaluators = EvaluatorCache()  # for standalone update_surface
+
+        # Cached buffers: adaptive grids per resolution and output rings
+        theta = np.linspace(0, np.pi, self.circle_n)
+        theta = np.concatenate([theta, 2 * np.pi - theta[-2::-1]])
+        self._circle_template = np.zeros((theta.size, 3), dtype=np.float32)
+        self._circle_template[:, 0] = np.cos(theta)
+        self._circle_template[:, 1] = np.sin(theta)
+        self._adaptive_bufs: dict[int, tuple] = {}
+        self._outputs: dict[int, list] = {}
+        self.output_ring = 3
+
     def update_surface(self, zeros, poles):
-        n = self.resolution
-        x = np.linspace(-self.span, self.span, n, dtype=np.float32)
-        y = np.linspace(-self.span, self.span, n, dtype=np.float32)
-        X, Y = np.meshgrid(x, y, indexing='ij')
-        Zc = X + 1j * Y
-        
-        # --- Shared Transformation for Surface and Circle ---
-        def transform_h(h_vals):
-            mag = np.abs(h_vals)
-            mag[~np.isfinite(mag)] = 0.0
-            log_mag = np.log10(np.maximum(1e-9, mag))
-            return log_mag
-
-        # Calculate log magnitude for the whole surface
-        log_mag_surface = transform_h(H_eval(Zc, zeros, poles))
-        
-        # Normalize to keep it visually contained
-        finite = np.isfinite(log_mag_surface)
-        if np.any(finite):
-            min_val = np.min(log_mag_surface[finite])
-            max_val = np.max(log_mag_surface[finite])
-            if max_val - min_val > 1e-6:
-                # Apply normalization to surface
-                Zsurf = (log_mag_surface - min_val) / (max_val - min_val) * 2.0 # Squash height
-            else:
-                Zsurf = np.zeros_like(log_mag_surface)
-                Zsurf[finite] = 0
+        ctx = EvalContext(zeros, poles, evaluators=self.evaluators)
+        self.apply_surface(self.compute_surface(ctx, adaptive=self.adaptive))
+
+    def refinement_levels(self):
+        """Resolutions evaluated one after another once editing pauses."""
+        levels = [self.resolution]
+        while levels[-1] * 2 <= self.max_resolution:
+            levels.append(levels[-1] * 2)
+        return levels
+
+    def should_refine(self, spent_ms, last_cost_ms, n, next_n):
+        """Whether the next level is expected to fit in the refinement budget."""
+        estimate = last_cost_ms * (next_n / n) ** 2
+        return spent_ms + estimate <= self.refine_budget_ms
+
+    def _uniform_eval(self, n):
+        key = (n, self.span)
+        if key not in self._grid_evals:
+            x = np.linspace(-self.span, self.span, n, dtype=np.float32)
+            X, Y = np.meshgrid(x, x, indexing='ij')
+            self._grid_evals[key] = (x, IncrementalEvaluator(X + 1j * Y, single=True))
+        return self._grid_evals[key]
+
+    def _adaptive_buffers(self, n, shape):
+        """Complex grid, log H output and log_H_eval scratch for an adaptive
+        grid of the given shape (refined axes may drop a few duplicate lines),
+        as contiguous views of flat n*n buffers cached per resolution."""
+        if n not in self._adaptive_bufs:
+            self._adaptive_bufs[n] = (np.empty(n * n, dtype=np.complex64),
+                                      np.empty(n * n, dtype=np.complex64),
+                                      workspace(n * n, np.complex64))
+        grid, log_h, scratch = self._adaptive_bufs[n]
+        return _fit(grid, shape), _fit(log_h, shape), tuple(_fit(a, shape) for a in scratch)
+
+    def _output_slot(self, n, shape):
+        """Next (heights, circle vertices) buffer pair for resolution n.
+
+        Results are handed to the GUI thread and the line items keep a
+        reference to their vertices, so each resolution cycles through a small
+        ring of buffers instead of overwriting the one on screen.
+        """
+        ring = self._outputs.get(n)
+        if ring is None:
+            ring = self._outputs[n] = [0, [
+                (np.empty(n * n, dtype=np.float32), self._circle_template.copy())
+                for _ in range(self.output_ring)
+            ]]
+        k = ring[0]
+        ring[0] = (k + 1) % len(ring[1])
+        heights, circle = ring[1][k]
+        return _fit(heights, shape), circle
+
+    def compute_surface(self, ctx, resolution=None, adaptive=False, cache=False):
+        """Numerical part of the update; safe to run off the GUI thread.
+
+        Uniform grids are updated incrementally (cheap while dragging); adaptive
+        grids move with the roots and are evaluated from scratch. Grids, scratch
+        space and outputs are cached per resolution, so steady-state updates
+        allocate only the (small) adaptive axes. With `cache`, a copy of the
+        result is memoized in the context (settled states worth revisiting,
+        not every drag step).
+        """
+        n = resolution or self.resolution
+        if cache:
+            key = ('surface', n, adaptive, self.span, self.circle_n)
+            return ctx.memo(key, lambda: tuple(
+                a.copy() for a in self._compute_surface(ctx, n, adaptive)))
+        return self._compute_surface(ctx, n, adaptive)
+
+    def _compute_surface(self, ctx, n, adaptive):
+        zeros, poles = ctx.zeros, ctx.poles
+        if not ctx.has_roots:
+            # Coefficient-only filter: polynomial evaluation on the uniform grid
+            x, ev = self._uniform_eval(n)
+            y = x
+            log_h = self._adaptive_buffers(n, (n, n))[1]
+            surf_log_h = ctx.log_eval(ev.z, out=log_h)
+        elif adaptive and (len(zeros) or len(poles)):
+            roots = np.concatenate([zeros, poles])
+            x = refined_axis(self.span, n, roots.real).astype(np.float32)
+            y = refined_axis(self.span, n, roots.imag).astype(np.float32)
+            grid, log_h, scratch = self._adaptive_buffers(n, (x.size, y.size))
+            grid.real[...] = x[:, None]
+            grid.imag[...] = y[None, :]
+            surf_log_h = ctx.log_eval(grid, out=log_h, scratch=scratch)
+        else:
+            x, ev = self._uniform_eval(n)
+            y = x
+            surf_log_h = ev.update(zeros, poles)
+
+        Zsurf, circle_pts = self._output_slot(n, (x.size, y.size))
+        circle_log_h = ctx.full_circle_log(self.circle_n)[1]
+
+        # log10|H| straight from the log-domain accumulator (no overflow for
+        # high orders), floored at -9; fmax also maps NaN to the floor.
+        cz = circle_pts[:, 2]
+        for log_h, out in ((surf_log_h, Zsurf), (circle_log_h, cz)):
+            np.multiply(log_h.real, 1.0 / np.log(10.0), out=out)
+            np.fmax(out, -9.0, out=out)
+
+        # Normalize the surface (and the circle with the same scale) to a height of 2
+        min_val = float(Zsurf.min())
+        max_val = float(Zsurf.max())
+        if max_val - min_val > 1e-6:
+            scale = 2.0 / (max_val - min_val)
+            for out in (Zsurf, cz):
+                out -= min_val
+                out *= scale
         else:
-            Zsurf = np.zeros_like(log_mag_surface)
+            Zsurf.fill(0)
+            cz.fill(0)
 
+        # Upper half (0..pi) of the unit circle is a view of the full circle
+        upper_pts = circle_pts[:self.circle_n]
+        return x, y, Zsurf, circle_pts, upper_pts
+
+    def apply_surface(self, result):
+        x, y, Zsurf, circle_pts, upper_pts = result
         if self.surface is None:
             self.surface = GLSurfacePlotItem(x=x, y=y, z=Zsurf, shader='shaded', smooth=False)
             self.addItem(self.surface)
-        else:
+        elif self._axes is not None and self._axes[0] is x and self._axes[1] is y:
             self.surface.setData(z=Zsurf)
-
-        # --- Unit circle overlay on the surface ---
-        theta = np.linspace(0, 2 * np.pi, 400)
-        uc_z = np.exp(1j * theta)
-        
-        # Calculate and transform unit circle height using the same parameters
-        log_mag_uc = transform_h(H_eval(uc_z, zeros, poles))
-        
-        if np.any(finite):
-             # Use the same min/max from the surface for consistent scaling
-            if max_val - min_val > 1e-6:
-                cz = (log_mag_uc - min_val) / (max_val - min_val) * 2.0
-            else:
-                cz = np.zeros_like(log_mag_uc)
         else:
-            cz = np.zeros_like(log_mag_uc)
+            self.surface.setData(x=x, y=y, z=Zsurf)
+        self._axes = (x, y)
 
-        cx = np.cos(theta)
-        cy = np.sin(theta)
-        
-        circle_pts = np.vstack([cx, cy, cz]).T.astype(np.float32)
-        
         if self.unit_circle_line is None:
             self.unit_circle_line = GLLinePlotItem(
                 pos=circle_pts, color=(1, 1, 1, 0.85), width=2, mode='line_strip'
@@ -85,12 +191,6 @@ class Surface3D(GLViewWidget):
         else:
             self.unit_circle_line.setData(pos=circle_pts)
 
-        # Highlight upper half (0..pi) on unit circle
-        theta_u = np.linspace(0, np.pi, 200)
-        ux = np.cos(theta_u)
-        uy = np.sin(theta_u)
-        uz = cz[:200] # Match the height from the full circle
-        upper_pts = np.vstack([ux, uy, uz]).T.astype(np.float32)
         if self.upper_arc_line is None:
             self.upper_arc_line = GLLinePlotItem(
                 pos=upper_pts, color=(1, 0.85, 0.2, 0.95), width=4, mode='line_strip'
@@ -0,0 +1,275 @@
+from collections import OrderedDict
+
+import numpy as np
+from PyQt6 import QtCore, QtWidgets
+
+from dsp.context import root_key
+from dsp.sweep import batch_log_eval, trajectory
+from gui.instrument import instrument
+
+
+class SweepFrames:
+    """Display-ready frames of a sweep: the frequency view's and the surface
+    view's results for every frame, computed in one batch and indexed during
+    playback."""
+
+    def __init__(self, values, zeros, poles, n_freq=1024, resolution=90, span=1.5,
+                 circle_n=512, max_bytes=64 * 2**20, workers=None):
+        self.values, self.zeros, self.poles = values, zeros, poles
+        n_frames = len(values)
+        opts = dict(max_bytes=max_bytes, workers=workers)
+
+        # Frequency view (uniform grid over [0, pi])
+        w = np.linspace(0, np.pi, n_freq)
+        self.freq_x = w / np.pi
+        self.mag = np.empty((n_frames, n_freq))
+        self.phase = np.empty((n_frames, n_freq))
+        self.yrange = np.full((n_frames, 2), np.nan)
+        batch_log_eval(np.exp(1j * w), zeros, poles, self._consume_freq, **opts)
+
+        # Surface view: uniform grid plus the unit circle, normalized together
+        self.circle_n = circle_n
+        theta = np.linspace(0, np.pi, circle_n)
+        theta = np.concatenate([theta, 2 * np.pi - theta[-2::-1]])
+        self.circle = np.zeros((n_frames, theta.size, 3), dtype=np.float32)
+        self.circle[:, :, 0] = np.cos(theta)
+        self.circle[:, :, 1] = np.sin(theta)
+        batch_log_eval(np.exp(1j * theta), zeros, poles, self._consume_circle, **opts)
+        self.x = np.linspace(-span, span, resolution, dtype=np.float32)
+        X, Y = np.meshgrid(self.x, self.x, indexing='ij')
+        self.heights = np.empty((n_frames, resolution, resolution), dtype=np.float32)
+        batch_log_eval(X + 1j * Y, zeros, poles, self._consume_surface, **opts)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.mag, self.phase, self.circle, self.heights))
+
+    # Same post-processing as FreqResponseWidget / Surface3D, per chunk of frames
+    def _consume_freq(self, sl, log_h):
+        eps = 1e-6
+        with np.errstate(over='ignore'):
+            mag = np.exp(log_h.real)
+        mag[~np.isfinite(mag) | (mag <= 0)] = eps
+        self.mag[sl] = mag
+        wrapped = np.mod(log_h.imag + np.pi, 2 * np.pi) - np.pi
+        self.phase[sl] = np.unwrap(wrapped, axis=1)
+        lo, hi = np.percentile(mag, [1, 99], axis=1)
+        lo = np.maximum(eps, lo)
+        ok = hi > lo * 1.05
+        self.yrange[sl][ok] = np.stack([lo, hi], axis=1)[ok]
+
+    def _consume_circle(self, sl, log_h):
+        self.circle[sl, :, 2] = np.fmax(log_h.real / np.log(10.0), -9.0)
+
+    def _consume_surface(self, sl, log_h):
+        h = np.fmax(log_h.real / np.log(10.0), -9.0).astype(np.float32)
+        lo = h.min(axis=(1, 2))
+        span = h.max(axis=(1, 2)) - lo
+        flat = span <= 1e-6
+        scale = np.where(flat, 0.0, 2.0 / np.where(flat, 1.0, span))
+        self.heights[sl] = (h - lo[:, None, None]) * scale[:, None, None]
+        cz = self.circle[sl, :, 2]
+        self.circle[sl, :, 2] = (cz - lo[:, None]) * scale[:, None]
+
+    def freq_result(self, i):
+        """Frame i in FreqResponseWidget.apply_response's format."""
+        yrange = None if np.isnan(self.yrange[i, 0]) else tuple(self.yrange[i])
+        return self.freq_x, self.mag[i], self.phase[i], yrange
+
+    def surface_result(self, i):
+        """Frame i in Surface3D.apply_surface's format (shared axes, so the
+        view only uploads new heights)."""
+        circle = self.circle[i]
+        return self.x, self.x, self.heights[i], circle, circle[:self.circle_n]
+
+
+def compute_sweep(zeros, poles, kind, index, partner, param, values,
+                  resolution=90, span=1.5, circle_n=512):
+    """SweepFrames for one root moved through `values`; module-level (and free
+    of Qt) so it can run in a worker."""
+    zf, pf = trajectory(zeros, poles, kind, index, param, values, partner)
+    return SweepFrames(values, zf, pf, resolution=resolution, span=span, circle_n=circle_n)
+
+
+class SweepPanel(QtWidgets.QWidget):
+    """Sweeps the selected root's radius or angle and plays the frames back.
+
+    All frames are computed up front in a worker; the slider and playback only
+    index the cached frames and push them to the views, so scrubbing never
+    recomputes. Recent sweeps are kept, keyed by the roots and sweep settings,
+    within `cache_bytes` of frames (the newest sweep always stays). Editing
+    the roots pauses playback; `finished` is emitted when the window closes
+    so the views can show the current roots again.
+    """
+
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, editor, freq, surface_provider, pool, parent=None):
+        super().__init__(parent, QtCore.Qt.WindowType.Window)
+        self.setWindowTitle('Parameter Sweep')
+        self.editor = editor
+        self.freq = freq
+        self.surface_provider = surface_provider
+        self.pool = pool
+        self.frames = None
+        self.cache_bytes = 512 * 2**20
+        self._cache = OrderedDict()
+
+        form = QtWidgets.QFormLayout(self)
+        self.root_label = QtWidgets.QLabel()
+        form.addRow('Root:', self.root_label)
+        self.param = QtWidgets.QComboBox()
+        self.param.addItems(['radius', 'angle'])
+        self.param.currentTextChanged.connect(self._default_range)
+        form.addRow('Parameter:', self.param)
+        self.start = QtWidgets.QDoubleSpinBox()
+        self.stop = QtWidgets.QDoubleSpinBox()
+        for box in (self.start, self.stop):
+            box.setDecimals(4)
+            box.setRange(0.0, 10.0)
+            box.setSingleStep(0.05)
+        form.addRow('From:', self.start)
+        form.addRow('To:', self.stop)
+        self.count = QtWidgets.QSpinBox()
+        self.count.setRange(2, 5000)
+        self.count.setValue(120)
+        form.addRow('Frames:', self.count)
+        self.compute_button = QtWidgets.QPushButton('Compute')
+        self.compute_button.clicked.connect(self.compute)
+        form.addRow(self.compute_button)
+
+        self.slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
+        self.slider.setEnabled(False)
+        self.slider.valueChanged.connect(self.show_frame)
+        form.addRow(self.slider)
+        row = QtWidgets.QHBoxLayout()
+        self.play_button = QtWidgets.QPushButton('Play')
+        self.play_button.setCheckable(True)
+        self.play_button.setEnabled(False)
+        self.play_button.toggled.connect(self.play)
+        self.keep_button = QtWidgets.QPushButton('Keep Frame')
+        self.keep_button.setEnabled(False)
+        self.keep_button.clicked.connect(self.keep_frame)
+        row.addWidget(self.play_button)
+        row.addWidget(self.keep_button)
+        form.addRow(row)
+        self.status = QtWidgets.QLabel()
+        form.addRow(self.status)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(16)  # ~60 fps
+        self._timer.timeout.connect(self._advance)
+        self.editor.updated.connect(self._on_edit)
+        self._default_range(self.param.currentText())
+        self._on_edit()
+
+    def _target(self):
+        """(kind, index) of the root to sweep: the editor's selection, else
+        the first pole (or zero)."""
+        if self.editor.selected is not None:
+            return self.editor.selected
+        if len(self.editor.poles):
+            return 'pole', 0
+        if len(self.editor.zeros):
+            return 'zero', 0
+        return None
+
+    def _store(self, kind):
+        return self.editor.zero_store if kind == 'zero' else self.editor.pole_store
+
+    def _default_range(self, param):
+        hi = np.pi if param == 'angle' else 1.0
+        self.start.setValue(0.0 if param == 'angle' else 0.5)
+        self.stop.setValue(hi)
+
+    def _on_edit(self):
+        self.play_button.setChecked(False)
+        target = self._target()
+        if target is None:
+            self.root_label.setText('no roots')
+        else:
+            kind, idx = target
+            r = self._store(kind).values[idx]
+            self.root_label.setText(f'{kind} {idx}  ({r.real:.3f}{r.imag:+.3f}j)')
+
+    def compute(self):
+        target = self._target()
+        if target is None:
+            return
+        kind, idx = target
+        zeros, poles = self.editor.zeros.copy(), self.editor.poles.copy()
+        store = self._store(kind)
+        partner = store.partner(idx)
+        r = store.values[idx]
+        if partner is None and r.imag:
+            # Roots loaded without pairing: look for the conjugate
+            j = int(np.argmin(np.abs(store.values - np.conj(r))))
+            partner = j if j != idx and abs(store.values[j] - np.conj(r)) < 1e-9 else None
+        values = np.linspace(self.start.value(), self.stop.value(), self.count.value())
+        surface = self.surface_provider()
+        grid = (surface.resolution, surface.span, surface.circle_n) if surface else (90, 1.5, 512)
+        key = (root_key(zeros, poles), kind, idx, partner, self.param.currentText(),
+               values[0], values[-1], values.size, grid)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.set_frames(self._cache[key])
+            return
+        self.status.setText(f'Computing {values.size} frames…')
+
+        def apply(frames):
+            self._cache[key] = frames
+            total = sum(f.nbytes for f in self._cache.values())
+            while total > self.cache_bytes and len(self._cache) > 1:
+                total -= self._cache.popitem(last=False)[1].nbytes
+            self.set_frames(frames)
+
+        self.pool.submit('sweep', compute_sweep, zeros, poles, kind, idx, partner,
+                         self.param.currentText(), values, *grid, apply=apply)
+
+    def set_frames(self, frames):
+        self.frames = frames
+        cost = self.pool.cost_ms.get('sweep', 0.0)
+        self.status.setText(f'{len(frames)} frames, {frames.nbytes / 2**20:.1f} MB'
+                            + (f', computed in {cost:.0f} ms' if cost else ''))
+        for w in (self.slider, self.play_button, self.keep_button):
+            w.setEnabled(True)
+        self.slider.blockSignals(True)
+        self.slider.setRange(0, len(frames) - 1)
+        self.slider.setValue(0)
+        self.slider.blockSignals(False)
+        self.show_frame(0)
+
+    def show_frame(self, i):
+        """Push cached frame i to the views (no evaluation)."""
+        if self.frames is None:
+            return
+        with instrument.stage('apply/sweep'):
+            self.freq.apply_response(self.frames.freq_result(i))
+            surface = self.surface_provider()
+            if surface is not None:
+                surface.apply_surface(self.frames.surface_result(i))
+            self.editor.show_roots(self.frames.zeros[i], self.frames.poles[i])
+
+    def play(self, on):
+        self.play_button.setText('Pause' if on else 'Play')
+        if on and self.frames is not None:
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _advance(self):
+        self.slider.setValue((self.slider.value() + 1) % len(self.frames))
+
+    def keep_frame(self):
+        """Make the shown frame the editor's roots (an undoable edit)."""
+        if self.frames is not None:
+            i = self.slider.value()
+            self.editor.load_from_roots(self.frames.zeros[i], self.frames.poles[i])
+
+    def closeEvent(self, ev):
+        self.play_button.setChecked(False)
+        self.finished.emit()
+        super().closeEvent(ev)
@@ -0,0 +1,200 @@
+"""Recording and replay of editor interactions.
+
+A trace holds the editor's roots when recording started plus one row per
+edit-level event (click, move, release, delete, undo, redo) with its time,
+view coordinates, mode and keyboard modifiers. Coordinates are in the z-plane,
+so a replay does not depend on window size or screen resolution.
+"""
+import time
+
+import numpy as np
+from PyQt6 import QtCore
+
+KINDS = ('click', 'move', 'release', 'delete', 'undo', 'redo')
+MODES = ('', 'select', 'add_zero', 'add_pole', 'delete')
+TRACE_VERSION = 1
+
+
+class TraceRecorder:
+    """Collects editor events; attach with `start(editor)`, write with `save`."""
+
+    def __init__(self):
+        self.editor = None
+        self.initial = None
+        self.rows = []
+        self._t0 = 0.0
+
+    def start(self, editor):
+        self.editor = editor
+        self.initial = editor.snapshot()
+        self.rows.clear()
+        self._t0 = time.perf_counter()
+        editor.recorder = self
+
+    def stop(self):
+        if self.editor is not None:
+            self.editor.recorder = None
+
+    def record(self, kind, c=0j, mode='', modifiers=None):
+        mods = 0 if modifiers is None else int(getattr(modifiers, 'value', modifiers))
+        self.rows.append((time.perf_counter() - self._t0, KINDS.index(kind),
+                          c.real, c.imag, MODES.index(mode), mods))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def save(self, path):
+        """Compressed .npz: one array per column plus the initial roots."""
+        rows = np.array(self.rows, dtype=float).reshape(-1, 6)
+        (zeros, zero_partners), (poles, pole_partners) = self.initial
+        np.savez_compressed(
+            path, version=TRACE_VERSION,
+            t=rows[:, 0], kind=rows[:, 1].astype(np.uint8),
+            x=rows[:, 2], y=rows[:, 3],
+            mode=rows[:, 4].astype(np.uint8), modifiers=rows[:, 5].astype(np.uint32),
+            zeros=zeros, zero_partners=zero_partners, poles=poles, pole_partners=pole_partners,
+        )
+
+
+def load_trace(path):
+    """Dict of the trace's arrays (see TraceRecorder.save)."""
+    with np.load(path) as data:
+        trace = {k: data[k] for k in data.files}
+    if int(trace['version']) != TRACE_VERSION:
+        raise ValueError(f"unsupported trace version {int(trace['version'])}")
+    return trace
+
+
+def _percentiles(values):
+    a = np.asarray(values, dtype=float)
+    if not a.size:
+        return None
+    return {'count': int(a.size), 'p50': float(np.percentile(a, 50)),
+            'p95': float(np.percentile(a, 95)), 'max': float(a.max())}
+
+
+class Replayer:
+    """Drives a MainWindow through a trace and measures per-event latency.
+
+    Each event is dispatched through the editor's coordinate-level entry points
+    (click_at, move_to, ...) at its recorded time divided by `speed`
+    (speed=0: back to back, with one pass of the event loop in between).
+    Handler latency is the time spent in the dispatch call; view latency is
+    the time from dispatch until the view shows a result for that event's
+    revision or a newer one (from MainWindow.view_applied).
+    """
+
+    VIEWS = ('freq', 'surface', 'info')
+
+    def __init__(self, window, app):
+        self.window = window
+        self.app = app
+        self._applied = {v: [] for v in self.VIEWS}  # (time, revision)
+        window.view_applied.connect(self._on_applied)
+
+    def _on_applied(self, view, rev):
+        if view in self._applied:
+            self._applied[view].append((time.perf_counter(), rev))
+
+    def _pump(self, until=None):
+        """Process events (until perf_counter() >= until, or one pass)."""
+        flags = QtCore.QEventLoop.ProcessEventsFlag.AllEvents
+        if until is None:
+            self.app.processEvents(flags)
+            return
+        while True:
+            left = until - time.perf_counter()
+            if left <= 0:
+                return
+            self.app.processEvents(flags, max(1, int(left * 1000)))
+            time.sleep(min(left, 0.0005))
+
+    def _dispatch(self, kind, c, mode, modifiers):
+        win, editor = self.window, self.window.editor
+        if kind == 'click':
+            win.set_mode(mode)
+            editor.click_at(c, mode, modifiers)
+        elif kind == 'move':
+            editor.move_to(c, modifiers)
+        elif kind == 'release':
+            editor.release()
+        elif kind == 'delete':
+            editor.delete_selected()
+        elif kind == 'undo':
+            win.undo()
+        elif kind == 'redo':
+            win.redo()
+
+    def run(self, trace, speed=1.0, settle_s=10.0):
+        """Replay; returns {'events': [...], 'summary': {...}}."""
+        win, editor = self.window, self.window.editor
+        editor.restore(((trace['zeros'], trace['zero_partners']),
+                        (trace['poles'], trace['pole_partners'])))
+        win.recompute()
+        self._pump(time.perf_counter() + 0.2)
+        for v in self._applied.values():
+            v.clear()
+
+        t = trace['t'] - (trace['t'][0] if trace['t'].size else 0.0)
+        events = []
+        t_start = time.perf_counter()
+        for i in range(t.size):
+            if speed > 0:
+                self._pump(t_start + t[i] / speed)
+            kind = KINDS[trace['kind'][i]]
+            c = complex(trace['x'][i], trace['y'][i])
+            mods = QtCore.Qt.KeyboardModifier(int(trace['modifiers'][i]))
+            rev0 = editor.revision
+            t0 = time.perf_counter()
+            self._dispatch(kind, c, MODES[trace['mode'][i]], mods)
+            t1 = time.perf_counter()
+            events.append({'index': i, 'kind': kind, 'time': t0, 'handler_ms': (t1 - t0) * 1000.0,
+                           'revision': editor.revision,
+                           'changed': editor.revision != rev0 or kind == 'release'})
+            if speed <= 0:
+                self._pump()
+        wall = time.perf_counter() - t_start
+
+        # Let the views catch up with the final state
+        final = editor.revision
+        deadline = time.perf_counter() + (settle_s if any(e['changed'] for e in events) else 0)
+        while time.perf_counter() < deadline and not all(
+                a and max(r for _, r in a) >= final for a in self._applied.values()):
+            self._pump(time.perf_counter() + 0.01)
+        return self._report(events, wall)
+
+    def _report(self, events, wall):
+        applied = {v: np.array(a).reshape(-1, 2) for v, a in self._applied.items()}
+        for ev in events:
+            for view, a in applied.items():
+                ev[view + '_ms'] = None
+                if not ev['changed']:
+                    continue
+                hit = np.flatnonzero((a[:, 0] >= ev['time']) & (a[:, 1] >= ev['revision']))
+                if hit.size:
+                    ev[view + '_ms'] = (a[hit[0], 0] - ev['time']) * 1000.0
+        summary = {'events': len(events), 'wall_s': wall}
+        for kind in KINDS:
+            handler = [e['handler_ms'] for e in events if e['kind'] == kind]
+            if handler:
+                summary[f'handler/{kind}'] = _percentiles(handler)
+        for view in self.VIEWS:
+            lat = [e[view + '_ms'] for e in events if e[view + '_ms'] is not None]
+            missed = sum(1 for e in events if e['changed'] and e[view + '_ms'] is None)
+            stats = _percentiles(lat)
+            if stats is not None:
+                stats['missed'] = missed
+                summary[f'latency/{view}'] = stats
+        for ev in events:
+            del ev['time']
+        return {'events': events, 'summary': summary}
+
+
+def format_report(summary):
+    lines = [f"{summary['events']} events replayed in {summary['wall_s']:.2f} s",
+             f'{"":24s} {"count":>6s} {"p50 ms":>9s} {"p95 ms":>9s} {"max ms":>9s}']
+    for name, s in summary.items():
+        if isinstance(s, dict):
+            extra = f"  ({s['missed']} never shown)" if s.get('missed') else ''
+            lines.append(f"{name:24s} {s['count']:6d} {s['p50']:9.2f} {s['p95']:9.2f} {s['max']:9.2f}{extra}")
+    return '\n'.join(lines)
@@ -0,0 +1,111 @@
+import multiprocessing as mp
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PyQt6 import QtCore
+
+from gui.instrument import instrument
+
+
+def _timed(fn, args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - t0) * 1000.0
+
+
+class ComputePool(QtCore.QObject):
+    """Runs view computations off the GUI thread, newest job wins per view.
+
+    Each view has at most one job in flight, so a view's stateful evaluators
+    are never touched by two threads at once. Submitting while a job runs
+    replaces any queued job for that view (stale configurations are never
+    started), and every submission bumps the view's generation counter: a
+    result is applied on the GUI thread only if nothing newer has been applied
+    and `cancel()` was not called after it was submitted.
+
+    Jobs marked `picklable=True` (module-level functions of plain data) go to
+    a process pool when `processes=True`; everything else uses threads, which
+    suits NumPy work that releases the GIL.
+    """
+
+    _done = QtCore.pyqtSignal(str, int, object)
+    # (view, worker time in ms) after a result has been applied
+    finished = QtCore.pyqtSignal(str, float)
+
+    def __init__(self, max_workers=None, processes=False, parent=None):
+        super().__init__(parent)
+        self._threads = ThreadPoolExecutor(max_workers)
+        # Spawned, not forked: this process already runs Qt and worker threads
+        self._processes = (ProcessPoolExecutor(max_workers, mp_context=mp.get_context('spawn'))
+                           if processes else None)
+        self._generation: dict[str, int] = {}
+        self._applied: dict[str, int] = {}
+        self._cancelled: dict[str, int] = {}
+        self._running: dict[str, tuple] = {}
+        self._pending: dict[str, tuple] = {}
+        self.cost_ms: dict[str, float] = {}
+        # Emitted from worker threads; Qt queues it onto the GUI thread
+        self._done.connect(self._on_done)
+
+    def submit(self, view, fn, *args, apply, picklable=False):
+        """Queue fn(*args) for `view`; apply(result) runs on the GUI thread."""
+        gen = self._generation.get(view, 0) + 1
+        self._generation[view] = gen
+        job = (gen, fn, args, apply, picklable)
+        if view in self._running:
+            self._pending[view] = job
+        else:
+            self._start(view, job)
+        return gen
+
+    def cancel(self, view):
+        """Drop the queued job and discard the result of the running one."""
+        self._pending.pop(view, None)
+        self._cancelled[view] = self._generation.get(view, 0)
+
+    def generation(self, view):
+        """Generation of the newest job submitted for `view`."""
+        return self._generation.get(view, 0)
+
+    def busy(self, view=None):
+        if view is None:
+            return bool(self._running)
+        return view in self._running
+
+    def _start(self, view, job):
+        gen, fn, args, apply, picklable = job
+        if picklable and self._processes is not None:
+            executor = self._processes
+        else:
+            executor = self._threads
+        future = executor.submit(_timed, fn, args)
+        self._running[view] = (gen, apply)
+        future.add_done_callback(lambda f: self._done.emit(view, gen, f))
+
+    def _on_done(self, view, gen, future):
+        _, apply = self._running.pop(view)
+        job = self._pending.pop(view, None)
+        if job is not None:
+            self._start(view, job)
+        if gen <= self._applied.get(view, 0) or gen <= self._cancelled.get(view, 0):
+            return
+        try:
+            result, self.cost_ms[view] = future.result()
+        except Exception:
+            traceback.print_exc()
+            return
+        self._applied[view] = gen
+        instrument.record('compute/' + view, self.cost_ms[view])
+        with instrument.stage('apply/' + view):
+            apply(result)
+        self.finished.emit(view, self.cost_ms[view])
+
+    def shutdown(self):
+        for view in list(self._pending):
+            self.cancel(view)
+        for view in list(self._running):
+            self.cancel(view)
+        self._threads.shutdown(wait=True, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
@@ -1,14 +1,49 @@
+import time
+_T0 = time.perf_counter()
+
+import argparse
 import sys
 from PyQt6 import QtWidgets
+from gui.instrument import instrument
+instrument.mark('start', _T0)
+instrument.mark('Qt imported')
 from gui.main_window import MainWindow
+instrument.mark('GUI modules imported')
 
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
-    win = MainWindow()
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--profile', metavar='PATH',
+                    help='record per-stage timings and write them to PATH (.json or .csv) on exit')
+    ap.add_argument('--overlay', action='store_true', help='show the frame-time overlay (F3)')
+    ap.add_argument('--startup-report', action='store_true',
+                    help='print a startup-time breakdown once the 3D view has drawn')
+    ap.add_argument('--record-trace', metavar='PATH',
+                    help='record editor interactions to PATH (.npz) on exit, for replay.py')
+    ap.add_argument('--cache-mb', type=int, default=256,
+                    help='memory budget for cached results of recent root configurations')
+    args, qt_args = ap.parse_known_args()
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    instrument.mark('QApplication created')
+    instrument.enabled = bool(args.profile)
+    win = MainWindow(cache_mb=args.cache_mb)
+    if args.overlay:
+        win.toggle_overlay(True)
+    if args.startup_report:
+        win.startup_finished.connect(lambda: print(instrument.timeline_report(), file=sys.stderr))
+    if args.record_trace:
+        from gui.trace import TraceRecorder
+        recorder = TraceRecorder()
+        recorder.start(win.editor)
     win.showMaximized()
     win.show()
-    sys.exit(app.exec())
+    code = app.exec()
+    if args.profile:
+        instrument.export(args.profile)
+    if args.record_trace:
+        recorder.save(args.record_trace)
+    sys.exit(code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,57 @@
+"""Replay a recorded editor trace headlessly and report per-event latency.
+
+Record a trace with `python main.py --record-trace session.npz`, then
+
+    python replay.py session.npz                 # original timing
+    python replay.py session.npz --speed 0       # as fast as possible
+    python replay.py session.npz --json out.json --profile stages.json
+
+Runs offscreen (no display or GPU needed). Reports handler time per event
+type and, per view, the time from each edit until the view showed it.
+"""
+import argparse
+import json
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6 import QtWidgets
+
+from gui.instrument import instrument
+from gui.main_window import MainWindow
+from gui.trace import Replayer, format_report, load_trace
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('trace', help='.npz trace from main.py --record-trace')
+    ap.add_argument('--speed', type=float, default=1.0,
+                    help='playback speed factor (0: no delays between events)')
+    ap.add_argument('--settle', type=float, default=10.0,
+                    help='seconds to wait for the views to catch up after the last event')
+    ap.add_argument('--json', metavar='PATH', help='write per-event latencies and the summary')
+    ap.add_argument('--profile', metavar='PATH', help='also record per-stage timings (.json or .csv)')
+    ap.add_argument('--processes', action='store_true', help='run picklable view jobs in worker processes instead of threads')
+    args, qt_args = ap.parse_known_args(argv)
+
+    trace = load_trace(args.trace)
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    instrument.enabled = bool(args.profile)
+    win = MainWindow(use_processes=args.processes)
+    win.resize(1400, 800)
+    win.show()
+    win.surface_view.create()  # normally created on first paint
+    result = Replayer(win, app).run(trace, speed=args.speed, settle_s=args.settle)
+    print(format_report(result['summary']))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=1)
+    if args.profile:
+        instrument.export(args.profile)
+    win.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
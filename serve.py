@@ -0,0 +1,47 @@
+"""Serve frequency, impulse and surface evaluations to other local tools.
+
+POST a batch.py-style filter as JSON to /freq, /impulse or /surface and get
+the arrays back as an .npz body; GET /stats for cache and load counters. See
+dsp/server.py for the parameters and limits.
+
+    python serve.py --port 8765 --workers 8
+    curl -s localhost:8765/freq -d '{"zeros": [[0, 1], [0, -1]], "poles": [[0.9, 0.3], [0.9, -0.3]]}' -o freq.npz
+"""
+import argparse
+import asyncio
+import sys
+
+from dsp.server import EvalServer
+
+
+async def _run(args):
+    server = EvalServer(args.workers, not args.threads, args.cache_mb * 2**20,
+                        args.max_body_mb * 2**20, args.max_clients, args.max_jobs)
+    try:
+        port = await server.start(args.host, args.port)
+        print(f'serving on http://{args.host}:{port}', file=sys.stderr)
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--workers', type=int, default=None, help='default: all cores')
+    ap.add_argument('--threads', action='store_true', help='evaluate in threads instead of processes')
+    ap.add_argument('--cache-mb', type=int, default=256, help='response cache size')
+    ap.add_argument('--max-body-mb', type=int, default=16, help='largest accepted request')
+    ap.add_argument('--max-clients', type=int, default=256, help='open connections (more get 503)')
+    ap.add_argument('--max-jobs', type=int, default=64, help='queued evaluations (more get 503)')
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())